@@ -0,0 +1,189 @@
+# --------------------------------------------------------------------------
+# Run Analysis
+# Summarizes the power data of many runs at once. Every run of a test
+# directory is loaded into NumPy arrays, one row per run, and reduced to its
+# runtime, total energy, average, peak and percentile power per component,
+# the DRAM included. The runs of each test are then ranked by energy-delay
+# product and printed as one comparison table.
+#
+# usage: python3 analysis.py test1 test3 --percentile 99
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import os
+import re
+
+import numpy
+
+from data_extraction import LoadPowerNpz
+from power_eval import LoadPowerCsv
+
+# --------------------------------------------------------------------------
+# Power Files
+# --------------------------------------------------------------------------
+# power data files are named <component>_power_data_<suffix>.<format>. The
+# DRAM counts towards the total power of a run like the cores and caches.
+# The total of a multi-core run is left out since its cores are summed
+# already.
+POWER_FILE_PATTERN = re.compile(r"^((?:cpu|l2_cache|l3_cache|dram)\d*)_power_data_(.*)\.(csv|npz)$")
+
+# --------------------------------------------------------------------------
+# Load Power Files
+# --------------------------------------------------------------------------
+def LoadPowerFile(filename):
+    """Reads a power .csv or .npz file and returns its dynamic and static
+    power along with its stats dump period.
+    """
+
+    if filename.endswith(".npz"):
+        arrays = LoadPowerNpz(filename)
+        return arrays["dynamic_power"], arrays["static_power"], float(arrays["stats_period"])
+
+    return LoadPowerCsv(filename)
+
+# --------------------------------------------------------------------------
+# Load Test
+# --------------------------------------------------------------------------
+def LoadTest(test_dir):
+    """Loads the power data of every run in test_dir. Returns the run names,
+    the stats dump period of every run and, for every component, a matrix
+    with one row per run holding its total power per interval. Rows are
+    padded with NaN to the longest run, and a run without the component,
+    such as a run without an L3 cache, is all NaN.
+    """
+
+    # prefer the columnar files when a run was written in both formats
+    files = {}
+    for filename in sorted(os.listdir(test_dir)):
+        match = POWER_FILE_PATTERN.match(filename)
+        if match:
+            component, suffix, extension = match.groups()
+            if (suffix, component) not in files or extension == "npz":
+                files[suffix, component] = os.path.join(test_dir, filename)
+
+    runs = sorted(set(suffix for suffix, component in files))
+    components = sorted(set(component for suffix, component in files))
+
+    loaded = {}
+    periods = numpy.zeros(len(runs))
+    for (suffix, component), filename in files.items():
+        dynamic_power, static_power, stats_period = LoadPowerFile(filename)
+        loaded[suffix, component] = numpy.asarray(dynamic_power) + numpy.asarray(static_power)
+        periods[runs.index(suffix)] = stats_period
+
+    intervals = max([len(power) for power in loaded.values()] or [0])
+
+    power = {}
+    for component in components:
+        matrix = numpy.full((len(runs), intervals), numpy.nan)
+        for row, suffix in enumerate(runs):
+            if (suffix, component) in loaded:
+                run_power = loaded[suffix, component]
+                matrix[row, :len(run_power)] = run_power
+        power[component] = matrix
+
+    return runs, periods, power
+
+# --------------------------------------------------------------------------
+# Summarize
+# --------------------------------------------------------------------------
+def Summarize(periods, power, percentile):
+    """Reduces the power matrices of LoadTest to per-run metrics. Returns a
+    dict of arrays with one entry per run: runtime, energy, average, peak and
+    percentile power and energy-delay product of the run as a whole, plus the
+    energy and average power of every component.
+    """
+
+    matrices = list(power.values())
+    runs = len(periods)
+    if not matrices:
+        return {"runtime": numpy.zeros(runs), "energy": numpy.zeros(runs), "edp": numpy.zeros(runs)}
+
+    # an interval exists if any component reported power for it
+    valid = numpy.any([~numpy.isnan(matrix) for matrix in matrices], axis = 0)
+    total = numpy.nansum(matrices, axis = 0)
+    total[~valid] = numpy.nan
+
+    runtime = valid.sum(axis = 1) * periods
+    energy = numpy.nansum(total, axis = 1) * periods
+
+    with numpy.errstate(invalid = "ignore"):
+        summary = {
+            "runtime": runtime,
+            "energy": energy,
+            "average_power": numpy.nanmean(total, axis = 1),
+            "peak_power": numpy.nanmax(total, axis = 1),
+            "percentile_power": numpy.nanpercentile(total, percentile, axis = 1),
+            "edp": energy * runtime,
+        }
+
+        for component, matrix in power.items():
+            summary[component + "_energy"] = numpy.nansum(matrix, axis = 1) * periods
+            summary[component + "_average_power"] = numpy.nanmean(matrix, axis = 1)
+
+    return summary
+
+# --------------------------------------------------------------------------
+# Print Table
+# --------------------------------------------------------------------------
+def PrintTable(test_dir, runs, summary, components, percentile):
+    """Prints the runs of a test ranked by energy-delay product, lowest
+    first.
+    """
+
+    columns = [
+        ("Runtime (s)", "runtime"),
+        ("Energy (J)", "energy"),
+        ("Avg (W)", "average_power"),
+        ("Peak (W)", "peak_power"),
+        ("P{:g} (W)".format(percentile), "percentile_power"),
+        ("EDP (J*s)", "edp"),
+    ] + [
+        ("{} (J)".format(component), component + "_energy") for component in components
+    ]
+
+    width = max([len(run) for run in runs] + [4])
+
+    print(test_dir)
+    print("{:>4}  {:<{}}".format("Rank", "Run", width) + "".join(" {:>14}".format(title) for title, key in columns))
+    for rank, row in enumerate(numpy.argsort(summary["edp"], kind = "stable")):
+        print("{:>4}  {:<{}}".format(rank + 1, runs[row], width) + "".join(
+            " {:>14.6g}".format(summary[key][row]) for title, key in columns
+        ))
+    print("")
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Compares the energy, power and runtime of the runs in each test directory.'
+    )
+    parser.add_argument(
+        'test_dirs',
+        nargs = '+',
+        help = 'Directories holding the power data files of the runs, for example test1 test3.'
+    )
+    parser.add_argument(
+        '--percentile',
+        default = 95.0,
+        type = float,
+        help = 'Percentile of the total power reported for every run. Default: 95.'
+    )
+    args = parser.parse_args()
+
+    for test_dir in args.test_dirs:
+        runs, periods, power = LoadTest(test_dir)
+        if not runs:
+            print("{}: no power data files".format(test_dir))
+            continue
+
+        summary = Summarize(periods, power, args.percentile)
+        PrintTable(test_dir, runs, summary, sorted(power), args.percentile)
+
+if __name__ == "__main__":
+    main()
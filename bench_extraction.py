@@ -0,0 +1,378 @@
+# --------------------------------------------------------------------------
+# Extraction Benchmark
+# Measures the speed of the post-processing pipeline on synthetic stats
+# files, without gem5. A stats file of the requested size is generated with
+# the layout gem5 writes, then every extraction backend parses it and writes
+# its output files. Parse throughput, output write time and peak Python
+# memory are reported per backend, and compared against a saved baseline so
+# a change that makes extraction slower fails the benchmark.
+#
+# usage: python3 bench_extraction.py --dumps 2000 --components 8 --stats 400
+#        python3 bench_extraction.py --save_baseline
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from data_extraction import DataExtraction
+from data_extraction import IncrementalDataExtraction
+from data_extraction import PERFORMANCE_STATS
+from data_extraction import POWER_STATS
+from data_extraction import PowerCsvSink
+
+# --------------------------------------------------------------------------
+# Generate Stats File
+# --------------------------------------------------------------------------
+# every stat line is padded the way gem5 pads them
+STAT_LINE = "{:<60} {:>24}  # {} ({})\n"
+
+def ComponentPath(component):
+    """Returns the path of the index-th synthetic component.
+    """
+
+    return "system.processor.cpu{}".format(component)
+
+def GenerateStats(stats_filename, dumps, components, stats, stats_period, seed):
+    """Writes a stats file of dumps dump blocks. Every block holds the dump
+    tick, the performance stats, the power of every component's power model
+    and stats more stats per component that are not extracted, standing in
+    for the vectors, scalars and formulas of a real dump.
+    """
+
+    random_state = random.Random(seed)
+    ticks_per_dump = int(stats_period * 1.0E12)
+
+    filler = [
+        ("{}.stat{}{}".format(ComponentPath(component), i, "::total" if i % 5 == 0 else ""),
+         "Synthetic statistic {}".format(i), "Count")
+        for component in range(components)
+        for i in range(stats)
+    ]
+
+    with open(stats_filename, "w") as stats_file:
+        for dump in range(1, dumps + 1):
+            stats_file.write("\n---------- Begin Simulation Statistics ----------\n")
+            stats_file.write(STAT_LINE.format("simSeconds", stats_period, "Number of seconds simulated", "Second"))
+            stats_file.write(STAT_LINE.format("finalTick", dump * ticks_per_dump, "Number of ticks from beginning of simulation", "Tick"))
+
+            for stat_name, stat_keys in PERFORMANCE_STATS:
+                for stat_key in stat_keys:
+                    stats_file.write(STAT_LINE.format(stat_key, random_state.randint(0, 100000), stat_name, "Count"))
+
+            for component in range(components):
+                for stat_name in POWER_STATS:
+                    stats_file.write(STAT_LINE.format(
+                        "{}.power_model.pm0.{}".format(ComponentPath(component), stat_name),
+                        "{:.6f}".format(random_state.uniform(0.1, 2.0)),
+                        "Power", "Watt"
+                    ))
+
+            for stat_key, description, unit in filler:
+                stats_file.write(STAT_LINE.format(stat_key, random_state.randint(0, 1000000), description, unit))
+
+            stats_file.write("\n---------- End Simulation Statistics   ----------\n")
+
+# --------------------------------------------------------------------------
+# Extraction Backends
+# Each backend returns a function that parses the stats file and a function
+# that writes the output files of every component.
+# --------------------------------------------------------------------------
+def Components(components):
+
+    return ["cpu{}".format(component) for component in range(components)]
+
+def CsvBackend(stats_filename, output_dir, parameters, components, stats_period):
+
+    statistics = DataExtraction(0, stats_period, stats_filename)
+    for component in components:
+        statistics.AddComponent(component, ComponentPath(component[3:]) + ".power_model.pm0", POWER_STATS)
+
+    def Write():
+        for component in components:
+            statistics.ExtractPowerData(component, parameters, os.path.join(output_dir, component + ".csv"))
+
+    return statistics.ParseStats, Write
+
+def NpzBackend(stats_filename, output_dir, parameters, components, stats_period):
+
+    statistics = DataExtraction(0, stats_period, stats_filename)
+    for component in components:
+        statistics.AddComponent(component, ComponentPath(component[3:]) + ".power_model.pm0", POWER_STATS)
+
+    def Write():
+        for component in components:
+            statistics.ExtractPowerNpz(component, parameters, os.path.join(output_dir, component + ".npz"))
+
+    return statistics.ParseStats, Write
+
+def PerformanceBackend(stats_filename, output_dir, parameters, components, stats_period):
+
+    statistics = DataExtraction(0, stats_period, stats_filename)
+    for component in components:
+        statistics.AddComponent(component, ComponentPath(component[3:]) + ".power_model.pm0", POWER_STATS)
+
+    def Write():
+        statistics.ExtractPerformanceData(components, parameters, os.path.join(output_dir, "performance.csv"))
+
+    return statistics.ParseStats, Write
+
+def LiveBackend(stats_filename, output_dir, parameters, components, stats_period):
+
+    # the sinks write every row while parsing, so parsing includes writing
+    statistics = IncrementalDataExtraction(stats_period, stats_filename)
+    for component in components:
+        statistics.AddComponent(component, ComponentPath(component[3:]) + ".power_model.pm0", POWER_STATS)
+        statistics.AddSink(component, PowerCsvSink(parameters, os.path.join(output_dir, component + ".csv"), stats_period))
+
+    def Parse():
+        statistics.Finish(0)
+
+    def Write():
+        pass
+
+    return Parse, Write
+
+BACKENDS = [
+    ("csv", CsvBackend),
+    ("npz", NpzBackend),
+    ("performance", PerformanceBackend),
+    ("live", LiveBackend),
+]
+
+# --------------------------------------------------------------------------
+# Measure
+# --------------------------------------------------------------------------
+def Measure(backend, stats_filename, components, stats_period, repeat):
+    """Runs backend repeat times and returns its best parse and write times
+    in seconds, then runs it once more under tracemalloc and returns its
+    peak Python memory in bytes.
+    """
+
+    parameters = [["Benchmark"], ["synthetic"]]
+    parse_times = []
+    write_times = []
+
+    for attempt in range(repeat + 1):
+        output_dir = tempfile.mkdtemp(prefix = "bench_extraction_")
+        try:
+            # the last run only measures memory, tracing slows it down
+            if attempt == repeat:
+                tracemalloc.start()
+
+            parse, write = backend(stats_filename, output_dir, parameters, components, stats_period)
+
+            start = time.perf_counter()
+            parse()
+            parsed = time.perf_counter()
+            write()
+            written = time.perf_counter()
+
+            if attempt == repeat:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                parse_times.append(parsed - start)
+                write_times.append(written - parsed)
+        finally:
+            shutil.rmtree(output_dir)
+
+    return min(parse_times), min(write_times), peak_memory
+
+# --------------------------------------------------------------------------
+# Compare With Baseline
+# --------------------------------------------------------------------------
+def CompareWithBaseline(results, baseline, tolerance):
+    """Returns a message for every backend that parses slower or writes
+    slower than its baseline by more than tolerance, relative to the
+    baseline. Backends without a baseline are skipped.
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+
+        # very short runs are dominated by timer noise, so a slowdown also
+        # has to exceed 10 ms
+        if (result["parse_mb_per_s"] < reference["parse_mb_per_s"] * (1.0 - tolerance)
+                and result["parse_time"] > reference["parse_time"] + 0.01):
+            regressions.append("{}: parsing at {:.2f} MB/s, baseline {:.2f} MB/s".format(
+                name, result["parse_mb_per_s"], reference["parse_mb_per_s"]
+            ))
+
+        if result["write_time"] > max(reference["write_time"] * (1.0 + tolerance), reference["write_time"] + 0.01):
+            regressions.append("{}: writing in {:.3f} s, baseline {:.3f} s".format(
+                name, result["write_time"], reference["write_time"]
+            ))
+
+    return regressions
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(
+        description = 'Benchmarks the extraction of power data from synthetic stats files.'
+    )
+    parser.add_argument(
+        '--dumps',
+        default = 2000,
+        type = int,
+        help = 'Number of stats dumps in the synthetic stats file. Default: 2000.'
+    )
+    parser.add_argument(
+        '--components',
+        default = 8,
+        type = int,
+        help = 'Number of components with a power model. Default: 8.'
+    )
+    parser.add_argument(
+        '--stats',
+        default = 400,
+        type = int,
+        help = 'Number of stats per component and dump that are not extracted. Default: 400.'
+    )
+    parser.add_argument(
+        '--stats_period',
+        default = 0.1E-3,
+        type = float,
+        help = 'Stats dump period in seconds written to the outputs. Default: 0.1E-3.'
+    )
+    parser.add_argument(
+        '--seed',
+        default = 0,
+        type = int,
+        help = 'Seed of the synthetic values. Default: 0.'
+    )
+    parser.add_argument(
+        '--repeat',
+        default = 3,
+        type = int,
+        help = 'Timed runs per backend, at least 1. The fastest is reported. Default: 3.'
+    )
+    parser.add_argument(
+        '--backends',
+        default = ','.join(name for name, backend in BACKENDS),
+        help = 'Comma separated backends to benchmark. Default: all of them.'
+    )
+    parser.add_argument(
+        '--baseline',
+        default = os.path.join(project_dir, 'bench_extraction_baseline.json'),
+        help = 'JSON file holding the baseline results. Default: bench_extraction_baseline.json in the project directory.'
+    )
+    parser.add_argument(
+        '--save_baseline',
+        action = 'store_true',
+        help = 'Save the results as the new baseline instead of comparing against it.'
+    )
+    parser.add_argument(
+        '--tolerance',
+        default = 0.15,
+        type = float,
+        help = 'Slowdown relative to the baseline that fails the benchmark. Default: 0.15.'
+    )
+    parser.add_argument(
+        '--keep_stats',
+        default = '',
+        help = 'Also keep the generated stats file at this path.'
+    )
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    backends = dict(BACKENDS)
+    selected = args.backends.split(',')
+    for name in selected:
+        if name not in backends:
+            parser.error('unknown backend {}'.format(name))
+
+    # the columnar backend needs NumPy
+    if 'npz' in selected and importlib.util.find_spec('numpy') is None:
+        print('NumPy is not installed, skipping the npz backend')
+        selected.remove('npz')
+
+    work_dir = tempfile.mkdtemp(prefix = 'bench_extraction_')
+    try:
+        stats_filename = os.path.join(work_dir, 'stats.txt')
+        start = time.perf_counter()
+        GenerateStats(stats_filename, args.dumps, args.components, args.stats, args.stats_period, args.seed)
+        stats_size = os.path.getsize(stats_filename)
+        print('Generated {:.1f} MB stats file in {:.1f} s: {} dumps, {} components, {} stats per component'.format(
+            stats_size / 1.0E6, time.perf_counter() - start, args.dumps, args.components, args.stats
+        ))
+        if args.keep_stats:
+            shutil.copyfile(stats_filename, args.keep_stats)
+
+        components = Components(args.components)
+        results = {}
+
+        print('')
+        print('{:<12} {:>12} {:>12} {:>12} {:>14}'.format('Backend', 'Parse (s)', 'MB/s', 'Write (s)', 'Peak memory (MB)'))
+        for name in selected:
+            parse_time, write_time, peak_memory = Measure(
+                backends[name], stats_filename, components, args.stats_period, args.repeat
+            )
+            results[name] = {
+                'parse_time': parse_time,
+                'parse_mb_per_s': stats_size / 1.0E6 / parse_time,
+                'write_time': write_time,
+                'peak_memory': peak_memory,
+            }
+            print('{:<12} {:>12.3f} {:>12.2f} {:>12.3f} {:>14.1f}'.format(
+                name, parse_time, results[name]['parse_mb_per_s'], write_time, peak_memory / 1.0E6
+            ))
+    finally:
+        shutil.rmtree(work_dir)
+
+    # results are only comparable for the same synthetic file
+    workload = {
+        'dumps': args.dumps,
+        'components': args.components,
+        'stats': args.stats,
+        'seed': args.seed,
+    }
+
+    print('')
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump({'workload': workload, 'results': results}, baseline_file, indent = 4, sort_keys = True)
+        print('Baseline saved to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline at {}, save one with --save_baseline'.format(args.baseline))
+        return 0
+
+    with open(args.baseline, 'r') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline['workload'] != workload:
+        print('The baseline was measured on a different stats file, save a new one with --save_baseline')
+        return 0
+
+    regressions = CompareWithBaseline(results, baseline['results'], args.tolerance)
+    for regression in regressions:
+        print('Slower than the baseline: {}'.format(regression))
+    if regressions:
+        return 1
+
+    print('No backend is slower than the baseline')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+# --------------------------------------------------------------------------
+# Cache Model
+# Trace-driven model of the cache hierarchy of caches.py for pre-screening
+# cache configurations before simulating them with gem5. The accesses from
+# every core to its L1 caches are captured once by a --mem_trace=True run
+# and replayed through LRU caches with the sizes and associativities to
+# screen.
+#
+# The model works on LRU stack distances: one pass over an access stream
+# for a number of sets gives the misses of every associativity with that
+# number of sets, so most configurations of a sweep cost no extra pass. The
+# private L2 cache of every core sees the misses of the core's L1 caches,
+# and the shared L3 cache the misses of every L2 cache in tick order.
+# Writebacks, prefetches and coherence traffic are not modeled.
+#
+# usage: python3 cache_model.py m5out/icache.trc.gz m5out/dcache.trc.gz
+#            --l2_size 64kB,128kB,256kB,512kB --l2_assoc 4,8,16,32
+#        python3 cache_model.py m5out/icache0.trc.gz m5out/dcache0.trc.gz
+#            m5out/icache1.trc.gz m5out/dcache1.trc.gz --include_l3_cache True
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import gzip
+import itertools
+import os
+import struct
+import time
+
+import numpy
+
+from data_extraction import CacheLevels
+from power_equations import *
+from power_eval import EvaluateExpression
+from results_db import SizeBytes
+from system_options import CoreIndexes
+from system_options import CreateOptionParser
+from system_options import OPERATING_POINTS
+from system_options import StrToBool
+
+# --------------------------------------------------------------------------
+# Defaults
+# --------------------------------------------------------------------------
+# cache line size of the simulated system
+BLOCK_SIZE = 64
+
+# stats dump period of system.py, used to spread accesses over intervals
+STATS_PERIOD = 0.1E-3
+
+# cache levels as (name, size option, assoc option)
+CACHE_LEVELS = (
+    ("l1i", "l1i_size", "l1i_assoc"),
+    ("l1d", "l1d_size", "l1d_assoc"),
+    ("l2", "l2_size", "l2_assoc"),
+    ("l3", "l3_size", "l3_assoc"),
+)
+
+# paths of the caches of every level in a system of num_cores cores, one
+# per core for the private caches and one for the shared L3 cache
+def CachePaths(num_cores):
+
+    paths = {}
+    for index in CoreIndexes(num_cores):
+        for level, path in CacheLevels(index):
+            if path not in paths.setdefault(level, []):
+                paths[level].append(path)
+
+    return paths
+
+# --------------------------------------------------------------------------
+# Load Trace
+# --------------------------------------------------------------------------
+# magic number at the start of a gem5 protobuf trace
+TRACE_MAGIC = b"gem5"
+
+def ReadVarint(data, position):
+    """Decodes the protobuf varint at position in data. Returns its value
+    and the position after it.
+    """
+
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+def DecodeMessage(data):
+    """Decodes the scalar fields of a protobuf message into a dict keyed by
+    field number. Repeated and nested fields keep their last value.
+    """
+
+    fields = {}
+    position = 0
+    while position < len(data):
+        key, position = ReadVarint(data, position)
+        wire_type = key & 0x7
+        if wire_type == 0:
+            value, position = ReadVarint(data, position)
+        elif wire_type == 1:
+            value = struct.unpack_from("<Q", data, position)[0]
+            position += 8
+        elif wire_type == 2:
+            length, position = ReadVarint(data, position)
+            value = data[position:position + length]
+            position += length
+        elif wire_type == 5:
+            value = struct.unpack_from("<I", data, position)[0]
+            position += 4
+        else:
+            raise ValueError("unsupported protobuf wire type {}".format(wire_type))
+        fields[key >> 3] = value
+
+    return fields
+
+def LoadTrace(trace_filename):
+    """Reads a packet trace written by a CommMonitor's MemTraceProbe. Returns
+    the tick, address and size of every request along with the tick
+    frequency. The trace is decoded without gem5's protobuf bindings, and
+    the decoded arrays are kept next to the trace so later screenings skip
+    the decoding.
+    """
+
+    decoded_filename = trace_filename + ".npz"
+    if os.path.exists(decoded_filename) and os.path.getmtime(decoded_filename) >= os.path.getmtime(trace_filename):
+        with numpy.load(decoded_filename) as decoded:
+            return decoded["ticks"], decoded["addresses"], decoded["sizes"], int(decoded["tick_freq"])
+
+    opener = gzip.open if trace_filename.endswith(".gz") else open
+    with opener(trace_filename, "rb") as trace_file:
+        data = trace_file.read()
+
+    if data[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError("{} is not a gem5 trace".format(trace_filename))
+
+    position = len(TRACE_MAGIC)
+    messages = []
+    while position < len(data):
+        length, position = ReadVarint(data, position)
+        messages.append(DecodeMessage(data[position:position + length]))
+        position += length
+
+    # the first message is the PacketHeader, the others are Packets with
+    # tick = 1, addr = 3 and size = 4
+    header = messages[0]
+    packets = messages[1:]
+
+    ticks = numpy.array([packet.get(1, 0) for packet in packets], dtype = numpy.int64)
+    addresses = numpy.array([packet.get(3, 0) for packet in packets], dtype = numpy.uint64)
+    sizes = numpy.array([packet.get(4, 0) for packet in packets], dtype = numpy.uint64)
+
+    tick_freq = header.get(3, 10**12)
+
+    numpy.savez(decoded_filename, ticks = ticks, addresses = addresses, sizes = sizes, tick_freq = tick_freq)
+
+    return ticks, addresses, sizes, tick_freq
+
+# --------------------------------------------------------------------------
+# Stack Distances
+# --------------------------------------------------------------------------
+def StackDistances(blocks, sets, depth):
+    """Returns the LRU stack distance of every access of blocks within its
+    set, for a cache with sets sets. An access hits in a cache with
+    associativity assoc if its distance is below assoc. Distances of depth
+    or more, including first accesses, are reported as depth.
+
+    Every access is handled at once, one stack position at a time. Before an
+    access, position 0 of its set's stack holds the block of the previous
+    access to the set, and position p + 1 holds what position p held before
+    the latest earlier access to the set that did not hit above p + 1.
+    """
+
+    blocks = numpy.asarray(blocks, dtype = numpy.int64)
+    distances = numpy.full(len(blocks), depth, dtype = numpy.int64)
+    if not len(blocks):
+        return distances
+
+    # accesses grouped by set, in program order within each set
+    set_index = blocks % sets
+    order = numpy.argsort(set_index, kind = "stable")
+    sorted_blocks = blocks[order]
+    sorted_sets = set_index[order]
+
+    ranks = numpy.arange(len(blocks))
+    set_firsts = numpy.concatenate(([True], sorted_sets[1:] != sorted_sets[:-1]))
+    set_starts = numpy.maximum.accumulate(numpy.where(set_firsts, ranks, 0))
+
+    # rank of the access that left its block at the current stack position
+    # before every access, -1 where the stack is not that deep yet
+    holders = numpy.where(set_firsts, -1, ranks - 1)
+    sorted_distances = numpy.full(len(blocks), depth, dtype = numpy.int64)
+    missing = numpy.ones(len(blocks), dtype = bool)
+
+    for position in range(depth):
+        hits = missing & (holders >= 0) & (sorted_blocks[holders] == sorted_blocks)
+        sorted_distances[hits] = position
+        missing &= ~hits
+
+        latest = numpy.maximum.accumulate(numpy.where(missing, ranks, -1))
+        previous = numpy.concatenate(([-1], latest[:-1]))
+        holders = numpy.where(previous >= set_starts, holders[previous], -1)
+        if not (missing & (holders >= 0)).any():
+            break
+
+    distances[order] = sorted_distances
+
+    return distances
+
+# --------------------------------------------------------------------------
+# Cache Model Class
+# --------------------------------------------------------------------------
+class CacheModel:
+    """Replays the instruction and data traces of every core through the
+    cache hierarchy. traces holds the (icache trace, dcache trace) pair of
+    every core in core order. Stack distances and miss streams are
+    memoized, so configurations that share a number of sets, or share their
+    upper levels, reuse the work.
+    """
+
+    def __init__(self, traces, max_assoc = 64):
+
+        self.max_assoc = max_assoc
+        self.num_cores = len(traces)
+
+        # merge the instruction and data accesses of every core in tick
+        # order. The instruction accesses of core c are source 2c and its
+        # data accesses source 2c + 1. A request spanning two blocks
+        # touches both.
+        streams = []
+        tick_freq = 10**12
+        trace_filenames = [trace_filename for core_traces in traces for trace_filename in core_traces]
+        for source, trace_filename in enumerate(trace_filenames):
+            ticks, addresses, sizes, tick_freq = LoadTrace(trace_filename)
+            first = addresses // BLOCK_SIZE
+            last = (addresses + numpy.maximum(sizes, 1) - 1) // BLOCK_SIZE
+            spans = last != first
+            streams.append((
+                numpy.concatenate((ticks, ticks[spans])),
+                numpy.concatenate((first, last[spans])).astype(numpy.int64),
+                numpy.full(len(ticks) + int(spans.sum()), source)
+            ))
+
+        ticks = numpy.concatenate([stream[0] for stream in streams])
+        order = numpy.argsort(ticks, kind = "stable")
+        self.ticks = ticks[order]
+        self.blocks = numpy.concatenate([stream[1] for stream in streams])[order]
+        self.sources = numpy.concatenate([stream[2] for stream in streams])[order]
+
+        # every access falls in one stats dump interval
+        self.intervals = (self.ticks // int(tick_freq * STATS_PERIOD)).astype(numpy.int64)
+        self.num_intervals = int(self.intervals.max()) + 1 if len(self.intervals) else 0
+
+        self.distances = {}
+        self.streams = {}
+
+    # ----------------------------------------------------------------------
+    # Level Misses
+    # ----------------------------------------------------------------------
+    def Misses(self, stream_key, accesses, size, assoc):
+        """Returns the miss mask of the access indexes accesses in a cache
+        of size bytes and associativity assoc. stream_key identifies the
+        access stream for memoization.
+        """
+
+        assoc = int(assoc)
+        if assoc > self.max_assoc:
+            raise ValueError("associativity {} is above the modeled {}".format(assoc, self.max_assoc))
+
+        sets = max(1, SizeBytes(size) // (BLOCK_SIZE * assoc))
+        key = (stream_key, sets)
+        if key not in self.distances:
+            # the distances for a number of sets cover every associativity
+            # up to max_assoc
+            self.distances[key] = StackDistances(self.blocks[accesses], sets, self.max_assoc)
+
+        return self.distances[key] >= assoc
+
+    def Stream(self, stream_key, build):
+        """Returns the memoized access indexes of stream_key.
+        """
+
+        if stream_key not in self.streams:
+            self.streams[stream_key] = build()
+
+        return self.streams[stream_key]
+
+    # ----------------------------------------------------------------------
+    # Evaluate
+    # ----------------------------------------------------------------------
+    def Evaluate(self, config):
+        """Returns the accesses and misses of every cache of every level for
+        config, a dict of system.py cache options, as a list per level with
+        one (accesses, misses) pair per core for the private caches and one
+        for the shared L3 cache.
+        """
+
+        results = dict((level, []) for level, size_option, assoc_option in CACHE_LEVELS[:3])
+
+        # the cache options of the levels above each level, which decide the
+        # access stream the level sees
+        upper_keys = [()]
+        for level, size_option, assoc_option in CACHE_LEVELS[:3]:
+            upper_keys.append(upper_keys[-1] + (config[size_option], config[assoc_option]))
+
+        l3_accesses = []
+        for core in range(self.num_cores):
+            # the L1 caches see the instruction and data accesses of the core
+            l2_accesses = []
+            for level, size_option, assoc_option in CACHE_LEVELS[:2]:
+                source = 2 * core + (0 if level == "l1i" else 1)
+                stream_key = (level, core)
+                accesses = self.Stream(stream_key, lambda: numpy.flatnonzero(self.sources == source))
+                misses = self.Misses(stream_key, accesses, config[size_option], config[assoc_option])
+                results[level].append((accesses, misses))
+                l2_accesses.append(accesses[misses])
+
+            # the L2 cache sees the misses of both L1 caches in tick order
+            level, size_option, assoc_option = CACHE_LEVELS[2]
+            stream_key = (level, core) + upper_keys[2]
+            accesses = self.Stream(stream_key, lambda: numpy.sort(numpy.concatenate(l2_accesses)))
+            misses = self.Misses(stream_key, accesses, config[size_option], config[assoc_option])
+            results[level].append((accesses, misses))
+            l3_accesses.append(accesses[misses])
+
+        # the shared L3 cache sees the misses of every L2 cache in tick order
+        if StrToBool(config["include_l3_cache"]):
+            level, size_option, assoc_option = CACHE_LEVELS[3]
+            stream_key = (level,) + upper_keys[3]
+            accesses = self.Stream(stream_key, lambda: numpy.sort(numpy.concatenate(l3_accesses)))
+            misses = self.Misses(stream_key, accesses, config[size_option], config[assoc_option])
+            results[level] = [(accesses, misses)]
+
+        return results
+
+    # per-interval counts of the accesses indexes
+    def IntervalCounts(self, accesses):
+
+        return numpy.bincount(self.intervals[accesses], minlength = self.num_intervals).astype(numpy.float64)
+
+    # ----------------------------------------------------------------------
+    # Power
+    # ----------------------------------------------------------------------
+    def Power(self, results, level, equations, equation, cache_opp):
+        """Estimates the mean dynamic and static power of a cache level,
+        summed over its caches, by evaluating its power modeling equation on
+        the modeled per-interval accesses, hits and misses of every cache at
+        the voltage of the operating point cache_opp. Returns NaN for an
+        equation that uses stats the model does not produce.
+        """
+
+        voltage = OPERATING_POINTS[int(cache_opp)][1]
+        dynamic_power = 0.0
+        static_power = 0.0
+        for path, (accesses, misses) in zip(CachePaths(self.num_cores)[level], results[level]):
+            columns = {
+                path + ".overallAccesses": self.IntervalCounts(accesses),
+                path + ".overallMisses": self.IntervalCounts(accesses[misses]),
+                path + ".overallHits": self.IntervalCounts(accesses[~misses]),
+                VOLTAGE: voltage,
+                TEMPERATURE: AMBIENT_TEMPERATURE,
+            }
+
+            dynamic, static = PowerEquation(equations, path, equation)
+            try:
+                dynamic_power += EvaluateExpression(dynamic, columns, self.num_intervals).mean()
+                static_power += EvaluateExpression(static, columns, self.num_intervals).mean()
+            except KeyError:
+                return numpy.nan, numpy.nan
+
+        return dynamic_power, static_power
+
+# --------------------------------------------------------------------------
+# Model Options
+# --------------------------------------------------------------------------
+# system.py options screened by the model
+def ModelOptions():
+
+    return [option for level in CACHE_LEVELS for option in level[1:]] + ["include_l3_cache"]
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    # the cache options of system.py and their defaults, which are those of
+    # caches.py
+    system_parser, parameters = CreateOptionParser()
+    defaults = vars(system_parser.parse_args([]))
+
+    parser = argparse.ArgumentParser(
+        description = 'Screens cache configurations by replaying traces of a --mem_trace=True run.'
+    )
+    parser.add_argument(
+        'traces',
+        nargs = '+',
+        help = 'icache and dcache traces written by a --mem_trace=True run, a pair per core in core order: icache.trc.gz dcache.trc.gz for a single core, icache0.trc.gz dcache0.trc.gz icache1.trc.gz dcache1.trc.gz and so on for more cores.'
+    )
+    for level, size_option, assoc_option in CACHE_LEVELS:
+        parser.add_argument(
+            '--' + size_option,
+            default = str(defaults[size_option]),
+            help = 'Comma separated {} sizes to screen. Default: {}.'.format(level.upper(), defaults[size_option])
+        )
+        parser.add_argument(
+            '--' + assoc_option,
+            default = str(defaults[assoc_option]),
+            help = 'Comma separated {} associativities to screen. Default: {}.'.format(level.upper(), defaults[assoc_option])
+        )
+    parser.add_argument(
+        '--include_l3_cache',
+        default = str(defaults['include_l3_cache']),
+        help = 'Comma separated True | False values to screen. Default: {}.'.format(defaults['include_l3_cache'])
+    )
+    parser.add_argument(
+        '--cache_opp',
+        default = defaults['cache_opp'],
+        type = int,
+        choices = range(len(OPERATING_POINTS)),
+        help = 'Operating point of the L2 and L3 caches, whose voltage the power is estimated at. Default: {}.'.format(defaults['cache_opp'])
+    )
+    parser.add_argument(
+        '--l2_pwr_eq',
+        default = 0,
+        type = int,
+        help = 'Equation used for the L2 cache\'s power consumption. Default: 0.'
+    )
+    parser.add_argument(
+        '--l3_pwr_eq',
+        default = 0,
+        type = int,
+        help = 'Equation used for the L3 cache\'s power consumption. Default: 0.'
+    )
+    args = parser.parse_args()
+
+    if len(args.traces) % 2:
+        parser.error('the traces must be given as an icache and dcache pair per core')
+    traces = list(zip(args.traces[::2], args.traces[1::2]))
+
+    # the stack distances only need to be as deep as the largest
+    # associativity screened
+    max_assoc = max(
+        int(assoc) for level in CACHE_LEVELS for assoc in getattr(args, level[2]).split(',')
+    )
+
+    start = time.time()
+    model = CacheModel(traces, max_assoc)
+    print("{} accesses of {} cores loaded in {:.2f} s".format(len(model.blocks), model.num_cores, time.time() - start))
+
+    # every combination of the screened values
+    options = ModelOptions()
+    configs = [
+        dict(zip(options, values))
+        for values in itertools.product(*(getattr(args, option).split(',') for option in options))
+    ]
+
+    start = time.time()
+    rows = []
+    for config in configs:
+        results = model.Evaluate(config)
+        l2_power = model.Power(results, "l2", L2_EQUATIONS, args.l2_pwr_eq, args.cache_opp)
+        l3_power = (numpy.nan, numpy.nan)
+        if "l3" in results:
+            l3_power = model.Power(results, "l3", L3_EQUATIONS, args.l3_pwr_eq, args.cache_opp)
+        rows.append((config, results, sum(l2_power), sum(l3_power)))
+    elapsed = time.time() - start
+
+    header = "{:>8} {:>5} {:>8} {:>5} {:>8} {:>5} {:>8} {:>5} {:>3}".format(
+        "L1I", "way", "L1D", "way", "L2", "way", "L3", "way", "L3?"
+    )
+    header += "".join(" {:>12}".format(level.upper() + " misses") for level, size_option, assoc_option in CACHE_LEVELS)
+    header += " {:>12} {:>12}".format("L2 (W)", "L3 (W)")
+    print(header)
+    for config, results, l2_power, l3_power in rows:
+        line = "{:>8} {:>5} {:>8} {:>5} {:>8} {:>5} {:>8} {:>5} {:>3}".format(
+            config["l1i_size"], config["l1i_assoc"], config["l1d_size"], config["l1d_assoc"],
+            config["l2_size"], config["l2_assoc"], config["l3_size"], config["l3_assoc"],
+            "Y" if StrToBool(config["include_l3_cache"]) else "N"
+        )
+        for level, size_option, assoc_option in CACHE_LEVELS:
+            line += " {:>12}".format(
+                int(sum(misses.sum() for accesses, misses in results[level])) if level in results else "-"
+            )
+        line += " {:>12.6g} {:>12.6g}".format(l2_power, l3_power)
+        print(line)
+
+    print("{} configurations evaluated in {:.2f} s".format(len(configs), elapsed))
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,84 @@
 # --------------------------------------------------------------------------------
 # Import Libraries
 # --------------------------------------------------------------------------------
+from m5.objects import AMPMPrefetcher
+from m5.objects import BIPRP
+from m5.objects import BOPPrefetcher
+from m5.objects import BRRIPRP
 from m5.objects import Cache
 from m5.objects import CoherentXBar
+from m5.objects import DCPTPrefetcher
+from m5.objects import FIFORP
+from m5.objects import LIPRP
+from m5.objects import LRURP
+from m5.objects import MRURP
+from m5.objects import RandomRP
+from m5.objects import RRIPRP
+from m5.objects import SecondChanceRP
+from m5.objects import SignaturePathPrefetcher
 from m5.objects import SnoopFilter
+from m5.objects import StridePrefetcher
 from m5.objects import SubSystem
+from m5.objects import TaggedPrefetcher
+from m5.objects import TreePLRURP
+
+# --------------------------------------------------------------------------------
+# Prefetchers
+# gem5 prefetcher selected by each --<level>_prefetcher option
+# --------------------------------------------------------------------------------
+PREFETCHER_CLASSES = {
+    'stride': StridePrefetcher,
+    'tagged': TaggedPrefetcher,
+    'best_offset': BOPPrefetcher,
+    'ampm': AMPMPrefetcher,
+    'signature_path': SignaturePathPrefetcher,
+    'dcpt': DCPTPrefetcher,
+}
+
+def AddPrefetcher(cache, options, level):
+    """Attaches the prefetcher selected for level, such as l1d, to cache.
+    The degree and distance are only set when given, and only on
+    prefetchers that have them.
+    """
+
+    name = getattr(options, level + '_prefetcher', 'none')
+    if not name or name == 'none':
+        return
+
+    prefetcher = PREFETCHER_CLASSES[name]()
+    for param in ('degree', 'distance'):
+        value = getattr(options, '{}_prefetch_{}'.format(level, param), 0)
+        if value:
+            if param not in type(prefetcher)._params:
+                raise ValueError('the {} prefetcher has no {}'.format(name, param))
+            setattr(prefetcher, param, value)
+
+    cache.prefetcher = prefetcher
+
+# --------------------------------------------------------------------------------
+# Replacement Policies
+# gem5 replacement policy selected by each --<level>_repl option
+# --------------------------------------------------------------------------------
+REPLACEMENT_POLICY_CLASSES = {
+    'lru': LRURP,
+    'random': RandomRP,
+    'fifo': FIFORP,
+    'mru': MRURP,
+    'lip': LIPRP,
+    'bip': BIPRP,
+    'rrip': RRIPRP,
+    'brrip': BRRIPRP,
+    'tree_plru': TreePLRURP,
+    'second_chance': SecondChanceRP,
+}
+
+def SetReplacementPolicy(cache, options, level):
+    """Gives cache the replacement policy selected for level, such as l2.
+    """
+
+    name = getattr(options, level + '_repl', None)
+    if name:
+        cache.replacement_policy = REPLACEMENT_POLICY_CLASSES[name]()
 
 # --------------------------------------------------------------------------------
 # L1 Cache
@@ -30,6 +104,10 @@ class L1Cache(Cache):
     def connectCPU(self, cpu):
         raise NotImplementedError
     
+    # connects a monitor placed between the CPU and the cache
+    def connectMonitor(self, monitor):
+        self.cpu_side = monitor.mem_side_port
+
     # connects a bus to the cache
     def connectBus(self, bus):
         self.mem_side = bus.cpu_side_ports
@@ -57,6 +135,8 @@ class L1ICache(L1Cache):
                 self.data_latency = options.l1i_data_latency
             if options.l1i_assoc:
                 self.assoc = options.l1i_assoc
+            AddPrefetcher(self, options, 'l1i')
+            SetReplacementPolicy(self, options, 'l1i')
 
     # connects the CPU to the L1 instruction cache
     def connectCPU(self, cpu):
@@ -83,6 +163,8 @@ class L1DCache(L1Cache):
                 self.size = options.l1d_size
             if options.l1d_assoc:
                 self.assoc = options.l1d_assoc
+            AddPrefetcher(self, options, 'l1d')
+            SetReplacementPolicy(self, options, 'l1d')
 
     # connects a CPU to the L1 data cache
     def connectCPU(self, cpu):
@@ -113,6 +195,13 @@ class L2Cache(Cache):
                 self.size = options.l2_size
             if options.l2_assoc:
                 self.assoc = options.l2_assoc
+            AddPrefetcher(self, options, 'l2')
+            SetReplacementPolicy(self, options, 'l2')
+
+            # an exclusive L3 cache is only filled by the L2 evictions, so
+            # the clean lines are written back as well
+            if options.include_l3_cache and options.l3_inclusion == 'exclusive':
+                self.writeback_clean = True
 
     # connects the CPU side bus
     def connectCPUSideBus(self, bus):
@@ -148,6 +237,10 @@ class L3Cache(Cache):
                 self.size = options.l3_size
             if options.l3_assoc:
                 self.assoc = options.l3_assoc
+            AddPrefetcher(self, options, 'l3')
+            SetReplacementPolicy(self, options, 'l3')
+            if options.l3_inclusion == 'exclusive':
+                self.clusivity = 'mostly_excl'
 
     # connects the CPU side bus
     def connectCPUSideBus(self, bus):
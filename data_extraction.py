@@ -1,3 +1,142 @@
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import struct
+import threading
+import zipfile
+from array import array
+
+from system_options import CoreIndexes
+
+# --------------------------------------------------------------------------
+# Stat Names
+# --------------------------------------------------------------------------
+# power statistics reported by each component's power model
+POWER_STATS = ("dynamicPower", "staticPower")
+
+# markers gem5 writes around every stats dump
+DUMP_MARKER = "----------"
+DUMP_BEGIN = "Begin"
+DUMP_END = "End"
+
+# stat holding the tick every dump was taken at
+DUMP_TICK_STAT = "finalTick"
+
+# column header of the power .csv files
+POWER_CSV_HEADER = "Dynamic Power (Watts), Static Power (Watts)\n"
+
+# caches whose hits, misses and miss latency are extracted, as (name, path),
+# for the core whose SimObjects carry the suffix index. The L3 cache is
+# shared by every core.
+def CacheLevels(index = ""):
+
+    return (
+        ("l1i", "system.processor.cpu{}.icache".format(index)),
+        ("l1d", "system.processor.cpu{}.dcache".format(index)),
+        ("l2", "system.processor.l2cache{}".format(index)),
+        ("l3", "system.processor.l3cache"),
+    )
+
+# statistics of every cache, as (name, stat)
+CACHE_STATS = (("hits", "overallHits"), ("misses", "overallMisses"), ("miss_latency", "overallMissLatency"))
+
+# statistics of every cache's prefetcher: the prefetched blocks that were
+# used, and those evicted unused
+PREFETCH_STATS = (("pf_issued", "pfIssued"), ("pf_useful", "pfUseful"), ("pf_useless", "pfUnused"))
+
+# performance statistics that take the largest value over the cores rather
+# than their sum. The cores share a clock, so the cycles of a run are those
+# of the core that was active longest.
+ELAPSED_STATS = ("cycles",)
+
+def PerformanceStats(num_cores = 1, mem_channels = 1):
+    """Returns the performance statistics extracted alongside power, as
+    (name, full stat names) pairs. The stats of every core, cache and memory
+    channel of a system with num_cores cores and mem_channels memory
+    channels are listed under one name and combined into one value per
+    dump. Vector stats are also matched with their ::total suffix.
+    """
+
+    core_indexes = CoreIndexes(num_cores)
+
+    # the paths of every cache level, the shared L3 cache listed once
+    cache_paths = {}
+    for index in core_indexes:
+        for level, path in CacheLevels(index):
+            paths = cache_paths.setdefault(level, [])
+            if path not in paths:
+                paths.append(path)
+
+    return (
+        [
+            (name, ["system.processor.cpu{}.{}".format(index, stat) for index in core_indexes])
+            for name, stat in (("committed_insts", "committedInsts"), ("cycles", "numCycles"), ("ipc", "ipc"))
+        ] + [
+            ("{}_{}".format(level, name), ["{}.{}".format(path, stat) for path in paths])
+            for level, paths in cache_paths.items()
+            for name, stat in CACHE_STATS
+        ] + [
+            ("{}_{}".format(level, name), ["{}.prefetcher.{}".format(path, stat) for path in paths])
+            for level, paths in cache_paths.items()
+            for name, stat in PREFETCH_STATS
+        ] + [
+            ("mem_{}".format(name), [
+                "system.mem_ctrl{}.dram.{}".format(index, stat) for index in CoreIndexes(mem_channels)
+            ])
+            for name, stat in (("read_bandwidth", "bwRead"), ("write_bandwidth", "bwWrite"))
+        ]
+    )
+
+# performance statistics of a single core system with one memory channel
+PERFORMANCE_STATS = PerformanceStats()
+
+# energy stats DRAMPower reports for every rank of a DRAM, in picojoules.
+# The energy of the commands is the DRAM's dynamic energy, the background,
+# power-down and refresh energy its static energy.
+DRAM_DYNAMIC_ENERGY_STATS = ("actEnergy", "preEnergy", "readEnergy", "writeEnergy")
+DRAM_STATIC_ENERGY_STATS = (
+    "refreshEnergy", "actBackEnergy", "preBackEnergy", "actPowerDownEnergy", "prePowerDownEnergy", "selfRefreshEnergy"
+)
+
+# bandwidth stats of every memory channel in bytes per second, as (name,
+# stat)
+DRAM_BANDWIDTH_STATS = (("read_bandwidth", "bwRead"), ("write_bandwidth", "bwWrite"))
+
+# picojoules per Joule
+PICOJOULES = 1.0E12
+
+# --------------------------------------------------------------------------
+# CSV Helpers
+# --------------------------------------------------------------------------
+def WriteCsvParameters(csv_file, parameters):
+    """Writes the simulation parameters at the top of a .csv file.
+    """
+
+    for i in range(len(parameters[0])):
+        csv_file.write("{}\n".format(parameters[0][i]))
+        csv_file.write("{}\n\n".format(parameters[1][i]))
+
+def WriteCsvFooter(csv_file, exiting_tick, stats_period):
+    """Writes the exiting tick value and the stats dump period at the bottom
+    of a .csv file.
+    """
+
+    csv_file.write("\n")
+    csv_file.write("Exiting Tick, Stats Dump Period (seconds)\n")
+    csv_file.write("{}, {}\n".format(exiting_tick, stats_period))
+
+def CreateHostCsv(parameters, csv_filename, host):
+    """Writes the host cost of a run, a list of (name, value) pairs, to a
+    .csv file below the simulation parameters.
+    """
+
+    csv_file = open(csv_filename, "w")
+
+    WriteCsvParameters(csv_file, parameters)
+    csv_file.write(", ".join(name for name, value in host) + "\n")
+    csv_file.write(", ".join(str(value) for name, value in host) + "\n")
+
+    csv_file.close()
 
 # --------------------------------------------------------------------------
 # Data Extraction Class
@@ -5,46 +144,478 @@
 class DataExtraction:
     """This class extracts relevant data from the gem5 output text file and
     places the data in a .csv file.
+
+    The stats file is streamed once, one line at a time. Every stat key that
+    a component registers is routed into that component's arrays during the
+    single pass, so memory use only grows with the number of dumps and the
+    number of extracted stats, never with the size of the stats file.
     """
 
     # ----------------------------------------------------------------------
     # Constructor
     # ----------------------------------------------------------------------
     def __init__(self, exiting_tick, stats_period, stats_filename = "m5out/stats.txt"):
-        """Constructor function. Reads the gem5 output test file.
+        """Constructor function. Registers the components whose data is
+        extracted from the gem5 output text file.
         """
 
         self.exiting_tick = exiting_tick
         self.stats_period = stats_period
+        self.stats_filename = stats_filename
+
+        # maps a full stat name to the array its values are appended to
+        self.stat_routes = {}
+
+        # per-component arrays of extracted values, keyed by stat name
+        self.component_data = {}
+
+        # components whose power is the sum of other components
+        self.aggregates = {}
+
+        # DRAM components, mapping every summed stat to the keys of the
+        # channels and ranks it is summed over
+        self.drams = {}
+
+        # maps every performance statistic to the keys of the cores, caches
+        # and memory channels it is combined over
+        self.performance = {}
 
-        with open(stats_filename, "r") as stats_file:
-            self.stats_lines = stats_file.readlines()
+        self.parsed = False
+
+        # values of the dump block currently being parsed
+        self.block = []
+
+        # (begin tick, end tick) of the region of interest, dumps outside of
+        # it are dropped. None keeps every dump.
+        self.roi = None
+
+        # register the components extracted by default
+        self.AddComponent("cpu", "system.processor.cpu.power_model.pm0", POWER_STATS)
+        self.AddComponent("l2_cache", "system.processor.l2cache.power_model.pm0", POWER_STATS)
+        self.AddComponent("l3_cache", "system.processor.l3cache.power_model.pm0", POWER_STATS)
+
+        # register the tick of every dump, used to select the region of
+        # interest
+        self.AddStat("dumps", "tick", [DUMP_TICK_STAT])
+        self.dump_ticks = self.component_data["dumps"]["tick"]
+
+        # register the performance statistics that are aligned with power
+        self.AddPerformance(1)
+
+    # ----------------------------------------------------------------------
+    # Add Component
+    # ----------------------------------------------------------------------
+    def AddComponent(self, component, stat_path, stat_names):
+        """Registers the stats named stat_names under stat_path so they are
+        collected for component during the parsing pass. Components must be
+        added before the stats file is parsed.
+        """
+
+        for stat_name in stat_names:
+            self.AddStat(component, stat_name, ["{}.{}".format(stat_path, stat_name)])
+
+    # ----------------------------------------------------------------------
+    # Add Stat
+    # ----------------------------------------------------------------------
+    def AddStat(self, component, stat_name, stat_keys):
+        """Registers the full stat names in stat_keys so their values are
+        collected as stat_name of component. A stat that gem5 prints under
+        different names, for example a vector stat printed with a ::total
+        suffix, routes all of them into the same array.
+        """
+
+        if self.parsed:
+            raise RuntimeError("stats must be added before the stats file is parsed")
+
+        values = self.component_data.setdefault(component, {}).setdefault(stat_name, array("d"))
+        for stat_key in stat_keys:
+            self.stat_routes[stat_key] = values
+
+    # ----------------------------------------------------------------------
+    # Add Aggregate
+    # ----------------------------------------------------------------------
+    def AddAggregate(self, aggregate, components):
+        """Registers aggregate as a component whose dynamic and static power
+        are the sum of the power of components in every dump, for example
+        the total power of every core.
+        """
+
+        self.aggregates[aggregate] = list(components)
+
+    # ----------------------------------------------------------------------
+    # Add DRAM
+    # ----------------------------------------------------------------------
+    def AddDram(self, component, ctrl_paths, ranks):
+        """Registers component as the main memory behind the memory
+        controllers at ctrl_paths, each driving a DRAM of ranks ranks. Its
+        dynamic and static power are derived from the energy of every rank
+        over the stats dump period, and its read and write bandwidth are
+        summed over the channels.
+        """
+
+        groups = {"dynamicPower": [], "staticPower": []}
+        for ctrl_path in ctrl_paths:
+            for rank in range(ranks):
+                rank_path = "{}.dram.rank{}".format(ctrl_path, rank)
+                for stat_names, group in ((DRAM_DYNAMIC_ENERGY_STATS, "dynamicPower"), (DRAM_STATIC_ENERGY_STATS, "staticPower")):
+                    for stat_name in stat_names:
+                        stat_key = "{}.{}".format(rank_path, stat_name)
+                        self.AddStat(component, stat_key, [stat_key])
+                        groups[group].append(stat_key)
+
+            for name, stat_name in DRAM_BANDWIDTH_STATS:
+                stat_key = "{}.dram.{}".format(ctrl_path, stat_name)
+                self.AddStat(component, stat_key, [stat_key, stat_key + "::total"])
+                groups.setdefault(name, []).append(stat_key)
+
+        self.drams[component] = groups
+
+    # ----------------------------------------------------------------------
+    # Add Performance
+    # ----------------------------------------------------------------------
+    def AddPerformance(self, num_cores, mem_channels = 1):
+        """Registers the performance statistics of a system with num_cores
+        cores and mem_channels memory channels, replacing those of the
+        single core system registered by default.
+        """
+
+        self.performance = {}
+        for stat_name, stat_keys in PerformanceStats(num_cores, mem_channels):
+            for stat_key in stat_keys:
+                self.AddStat("performance", stat_key, [stat_key, stat_key + "::total"])
+            self.performance[stat_name] = stat_keys
+
+    # ----------------------------------------------------------------------
+    # Set ROI
+    # ----------------------------------------------------------------------
+    def SetRoi(self, begin_tick, end_tick = None):
+        """Restricts the extracted data to the dumps taken after begin_tick
+        and up to end_tick, the region of interest of the workload. An
+        end_tick of None keeps every dump after begin_tick. Must be set
+        before the dumps are parsed.
+        """
+
+        self.roi = (begin_tick, end_tick)
+
+    # ----------------------------------------------------------------------
+    # Stat Keys
+    # ----------------------------------------------------------------------
+    def StatKeys(self):
+        """Returns the full names of every registered stat, for example to
+        restrict the stats dumps to what is extracted.
+        """
+
+        return sorted(self.stat_routes)
+
+    # ----------------------------------------------------------------------
+    # Parse Stats
+    # ----------------------------------------------------------------------
+    def ParseStats(self):
+        """Streams the gem5 output text file once and routes every registered
+        stat into its component's arrays. Values are only committed once a
+        dump block is complete, so a truncated trailing dump is ignored.
+        """
+
+        with open(self.stats_filename, "r") as stats_file:
+            self.ParseLines(stats_file)
+
+        self.parsed = True
+
+    # ----------------------------------------------------------------------
+    # Parse Lines
+    # ----------------------------------------------------------------------
+    def ParseLines(self, lines):
+        """Routes the registered stats found in lines. A dump block that is
+        still open when lines runs out is kept and continued by the next call.
+        """
+
+        stat_routes = self.stat_routes
+        block = self.block
+
+        for line in lines:
+            # only the stat name and value are needed, leave the
+            # description unsplit
+            line_split = line.split(None, 2)
+            if len(line_split) < 2:
+                continue
+
+            values = stat_routes.get(line_split[0])
+            if values is not None:
+                block.append((values, float(line_split[1])))
+            elif line_split[0] == DUMP_MARKER:
+                if line_split[1] == DUMP_END:
+                    self.CommitBlock(block)
+                block = []
+
+        self.block = block
+
+    # ----------------------------------------------------------------------
+    # Commit Block
+    # ----------------------------------------------------------------------
+    def CommitBlock(self, block):
+        """Appends the values of one complete dump block to the component
+        arrays. Returns False if the block was dropped because it lies
+        outside the region of interest.
+        """
+
+        if self.roi is not None:
+            begin_tick, end_tick = self.roi
+            for values, value in block:
+                if values is self.dump_ticks:
+                    if value <= begin_tick or (end_tick is not None and value > end_tick):
+                        return False
+                    break
+
+        for values, value in block:
+            values.append(value)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    # Get Component Data
+    # ----------------------------------------------------------------------
+    def GetComponentData(self, component):
+        """Returns the arrays extracted for component, keyed by stat name.
+        The stats file is parsed on first use. The power of an aggregate is
+        summed from its components.
+        """
+
+        if not self.parsed:
+            self.ParseStats()
+
+        if component in self.aggregates:
+            return self.GetAggregateData(self.aggregates[component])
+
+        if component in self.drams:
+            return self.GetDramData(component)
+
+        if component == "performance":
+            return self.GetPerformanceData()
+
+        return self.component_data[component]
+
+    # sums the power of components over the dumps they all hold
+    def GetAggregateData(self, components):
+
+        data = [self.GetComponentData(component) for component in components]
+
+        aggregate = {}
+        for stat_name in POWER_STATS:
+            intervals = min(len(values[stat_name]) for values in data)
+            aggregate[stat_name] = array("d", (
+                sum(values[stat_name][i] for values in data) for i in range(intervals)
+            ))
+
+        return aggregate
+
+    # sums the energy and bandwidth of a DRAM over its channels and ranks
+    # and turns its energy into power
+    def GetDramData(self, component):
+
+        dram = CombineStats(self.component_data[component], self.drams[component])
+
+        for stat_name in POWER_STATS:
+            dram[stat_name] = array("d", (
+                energy / PICOJOULES / self.stats_period for energy in dram[stat_name]
+            ))
+
+        return dram
+
+    # combines the performance statistics of every core, cache and memory
+    # channel, without parsing the stats file so a running simulation can
+    # be inspected. stat_names selects the statistics, all by default.
+    def GetPerformanceData(self, stat_names = None):
+
+        groups = self.performance
+        if stat_names is not None:
+            groups = dict((stat_name, groups[stat_name]) for stat_name in stat_names)
+
+        return CombineStats(self.component_data["performance"], groups, ELAPSED_STATS)
 
     # ----------------------------------------------------------------------
     # Create CSV File
     # ----------------------------------------------------------------------
     def CreateCsv(self, parameters, csv_filename, static_power, dynamic_power):
-        """This creates a .csv file and writes the static and dynamic power 
+        """This creates a .csv file and writes the static and dynamic power
         data to the .csv file. This function also writes the exiting tick
         value and the stats dump period.
         """
 
         csv_file = open(csv_filename, "w")
 
-        # writing parameters
-        for i in range(len(parameters[0])):
-            csv_file.write("{}\n".format(parameters[0][i]))
-            csv_file.write("{}\n\n".format(parameters[1][i]))
+        WriteCsvParameters(csv_file, parameters)
 
         # writing power data
-        csv_file.write("Dynamic Power (Watts), Static Power (Watts)\n")
+        csv_file.write(POWER_CSV_HEADER)
         for i in range(len(static_power)):
             csv_file.write("{}, {}\n".format(dynamic_power[i], static_power[i]))
 
-        # writing exiting tick and stats dump period
+        WriteCsvFooter(csv_file, self.exiting_tick, self.stats_period)
+
+        csv_file.close()
+
+    # ----------------------------------------------------------------------
+    # Extract Power Data
+    # ----------------------------------------------------------------------
+    def ExtractPowerData(self, component, parameters, csv_filename):
+        """This function extracts a component's power modeling data and
+        places it into a .csv file.
+        """
+
+        data = self.GetComponentData(component)
+
+        self.CreateCsv(parameters, csv_filename, data["staticPower"], data["dynamicPower"])
+
+    # ----------------------------------------------------------------------
+    # Create NPZ File
+    # ----------------------------------------------------------------------
+    def CreateNpz(self, parameters, npz_filename, static_power, dynamic_power):
+        """This creates an uncompressed .npz file holding the static and
+        dynamic power as float64 columns along with the parameters, the
+        exiting tick and the stats dump period. Requires NumPy.
+        """
+
+        import numpy
+
+        numpy.savez(
+            npz_filename,
+            dynamic_power = numpy.frombuffer(dynamic_power, dtype = numpy.float64),
+            static_power = numpy.frombuffer(static_power, dtype = numpy.float64),
+            parameter_names = numpy.array([str(name) for name in parameters[0]]),
+            parameter_values = numpy.array([str(value) for value in parameters[1]]),
+            exiting_tick = numpy.int64(self.exiting_tick),
+            stats_period = numpy.float64(self.stats_period)
+        )
+
+    # ----------------------------------------------------------------------
+    # Extract Power NPZ
+    # ----------------------------------------------------------------------
+    def ExtractPowerNpz(self, component, parameters, npz_filename):
+        """This function extracts a component's power modeling data and
+        places it into a .npz file.
+        """
+
+        data = self.GetComponentData(component)
+
+        self.CreateNpz(parameters, npz_filename, data["staticPower"], data["dynamicPower"])
+
+    # ----------------------------------------------------------------------
+    # Get Performance Series
+    # ----------------------------------------------------------------------
+    def GetPerformanceSeries(self, components):
+        """Returns the per-interval performance statistics aligned with the
+        power of components, as a list of (name, values) columns, followed by
+        derived columns: the miss rate and prefetch accuracy of every cache,
+        the power and bandwidth of every DRAM among components, the total
+        power and energy of components, the energy per instruction and the
+        energy-delay product of every interval. Statistics missing
+        from the stats file, such as those of an absent L3 cache or
+        prefetcher, are left out.
+        """
+
+        power = [self.GetComponentData(component) for component in components]
+        intervals = min(len(data["dynamicPower"]) for data in power) if power else 0
+        performance = self.GetComponentData("performance")
+
+        series = []
+        for stat_name in self.performance:
+            if len(performance[stat_name]) >= intervals:
+                series.append((stat_name, list(performance[stat_name][:intervals])))
+        columns = dict(series)
+
+        for level, path in CacheLevels():
+            if level + "_hits" in columns and level + "_misses" in columns:
+                series.append((level + "_miss_rate", [
+                    misses / (hits + misses) if hits + misses else 0.0
+                    for hits, misses in zip(columns[level + "_hits"], columns[level + "_misses"])
+                ]))
+            if level + "_pf_issued" in columns and level + "_pf_useful" in columns:
+                series.append((level + "_pf_accuracy", [
+                    useful / issued if issued else 0.0
+                    for issued, useful in zip(columns[level + "_pf_issued"], columns[level + "_pf_useful"])
+                ]))
+
+        for component, data in zip(components, power):
+            if component in self.drams:
+                series.append((component + "_power", [
+                    data["dynamicPower"][i] + data["staticPower"][i] for i in range(intervals)
+                ]))
+                for name, stat_name in DRAM_BANDWIDTH_STATS:
+                    if len(data[name]) >= intervals:
+                        series.append(("{}_{}".format(component, name), list(data[name][:intervals])))
+
+        total_power = [
+            sum(data["dynamicPower"][i] + data["staticPower"][i] for data in power)
+            for i in range(intervals)
+        ]
+        energy = [interval_power * self.stats_period for interval_power in total_power]
+        series.append(("power", total_power))
+        series.append(("energy", energy))
+
+        if "committed_insts" in columns:
+            series.append(("energy_per_inst", [
+                interval_energy / insts if insts else 0.0
+                for interval_energy, insts in zip(energy, columns["committed_insts"])
+            ]))
+
+        # each interval lasts one stats dump period
+        series.append(("energy_delay_product", [interval_energy * self.stats_period for interval_energy in energy]))
+
+        return series
+
+    # ----------------------------------------------------------------------
+    # Get Performance Totals
+    # ----------------------------------------------------------------------
+    def GetPerformanceTotals(self, components):
+        """Returns the whole-run runtime, instructions, IPC, average power,
+        energy, energy per instruction and energy-delay product of
+        components.
+        """
+
+        columns = dict(self.GetPerformanceSeries(components))
+
+        runtime = len(columns["energy"]) * self.stats_period
+        energy = sum(columns["energy"])
+        insts = sum(columns.get("committed_insts", []))
+        cycles = sum(columns.get("cycles", []))
+
+        return [
+            ("runtime", runtime),
+            ("committed_insts", insts),
+            ("ipc", insts / cycles if cycles else 0.0),
+            ("power", energy / runtime if runtime else 0.0),
+            ("energy", energy),
+            ("energy_per_inst", energy / insts if insts else 0.0),
+            ("energy_delay_product", energy * runtime),
+        ]
+
+    # ----------------------------------------------------------------------
+    # Extract Performance Data
+    # ----------------------------------------------------------------------
+    def ExtractPerformanceData(self, components, parameters, csv_filename):
+        """This function places the per-interval performance series of a run
+        and its whole-run totals into a .csv file. Power and energy cover
+        the given components.
+        """
+
+        series = self.GetPerformanceSeries(components)
+        totals = self.GetPerformanceTotals(components)
+
+        csv_file = open(csv_filename, "w")
+
+        WriteCsvParameters(csv_file, parameters)
+
+        # writing the per-interval series
+        csv_file.write(", ".join(name for name, values in series) + "\n")
+        for row in zip(*(values for name, values in series)):
+            csv_file.write(", ".join(str(value) for value in row) + "\n")
+
+        # writing the whole-run totals
         csv_file.write("\n")
-        csv_file.write("Exiting Tick, Stats Dump Period (seconds)\n")
-        csv_file.write("{}, {}\n".format(self.exiting_tick, self.stats_period))
+        csv_file.write(", ".join(name for name, value in totals) + "\n")
+        csv_file.write(", ".join(str(value) for name, value in totals) + "\n")
+
+        WriteCsvFooter(csv_file, self.exiting_tick, self.stats_period)
 
         csv_file.close()
 
@@ -56,18 +627,7 @@ class DataExtraction:
         it into a .csv file.
         """
 
-        dynamic_power = []
-        static_power = []
-
-        for line in self.stats_lines:
-            line_split = line.split()
-            if line_split:
-                if line_split[0] == "system.processor.cpu.power_model.pm0.dynamicPower":
-                    dynamic_power.append(float(line_split[1]))
-                elif line_split[0] == "system.processor.cpu.power_model.pm0.staticPower":
-                    static_power.append(float(line_split[1]))
-        
-        self.CreateCsv(parameters, csv_filename, static_power, dynamic_power)
+        self.ExtractPowerData("cpu", parameters, csv_filename)
 
     # ----------------------------------------------------------------------
     # Extract L2 Cache Power Data
@@ -77,18 +637,7 @@ class DataExtraction:
         places it into a .csv file.
         """
 
-        dynamic_power = []
-        static_power = []
-
-        for line in self.stats_lines:
-            line_split = line.split()
-            if line_split:
-                if line_split[0] == "system.processor.l2cache.power_model.pm0.dynamicPower":
-                    dynamic_power.append(float(line_split[1]))
-                elif line_split[0] == "system.processor.l2cache.power_model.pm0.staticPower":
-                    static_power.append(float(line_split[1]))
-
-        self.CreateCsv(parameters, csv_filename, static_power, dynamic_power)
+        self.ExtractPowerData("l2_cache", parameters, csv_filename)
 
     # ----------------------------------------------------------------------
     # Extract L3 Cache Power Data
@@ -98,15 +647,460 @@ class DataExtraction:
         places it into a .csv file.
         """
 
-        dynamic_power = []
-        static_power = []
+        self.ExtractPowerData("l3_cache", parameters, csv_filename)
+
+# --------------------------------------------------------------------------
+# Load Power NPZ
+# --------------------------------------------------------------------------
+def LoadPowerNpz(npz_filename):
+    """Loads a .npz file written by CreateNpz. The numeric columns of an
+    uncompressed file are memory-mapped straight from the archive instead of
+    being copied into memory. Requires NumPy.
+    """
+
+    import numpy
+
+    arrays = {}
+    with zipfile.ZipFile(npz_filename) as npz_file, open(npz_filename, "rb") as raw_file:
+        for info in npz_file.infolist():
+            name = info.filename[:-len(".npy")]
+
+            # compressed members and text columns are read normally
+            if info.compress_type != zipfile.ZIP_STORED:
+                with npz_file.open(info) as member:
+                    arrays[name] = numpy.lib.format.read_array(member)
+                continue
+
+            # locate the .npy data behind the member's local file header
+            raw_file.seek(info.header_offset)
+            local_header = raw_file.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            raw_file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = numpy.lib.format.read_magic(raw_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(raw_file)
+            else:
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(raw_file)
+
+            if shape and dtype.kind in "biuf":
+                arrays[name] = numpy.memmap(
+                    npz_filename,
+                    dtype = dtype,
+                    mode = "r",
+                    shape = shape,
+                    order = "F" if fortran_order else "C",
+                    offset = raw_file.tell()
+                )
+            else:
+                with npz_file.open(info) as member:
+                    arrays[name] = numpy.lib.format.read_array(member)
+
+    return arrays
+
+# --------------------------------------------------------------------------
+# Combine Stats
+# --------------------------------------------------------------------------
+def CombineStats(data, groups, maximum = ()):
+    """Returns, for every name of groups, the per-dump sum of the arrays of
+    data at its stat keys, or their largest value for the names in maximum,
+    over the dumps every one of the arrays holds.
+    """
+
+    combined = {}
+    for name, stat_keys in groups.items():
+        intervals = min(len(data[stat_key]) for stat_key in stat_keys)
+        combine = max if name in maximum else sum
+        combined[name] = array("d", (
+            combine(data[stat_key][i] for stat_key in stat_keys) for i in range(intervals)
+        ))
+
+    return combined
+
+# --------------------------------------------------------------------------
+# Mean
+# --------------------------------------------------------------------------
+def Mean(values):
+    """Returns the mean of values, or 0 if there are none.
+    """
+
+    return sum(values) / len(values) if len(values) else 0.0
+
+# --------------------------------------------------------------------------
+# SimPoint Extraction Class
+# --------------------------------------------------------------------------
+class SimPointExtraction:
+    """This class combines the detailed runs of a workload's simulation
+    points into weighted whole-program estimates. Every simpoint is described
+    by the manifest its --restore_simpoint run writes, which holds its weight
+    along with the location of its stats file.
+    """
+
+    def __init__(self, simpoints):
+
+        self.simpoints = sorted(simpoints, key = lambda simpoint: simpoint["simpoint"])
+
+    # ----------------------------------------------------------------------
+    # Weighted Totals
+    # ----------------------------------------------------------------------
+    def WeightedTotals(self):
+        """Returns the weighted mean (dynamic, static) power of every
+        component and the weighted whole-program IPC. IPC is combined through
+        the weighted CPI since each simpoint covers the same number of
+        instructions.
+        """
+
+        power = {}
+        total_weight = 0.0
+        cpi = 0.0
+
+        for simpoint in self.simpoints:
+            statistics = DataExtraction(simpoint["exiting_tick"], simpoint["stats_period"], simpoint["stats_filename"])
+            statistics.AddPerformance(simpoint.get("num_cores", 1), simpoint.get("mem_channels", 1))
+
+            weight = simpoint["weight"]
+            total_weight += weight
+
+            for component in simpoint["components"]:
+                data = statistics.GetComponentData(component)
+                component_power = power.setdefault(component, [0.0, 0.0])
+                component_power[0] += weight * Mean(data["dynamicPower"])
+                component_power[1] += weight * Mean(data["staticPower"])
+
+            ipc = Mean(statistics.GetComponentData("performance")["ipc"])
+            cpi += weight / ipc if ipc else 0.0
+
+        # the simpoints that were simulated may not cover every cluster
+        for component_power in power.values():
+            component_power[0] /= total_weight
+            component_power[1] /= total_weight
+
+        return power, total_weight / cpi if cpi else 0.0
+
+    # ----------------------------------------------------------------------
+    # Create CSV File
+    # ----------------------------------------------------------------------
+    def CreateCsv(self, csv_filename):
+        """This creates a .csv file with the weighted power of every component
+        and the weighted IPC, followed by the simpoints and their weights.
+        """
+
+        power, ipc = self.WeightedTotals()
+
+        csv_file = open(csv_filename, "w")
+
+        WriteCsvParameters(csv_file, self.simpoints[0]["parameters"])
+
+        # writing weighted totals
+        csv_file.write("Component, Dynamic Power (Watts), Static Power (Watts)\n")
+        for component in sorted(power):
+            csv_file.write("{}, {}, {}\n".format(component, power[component][0], power[component][1]))
+        csv_file.write("\n")
+        csv_file.write("IPC\n")
+        csv_file.write("{}\n".format(ipc))
+
+        # writing simpoints
+        csv_file.write("\n")
+        csv_file.write("SimPoint, Weight, Interval (instructions)\n")
+        for simpoint in self.simpoints:
+            csv_file.write("{}, {}, {}\n".format(simpoint["simpoint"], simpoint["weight"], simpoint["interval"]))
+
+        csv_file.close()
+
+# --------------------------------------------------------------------------
+# Power CSV Sink Class
+# --------------------------------------------------------------------------
+class PowerCsvSink:
+    """Writes a component's power data to a .csv file one dump at a time.
+    The file has the same layout as the one written by CreateCsv and is
+    flushed after every row so partial results can be read while the
+    simulation is still running.
+    """
+
+    def __init__(self, parameters, csv_filename, stats_period):
+
+        self.stats_period = stats_period
+        self.csv_file = open(csv_filename, "w")
+
+        WriteCsvParameters(self.csv_file, parameters)
+        self.csv_file.write(POWER_CSV_HEADER)
+        self.csv_file.flush()
+
+    # writes the power data of one dump
+    def Write(self, values):
+
+        self.csv_file.write("{}, {}\n".format(values["dynamicPower"], values["staticPower"]))
+        self.csv_file.flush()
+
+    # writes the exiting tick and stats dump period then closes the file
+    def Close(self, exiting_tick):
+
+        WriteCsvFooter(self.csv_file, exiting_tick, self.stats_period)
+        self.csv_file.close()
+
+# --------------------------------------------------------------------------
+# Incremental Data Extraction Class
+# --------------------------------------------------------------------------
+class IncrementalDataExtraction(DataExtraction):
+    """This class extracts data from the gem5 output text file while gem5 is
+    still appending to it. It keeps the offset of the last complete line it
+    has read and only parses what was written since, handing every finished
+    dump block to the sinks registered for each component.
+    """
+
+    # ----------------------------------------------------------------------
+    # Constructor
+    # ----------------------------------------------------------------------
+    def __init__(self, stats_period, stats_filename = "m5out/stats.txt"):
+        """Constructor function. The exiting tick is only known once the
+        simulation has finished and is passed to Finish.
+        """
+
+        super(IncrementalDataExtraction, self).__init__(None, stats_period, stats_filename)
+
+        # offset of the first byte of the stats file that is not parsed yet
+        self.offset = 0
+
+        # sinks that receive each complete dump, keyed by component
+        self.sinks = {}
+
+        self.lock = threading.Lock()
+        self.watcher = None
+        self.watcher_stop = threading.Event()
+
+    # ----------------------------------------------------------------------
+    # Add Sink
+    # ----------------------------------------------------------------------
+    def AddSink(self, component, sink):
+        """Registers a sink that receives the values of component after every
+        complete dump. A sink provides Write(values) and Close(exiting_tick).
+        """
+
+        self.sinks.setdefault(component, []).append(sink)
+
+    # ----------------------------------------------------------------------
+    # Poll
+    # ----------------------------------------------------------------------
+    def Poll(self):
+        """Parses the lines appended to the stats file since the last poll.
+        A partially written line is left for the next poll.
+        """
+
+        with self.lock:
+            try:
+                stats_file = open(self.stats_filename, "rb")
+            except FileNotFoundError:
+                # gem5 has not created the stats file yet
+                return
+
+            with stats_file:
+                stats_file.seek(self.offset)
+                self.ParseLines(self.ReadCompleteLines(stats_file))
+
+    # parsing the stats file of a running simulation only reads what is new
+    def ParseStats(self):
+
+        self.Poll()
+
+    # reads lines until the end of the file or a partially written line
+    def ReadCompleteLines(self, stats_file):
+
+        for line in stats_file:
+            if not line.endswith(b"\n"):
+                break
+            self.offset += len(line)
+            yield line.decode()
+
+    # ----------------------------------------------------------------------
+    # Commit Block
+    # ----------------------------------------------------------------------
+    def CommitBlock(self, block):
+        """Appends the values of one complete dump block to the component
+        arrays and hands them to the registered sinks. Blocks outside the
+        region of interest are dropped.
+        """
+
+        if not super(IncrementalDataExtraction, self).CommitBlock(block):
+            return False
+
+        committed = set(id(values) for values, value in block)
+        for component, sinks in self.sinks.items():
+            values = {}
+            for stat_name, stat_values in self.component_data[component].items():
+                if id(stat_values) in committed:
+                    values[stat_name] = stat_values[-1]
+            if values:
+                for sink in sinks:
+                    sink.Write(values)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    # Watcher Thread
+    # ----------------------------------------------------------------------
+    def StartWatcher(self, poll_interval = 1.0):
+        """Polls the stats file every poll_interval seconds of host time from
+        a background thread.
+        """
+
+        def Watch():
+            while not self.watcher_stop.wait(poll_interval):
+                self.Poll()
+
+        self.watcher_stop.clear()
+        self.watcher = threading.Thread(target = Watch, daemon = True)
+        self.watcher.start()
+
+    def StopWatcher(self):
+        """Stops the background polling thread if it is running.
+        """
+
+        if self.watcher:
+            self.watcher_stop.set()
+            self.watcher.join()
+            self.watcher = None
+
+    # ----------------------------------------------------------------------
+    # Finish
+    # ----------------------------------------------------------------------
+    def Finish(self, exiting_tick):
+        """Parses whatever is left in the stats file and closes the sinks.
+        """
+
+        self.StopWatcher()
+        self.Poll()
+
+        self.exiting_tick = exiting_tick
+        self.parsed = True
+
+        for sinks in self.sinks.values():
+            for sink in sinks:
+                sink.Close(exiting_tick)
+
+# --------------------------------------------------------------------------
+# Steady State Detector Class
+# --------------------------------------------------------------------------
+class SteadyStateDetector:
+    """Decides when a running simulation has settled, from the dumps parsed
+    by an IncrementalDataExtraction. The run is steady once the total power
+    of components and the IPC of every one of the last window dumps lie
+    within tolerance, relative to their mean over the window. The energy of
+    the rest of the run is then extrapolated from the energy per instruction
+    of the window.
+    """
+
+    # two-sided 95% normal quantile of the error estimates
+    CONFIDENCE_Z = 1.96
+
+    def __init__(self, statistics, components, window, tolerance):
+
+        self.statistics = statistics
+        self.components = list(components)
+        self.window = window
+        self.tolerance = tolerance
+
+    # returns the per-dump total power, IPC and committed instructions of
+    # the last count dumps, or of every dump if count is None. IPC and
+    # instructions are None when the stats file does not hold them. The
+    # dumps are read under the lock of the watcher thread, which appends
+    # to the same arrays.
+    def RecentSeries(self, count = None):
+
+        with self.statistics.lock:
+            power = [self.statistics.component_data[component] for component in self.components]
+            intervals = min(len(data["dynamicPower"]) for data in power)
+            start = 0 if count is None else max(0, intervals - count)
+
+            total_power = [
+                sum(data["dynamicPower"][i] + data["staticPower"][i] for data in power)
+                for i in range(start, intervals)
+            ]
+            performance = self.statistics.GetPerformanceData(("ipc", "committed_insts"))
+
+        ipc = None
+        insts = None
+        if len(performance["ipc"]) >= intervals:
+            ipc = list(performance["ipc"][start:intervals])
+        if len(performance["committed_insts"]) >= intervals:
+            insts = list(performance["committed_insts"][start:intervals])
+
+        return total_power, ipc, insts
+
+    # ----------------------------------------------------------------------
+    # Converged
+    # ----------------------------------------------------------------------
+    def Converged(self):
+        """Returns True once the last window dumps are steady.
+        """
+
+        total_power, ipc, insts = self.RecentSeries(self.window)
+        if len(total_power) < self.window:
+            return False
+
+        for series in (total_power, ipc):
+            if series is None:
+                continue
+            mean = Mean(series)
+            if any(abs(value - mean) > self.tolerance * abs(mean) for value in series):
+                return False
+
+        return True
+
+    # ----------------------------------------------------------------------
+    # Estimate
+    # ----------------------------------------------------------------------
+    def Estimate(self, total_insts = 0):
+        """Returns the measured energy and runtime along with the mean power
+        and energy per instruction of the window, each with the half-width
+        of its 95% confidence interval. Given the instruction count of the
+        whole run, the whole-run energy and runtime are extrapolated from the
+        window, with the error of the energy per instruction carried over to
+        the remaining instructions. Dumps are treated as independent samples.
+        """
+
+        stats_period = self.statistics.stats_period
+        all_power, all_ipc, all_insts = self.RecentSeries()
+        total_power, ipc, insts = self.RecentSeries(self.window)
+
+        estimate = {
+            "window": len(total_power),
+            "measured_runtime": len(all_power) * stats_period,
+            "measured_energy": sum(all_power) * stats_period,
+            "power": Mean(total_power),
+            "power_error": self.ConfidenceHalfWidth(total_power),
+        }
+
+        if insts is None or not all(insts):
+            return estimate
+
+        energy_per_inst = [power * stats_period / count for power, count in zip(total_power, insts)]
+        time_per_inst = [stats_period / count for count in insts]
+        measured_insts = sum(all_insts)
+
+        estimate.update({
+            "measured_insts": measured_insts,
+            "energy_per_inst": Mean(energy_per_inst),
+            "energy_per_inst_error": self.ConfidenceHalfWidth(energy_per_inst),
+        })
+
+        if total_insts:
+            remaining_insts = max(0, total_insts - measured_insts)
+            estimate.update({
+                "total_insts": total_insts,
+                "energy": estimate["measured_energy"] + remaining_insts * estimate["energy_per_inst"],
+                "energy_error": remaining_insts * estimate["energy_per_inst_error"],
+                "runtime": estimate["measured_runtime"] + remaining_insts * Mean(time_per_inst),
+                "runtime_error": remaining_insts * self.ConfidenceHalfWidth(time_per_inst),
+            })
+
+        return estimate
+
+    # half-width of the 95% confidence interval of the mean of values
+    def ConfidenceHalfWidth(self, values):
+
+        if len(values) < 2:
+            return 0.0
 
-        for line in self.stats_lines:
-            line_split = line.split()
-            if line_split:
-                if line_split[0] == "system.processor.l3cache.power_model.pm0.dynamicPower":
-                    dynamic_power.append(float(line_split[1]))
-                elif line_split[0] == "system.processor.l3cache.power_model.pm0.staticPower":
-                    static_power.append(float(line_split[1]))
-        
-        self.CreateCsv(parameters, csv_filename, static_power, dynamic_power)
+        mean = Mean(values)
+        variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+        return self.CONFIDENCE_Z * (variance / len(values)) ** 0.5
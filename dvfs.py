@@ -0,0 +1,160 @@
+# --------------------------------------------------------------------------
+# DVFS Governors
+# Replays a DVFS governor of the core clock domain on the intervals of a
+# finished run. gem5 only lets the guest change the operating point of a
+# clock domain, through the energy controller of a full system, so an SE
+# run is simulated at the fixed operating point of --cpu_opp. Every interval
+# is split into the time the core is busy, which scales with the core
+# frequency, and the time it waits on the last level cache misses, which
+# does not. The governor picks the operating point of every interval from
+# the core utilization of the interval before, and the runtime and energy of
+# each interval are rescaled to that operating point. The dynamic energy of
+# the core domain scales with the square of its voltage and the leakage of
+# the core domain with its voltage. Every component keeps leaking for the
+# whole rescaled interval.
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+from data_extraction import WriteCsvFooter
+from data_extraction import WriteCsvParameters
+
+# ticks per simulated second
+TICKS_PER_SECOND = 1.0E12
+
+# --------------------------------------------------------------------------
+# Utilization Governor Class
+# --------------------------------------------------------------------------
+class UtilizationGovernor:
+    """Scales the core frequency with its utilization, like the ondemand
+    governor of Linux. Above threshold the fastest operating point is
+    chosen, otherwise the slowest one that would keep the utilization of
+    the last interval below threshold.
+    """
+
+    def __init__(self, operating_points, threshold):
+
+        self.operating_points = operating_points
+        self.threshold = threshold
+
+    def NextLevel(self, level, utilization):
+        """Returns the operating point of the next interval, given the
+        operating point and the core utilization of the last one.
+        """
+
+        if utilization >= self.threshold:
+            return 0
+
+        frequency = self.operating_points[level][0] * utilization / self.threshold
+        for candidate in reversed(range(len(self.operating_points))):
+            if self.operating_points[candidate][0] >= frequency:
+                return candidate
+
+        return 0
+
+# governors selected by --dvfs_governor
+DVFS_GOVERNOR_CLASSES = {
+    'utilization': UtilizationGovernor,
+}
+
+# --------------------------------------------------------------------------
+# Core Bound Fractions
+# --------------------------------------------------------------------------
+def CoreBoundFractions(columns, stats_period, cores = 1):
+    """Returns the fraction of every interval the cores are busy rather than
+    waiting on the misses of the last level cache, from the performance
+    columns of a run of cores cores. The miss latency is summed over the
+    cores, so it is spread over them. A run without miss latencies is taken
+    as core bound.
+    """
+
+    intervals = len(columns["energy"])
+    for level in ("l3", "l2"):
+        if level + "_miss_latency" in columns:
+            interval_ticks = stats_period * TICKS_PER_SECOND * cores
+            return [
+                min(max(1.0 - latency / interval_ticks, 0.0), 1.0)
+                for latency in columns[level + "_miss_latency"][:intervals]
+            ]
+
+    return [1.0] * intervals
+
+# --------------------------------------------------------------------------
+# DVFS Replay
+# --------------------------------------------------------------------------
+def DvfsReplay(statistics, components, core_components, operating_points, level, governor):
+    """Replays governor over the intervals of the components of a run
+    simulated at the operating point level. Components in core_components
+    belong to the core clock domain. Returns the per-interval rows of
+    (interval, operating point, frequency, voltage, utilization, runtime,
+    energy) and the whole-run totals against the fixed operating point.
+    """
+
+    stats_period = statistics.stats_period
+    columns = dict(statistics.GetPerformanceSeries(components))
+    power = [(component, statistics.GetComponentData(component)) for component in components]
+    core_bound = CoreBoundFractions(columns, stats_period, len(core_components))
+
+    simulated_frequency, simulated_voltage = operating_points[level]
+
+    rows = []
+    for interval, core in enumerate(core_bound):
+        frequency, voltage = operating_points[level]
+        busy = core * simulated_frequency / frequency
+        runtime = stats_period * (busy + 1.0 - core)
+        utilization = busy / (busy + 1.0 - core) if busy else 0.0
+
+        energy = 0.0
+        for component, data in power:
+            dynamic_energy = data["dynamicPower"][interval] * stats_period
+            static_power = data["staticPower"][interval]
+            if component in core_components:
+                dynamic_energy *= (voltage / simulated_voltage) ** 2
+                static_power *= voltage / simulated_voltage
+            energy += dynamic_energy + static_power * runtime
+
+        rows.append((interval, level, frequency, voltage, utilization, runtime, energy))
+        level = governor.NextLevel(level, utilization)
+
+    fixed_runtime = len(rows) * stats_period
+    fixed_energy = sum(columns["energy"])
+    runtime = sum(row[5] for row in rows)
+    energy = sum(row[6] for row in rows)
+
+    totals = [
+        ("runtime", runtime),
+        ("energy", energy),
+        ("fixed_runtime", fixed_runtime),
+        ("fixed_energy", fixed_energy),
+        ("slowdown", runtime / fixed_runtime if fixed_runtime else 0.0),
+        ("energy_savings", 1.0 - energy / fixed_energy if fixed_energy else 0.0),
+    ]
+
+    return rows, totals
+
+# --------------------------------------------------------------------------
+# Create DVFS CSV File
+# --------------------------------------------------------------------------
+def CreateDvfsCsv(parameters, csv_filename, rows, totals, exiting_tick, stats_period):
+    """Writes the intervals and the totals of a DVFS replay to a .csv file
+    below the simulation parameters.
+    """
+
+    csv_file = open(csv_filename, "w")
+
+    WriteCsvParameters(csv_file, parameters)
+
+    # writing the per-interval operating points
+    csv_file.write("interval, operating_point, frequency, voltage, utilization, runtime, energy\n")
+    for row in rows:
+        csv_file.write(", ".join(str(value) for value in row) + "\n")
+
+    # writing the whole-run totals
+    csv_file.write("\n")
+    csv_file.write(", ".join(name for name, value in totals) + "\n")
+    csv_file.write(", ".join(str(value) for name, value in totals) + "\n")
+
+    WriteCsvFooter(csv_file, exiting_tick, stats_period)
+
+    csv_file.close()
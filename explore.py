@@ -0,0 +1,338 @@
+# --------------------------------------------------------------------------
+# Design-Space Exploration
+# Maps the power/performance Pareto front of the system.py parameter space
+# with successive halving instead of a full grid. A random sample of
+# configurations is simulated for a short instruction budget, the best
+# fraction by Pareto rank moves on to a budget eta times larger, and so on
+# until the last rung. Every rung runs as a parallel sweep, sharing the
+# sweep's job status, worker pool and result cache.
+#
+# usage: python3 explore.py --configs 81 --eta 3 --min_insts 1000000
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import json
+import math
+import os
+import random
+import sys
+
+from data_extraction import DataExtraction
+from data_extraction import POWER_STATS
+from result_cache import ResultCache
+from sweep import RunSweep
+from sweep import SweepJob
+from sweep import SweepStatus
+from sweep import WorkerCount
+
+# --------------------------------------------------------------------------
+# Parameter Space
+# system.py options explored and the values each can take
+# --------------------------------------------------------------------------
+SPACE = [
+    ("l1i_size",         ["4kB", "8kB", "16kB", "32kB", "64kB"]),
+    ("l1d_size",         ["16kB", "32kB", "64kB", "128kB"]),
+    ("l2_size",          ["64kB", "128kB", "256kB", "512kB", "1MB"]),
+    ("l1i_assoc",        ["1", "2", "4", "8"]),
+    ("l1d_assoc",        ["2", "4", "8", "16"]),
+    ("l2_assoc",         ["4", "8", "16", "32"]),
+    ("l1i_data_latency", ["1", "2", "3", "4"]),
+    ("cpu_type",         ["MinorCPU", "O3CPU"]),
+    ("include_l3_cache", ["True", "False"]),
+]
+
+# ticks per simulated second
+TICKS_PER_SECOND = 1.0E12
+
+# --------------------------------------------------------------------------
+# Sample Configurations
+# --------------------------------------------------------------------------
+def SampleConfigs(count, seed):
+    """Draws count distinct configurations uniformly from SPACE, or every
+    configuration if the space is smaller than that.
+    """
+
+    random_state = random.Random(seed)
+    space_size = 1
+    for option, values in SPACE:
+        space_size *= len(values)
+
+    configs = []
+    seen = set()
+    while len(configs) < min(count, space_size):
+        config = tuple(random_state.choice(values) for option, values in SPACE)
+        if config not in seen:
+            seen.add(config)
+            configs.append(dict(zip((option for option, values in SPACE), config)))
+
+    return configs
+
+# --------------------------------------------------------------------------
+# Run Objectives
+# --------------------------------------------------------------------------
+def RunObjectives(outdir):
+    """Returns the runtime in seconds and the estimated energy in Joules of
+    a finished run, read from its gem5 output directory. Energy is the mean
+    power of the dumped intervals over the whole runtime, so the partial
+    interval at the end of a shortened run is accounted for. The DRAM
+    counts towards the energy of runs that record it.
+    """
+
+    with open(os.path.join(outdir, "run.json"), "r") as run_file:
+        run = json.load(run_file)
+
+    statistics = DataExtraction(run["exiting_tick"], run["stats_period"], os.path.join(outdir, "stats.txt"))
+    if run.get("roi"):
+        statistics.SetRoi(*run["roi"])
+    statistics.AddPerformance(run["options"]["num_cores"], run["options"].get("mem_channels", 1))
+    for component, component_info in run["components"].items():
+        statistics.AddComponent(component, component_info["path"] + ".power_model.pm0", POWER_STATS)
+    for component, component_info in run.get("dram", {}).items():
+        statistics.AddDram(component, component_info["paths"], component_info["ranks"])
+
+    totals = dict(statistics.GetPerformanceTotals(list(run["components"]) + list(run.get("dram", {}))))
+    if not totals["runtime"]:
+        raise ValueError("{} holds no stats dumps, raise --min_insts".format(outdir))
+
+    # a run limited to its region of interest starts measuring at its begin
+    begin_tick = run["roi"][0] if run.get("roi") else 0
+    runtime = (run["exiting_tick"] - begin_tick) / TICKS_PER_SECOND
+    return runtime, totals["power"] * runtime
+
+# --------------------------------------------------------------------------
+# Pareto Ranks
+# --------------------------------------------------------------------------
+def Dominates(a, b):
+
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+def ParetoRanks(points):
+    """Returns the non-dominated sorting rank of every point, all objectives
+    minimized. Rank 0 is the Pareto front.
+    """
+
+    ranks = [None] * len(points)
+    remaining = set(range(len(points)))
+    rank = 0
+    while remaining:
+        front = [
+            i for i in remaining
+            if not any(Dominates(points[j], points[i]) for j in remaining if j != i)
+        ]
+        for i in front:
+            ranks[i] = rank
+        remaining -= set(front)
+        rank += 1
+
+    return ranks
+
+# --------------------------------------------------------------------------
+# Explore
+# --------------------------------------------------------------------------
+def RunRung(rung, configs, budget, args, project_dir, status, cache, workers):
+    """Simulates every configuration for budget instructions and returns
+    (config, runtime, energy) for those that completed.
+    """
+
+    jobs = []
+    for index, config in configs:
+        options = dict(config, max_insts = budget, workload = args.workload, binary_args = args.binary_args)
+        jobs.append(SweepJob(
+            "explore", "r{}_c{:03d}".format(rung, index), args.isa, options, project_dir, args.gem5_dir
+        ))
+
+    print("Rung {}: {} configurations for {} instructions".format(rung, len(jobs), budget or "all"))
+    failed = set(job.name for job in RunSweep(jobs, status, workers, args.retries, cache))
+
+    results = []
+    for (index, config), job in zip(configs, jobs):
+        if job.name in failed:
+            continue
+        try:
+            runtime, energy = RunObjectives(job.outdir)
+        except (OSError, KeyError, ValueError) as error:
+            print("{} left out: {}".format(job.name, error))
+            continue
+        results.append(((index, config), runtime, energy))
+
+    return results
+
+def Explore(args, project_dir, status, cache, workers):
+    """Runs successive halving and returns the results of the last rung.
+    """
+
+    configs = list(enumerate(SampleConfigs(args.configs, args.seed)))
+
+    # halve until about eta configurations are left
+    rungs = 1
+    while len(configs) >= args.eta ** (rungs + 1):
+        rungs += 1
+
+    results = []
+    for rung in range(rungs):
+        budget = args.min_insts * args.eta ** rung
+        if rung == rungs - 1 and args.full_last_rung:
+            budget = 0
+        results = RunRung(rung, configs, budget, args, project_dir, status, cache, workers)
+
+        if rung == rungs - 1:
+            break
+
+        # keep the best fraction by Pareto rank, then by energy-delay product.
+        # The whole current front is always kept.
+        ranks = ParetoRanks([(runtime, energy) for config, runtime, energy in results])
+        order = sorted(range(len(results)), key = lambda i: (ranks[i], results[i][1] * results[i][2]))
+        keep = max(int(math.ceil(len(results) / float(args.eta))), ranks.count(0))
+        configs = [results[i][0] for i in order[:keep]]
+
+    return results
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(
+        description = 'Maps the power/performance Pareto front of the system.py options with successive halving.'
+    )
+    parser.add_argument(
+        '--configs',
+        default = 81,
+        type = int,
+        help = 'Number of configurations sampled for the first rung. Default: 81.'
+    )
+    parser.add_argument(
+        '--eta',
+        default = 3,
+        type = int,
+        help = 'Each rung keeps 1/eta of the configurations and multiplies the instruction budget by eta. Default: 3.'
+    )
+    parser.add_argument(
+        '--min_insts',
+        default = 1000000,
+        type = int,
+        help = 'Instruction budget of the first rung. Default: 1000000.'
+    )
+    parser.add_argument(
+        '--full_last_rung',
+        action = 'store_true',
+        help = 'Run the configurations of the last rung to completion instead of for their budget.'
+    )
+    parser.add_argument(
+        '--seed',
+        default = 0,
+        type = int,
+        help = 'Seed of the configuration sample. Default: 0.'
+    )
+    parser.add_argument(
+        '--isa',
+        default = 'ARM',
+        help = 'ISA of the gem5 build and of the workload binary. Default: ARM.'
+    )
+    parser.add_argument(
+        '--workload',
+        default = 'stress_test',
+        help = 'Workload binary built by run.sh, for example pointer_chase. Default: stress_test.'
+    )
+    parser.add_argument(
+        '--binary_args',
+        default = '',
+        help = 'Arguments passed to the workload binary, such as its working set size.'
+    )
+    parser.add_argument(
+        '--gem5_dir',
+        default = os.path.normpath(os.path.join(project_dir, '..', '..')),
+        help = 'Location of the gem5 directory. Default: two levels above this script.'
+    )
+    parser.add_argument(
+        '--jobs',
+        default = 0,
+        type = int,
+        help = 'Number of simulations to run at once. Default: sized to the available cores and memory.'
+    )
+    parser.add_argument(
+        '--job_memory',
+        default = 2.0,
+        type = float,
+        help = 'Host memory reserved for each simulation in GB. Default: 2.'
+    )
+    parser.add_argument(
+        '--retries',
+        default = 0,
+        type = int,
+        help = 'Number of times a failed job is retried. Default: 0.'
+    )
+    parser.add_argument(
+        '--status_file',
+        default = os.path.join(project_dir, 'explore_status.json'),
+        help = 'JSON file recording the state of every job. Default: explore_status.json in the project directory.'
+    )
+    parser.add_argument(
+        '--cache_dir',
+        default = os.path.join(project_dir, 'result_cache'),
+        help = 'Directory of the result cache. Default: result_cache in the project directory.'
+    )
+    parser.add_argument(
+        '--cache_size',
+        default = 20.0,
+        type = float,
+        help = 'Size of the result cache in GB before old entries are evicted. Default: 20.'
+    )
+    parser.add_argument(
+        '--no_cache',
+        action = 'store_true',
+        help = 'Always run gem5, neither using nor filling the result cache.'
+    )
+    parser.add_argument(
+        '--front_file',
+        default = os.path.join(project_dir, 'explore', 'pareto_front.csv'),
+        help = '.csv file the Pareto front of the last rung is written to. Default: explore/pareto_front.csv.'
+    )
+    args = parser.parse_args()
+
+    if args.eta < 2:
+        parser.error('--eta must be at least 2')
+
+    workers = args.jobs or WorkerCount(int(args.job_memory * 1024**3))
+    status = SweepStatus(args.status_file)
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir, int(args.cache_size * 1024**3))
+
+    results = Explore(args, project_dir, status, cache, workers)
+    if not results:
+        print("No configuration completed")
+        return 1
+
+    ranks = ParetoRanks([(runtime, energy) for config, runtime, energy in results])
+    front = sorted(
+        (result for result, rank in zip(results, ranks) if rank == 0),
+        key = lambda result: result[1]
+    )
+
+    options = [option for option, values in SPACE]
+    os.makedirs(os.path.dirname(os.path.abspath(args.front_file)), exist_ok = True)
+    with open(args.front_file, "w") as front_file:
+        front_file.write(", ".join(["Configuration"] + options + ["Runtime (s)", "Energy (J)"]) + "\n")
+        for (index, config), runtime, energy in front:
+            front_file.write(", ".join(
+                [str(index)] + [config[option] for option in options] + [str(runtime), str(energy)]
+            ) + "\n")
+
+    print("")
+    print("Pareto front of {} configurations, written to {}".format(len(results), args.front_file))
+    print("{:>6} {:>14} {:>14}  {}".format("Config", "Runtime (s)", "Energy (J)", "Options"))
+    for (index, config), runtime, energy in front:
+        print("{:>6} {:>14.6g} {:>14.6g}  {}".format(
+            index, runtime, energy, " ".join("{}={}".format(option, config[option]) for option in options)
+        ))
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
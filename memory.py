@@ -0,0 +1,73 @@
+# --------------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------------
+import math
+
+from m5.objects import AddrRange
+from m5.objects import DDR3_1600_8x8
+from m5.objects import DDR3_2133_8x8
+from m5.objects import DDR4_2400_8x8
+from m5.objects import GDDR5_4000_2x32
+from m5.objects import HBM_1000_4H_1x64
+from m5.objects import HBM_2000_4H_1x64
+from m5.objects import LPDDR2_S4_1066_1x32
+from m5.objects import LPDDR3_1600_1x32
+from m5.objects import LPDDR5_5500_1x16_BG_BL32
+from m5.objects import LPDDR5_6400_1x16_BG_BL32
+from m5.objects import MemCtrl
+from m5.objects import WideIO_200_1x128
+
+# --------------------------------------------------------------------------------
+# Memory Types
+# gem5 DRAM interface selected by --mem_type
+# --------------------------------------------------------------------------------
+MEM_TYPE_CLASSES = {
+    'ddr3_1600': DDR3_1600_8x8,
+    'ddr3_2133': DDR3_2133_8x8,
+    'ddr4_2400': DDR4_2400_8x8,
+    'lpddr2_1066': LPDDR2_S4_1066_1x32,
+    'lpddr3_1600': LPDDR3_1600_1x32,
+    'lpddr5_5500': LPDDR5_5500_1x16_BG_BL32,
+    'lpddr5_6400': LPDDR5_6400_1x16_BG_BL32,
+    'hbm_1000': HBM_1000_4H_1x64,
+    'hbm_2000': HBM_2000_4H_1x64,
+    'gddr5_4000': GDDR5_4000_2x32,
+    'wideio_200': WideIO_200_1x128,
+}
+
+# --------------------------------------------------------------------------------
+# Memory Controllers
+# --------------------------------------------------------------------------------
+def CreateMemCtrls(options, mem_range, cache_line_size):
+    """Returns one memory controller per channel, each driving a DRAM of
+    the selected type. The channels interleave mem_range at cache line
+    granularity, as gem5's MemConfig does, so consecutive lines go to
+    consecutive channels. The number of channels must be a power of two.
+    """
+
+    mem_ctrls = [MemCtrl() for i in range(options.mem_channels)]
+
+    intlv_bits = int(math.log(options.mem_channels, 2))
+    intlv_low_bit = int(math.log(cache_line_size, 2))
+    for i, mem_ctrl in enumerate(mem_ctrls):
+        mem_ctrl.dram = MEM_TYPE_CLASSES[options.mem_type]()
+        if intlv_bits:
+            mem_ctrl.dram.range = AddrRange(
+                mem_range.start,
+                size = mem_range.size(),
+                intlvHighBit = intlv_low_bit + intlv_bits - 1,
+                xorHighBit = 0,
+                intlvBits = intlv_bits,
+                intlvMatch = i
+            )
+        else:
+            mem_ctrl.dram.range = mem_range
+
+    return mem_ctrls
+
+def DramRanks(mem_ctrl):
+    """Returns the number of ranks of the DRAM behind mem_ctrl, each of which
+    reports its own energy stats.
+    """
+
+    return int(mem_ctrl.dram.ranks_per_channel.value)
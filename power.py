@@ -6,6 +6,8 @@ import m5
 from m5.objects import MathExprPowerModel
 from m5.objects import PowerModel
 
+from power_equations import *
+
 # --------------------------------------------------------------------------
 # CPU Power On Class
 # --------------------------------------------------------------------------
@@ -16,33 +18,38 @@ class CpuPowerOn(MathExprPowerModel):
         super(CpuPowerOn, self).__init__(**kwargs)
 
         # select the equation to use to model the processor's power consumption
-        if options.cpu_pwr_eq == 0:
-            # 2A per IPC and 3pA per cache miss. Then convert to Watts.
-            # dynamic power
-            self.dyn = 'voltage*(2*{}.ipc + 3*0.000000001*{}.dcache.overallMisses/simSeconds)'.format(cpu_path, cpu_path)
-            # static power
-            self.st = '4*temp'
-        elif options.cpu_pwr_eq == 1:
-            # TODO: remove 'pass' and place a different power modeling 
-            # equation here. If needed, create other if cases with different 
-            # equations in them.
-            pass
+        self.dyn, self.st = PowerEquation(
+            CPU_EQUATIONS, cpu_path, options.cpu_pwr_eq,
+            PrefetcherPaths('cpu', cpu_path, vars(options)), PREFETCH_ENERGY['cpu']
+        )
 
 # --------------------------------------------------------------------------
 # CPU Clock Gated Class
 # --------------------------------------------------------------------------
 class CpuClkGated(MathExprPowerModel):
 
-    dyn = '0'
-    st ='0'
+    def __init__(self, cpu_path, options, **kwargs):
+
+        super(CpuClkGated, self).__init__(**kwargs)
+
+        # the clock is stopped, the core still leaks
+        self.dyn, self.st = IdleEquation(
+            CPU_EQUATIONS, cpu_path, options.cpu_pwr_eq, 'CLK_GATED', RETENTION_LEAKAGE['cpu']
+        )
 
 # --------------------------------------------------------------------------
 # CPU SRAM Retention Class
 # --------------------------------------------------------------------------
 class CpuSramRetention(MathExprPowerModel):
 
-    dyn = '0'
-    st ='0'
+    def __init__(self, cpu_path, options, **kwargs):
+
+        super(CpuSramRetention, self).__init__(**kwargs)
+
+        # only the SRAM arrays are powered, at their retention voltage
+        self.dyn, self.st = IdleEquation(
+            CPU_EQUATIONS, cpu_path, options.cpu_pwr_eq, 'SRAM_RETENTION', RETENTION_LEAKAGE['cpu']
+        )
 
 # --------------------------------------------------------------------------
 # CPU Power Off Class
@@ -62,11 +69,14 @@ class CpuPowerModel(PowerModel):
 
         super(CpuPowerModel, self).__init__(**kwargs)
 
+        # the temperature the power equations see without a thermal model
+        self.ambient_temp = '{}C'.format(AMBIENT_TEMPERATURE)
+
         self.pm = [
-            CpuPowerOn(cpu_path, options), # ON
-            CpuClkGated(),                 # CLK_GATED
-            CpuSramRetention(),            # SRAM_RETENTION
-            CpuPowerOff()                  # OFF
+            CpuPowerOn(cpu_path, options),       # ON
+            CpuClkGated(cpu_path, options),      # CLK_GATED
+            CpuSramRetention(cpu_path, options), # SRAM_RETENTION
+            CpuPowerOff()                        # OFF
         ]
 
 # --------------------------------------------------------------------------
@@ -79,32 +89,38 @@ class L2PowerOn(MathExprPowerModel):
         super(L2PowerOn, self).__init__(**kwargs)
 
         # select the equation to use to model the L2 cache's power consumption
-        if options.l2_pwr_eq == 0:
-            # Report L2 Cache overall accesses. The estimated power is converted
-            # to Watts and will vary based on the size of the cache.
-            self.dyn = '{}.overallAccesses*0.000018000'.format(l2_path)
-            self.st = '(voltage*3)/10'
-        elif options.l2_pwr_eq == 1:
-            # TODO: remove 'pass' and place a different power modeling 
-            # equation here. If needed, create other if cases with different 
-            # equations in them.
-            pass
+        self.dyn, self.st = PowerEquation(
+            L2_EQUATIONS, l2_path, options.l2_pwr_eq,
+            PrefetcherPaths('l2_cache', l2_path, vars(options)), PREFETCH_ENERGY['l2_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L2 Cache Clock Gated Class
 # --------------------------------------------------------------------------
 class L2ClockGated(MathExprPowerModel):
 
-    dyn = '0'
-    st = '0'
+    def __init__(self, l2_path, options, **kwargs):
+
+        super(L2ClockGated, self).__init__(**kwargs)
+
+        # the clock is stopped, the cache still leaks
+        self.dyn, self.st = IdleEquation(
+            L2_EQUATIONS, l2_path, options.l2_pwr_eq, 'CLK_GATED', RETENTION_LEAKAGE['l2_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L2 Cache SRAM Retention Class
 # --------------------------------------------------------------------------
 class L2SramRetention(MathExprPowerModel):
 
-    dyn = '0'
-    st = '0'
+    def __init__(self, l2_path, options, **kwargs):
+
+        super(L2SramRetention, self).__init__(**kwargs)
+
+        # only the SRAM arrays are powered, at their retention voltage
+        self.dyn, self.st = IdleEquation(
+            L2_EQUATIONS, l2_path, options.l2_pwr_eq, 'SRAM_RETENTION', RETENTION_LEAKAGE['l2_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L2 Cache SRAM Retention Class
@@ -124,12 +140,15 @@ class L2PowerModel(PowerModel):
 
         super(L2PowerModel, self).__init__(**kwargs)
 
+        # the temperature the power equations see without a thermal model
+        self.ambient_temp = '{}C'.format(AMBIENT_TEMPERATURE)
+
         # choose a power model for each power state
         self.pm = [
-            L2PowerOn(l2_path, options), # ON
-            L2ClockGated(),              # CLK_GATED
-            L2SramRetention(),           # SRAM_RETENTION
-            L2PowerOff()                 # OFF
+            L2PowerOn(l2_path, options),       # ON
+            L2ClockGated(l2_path, options),    # CLK_GATED
+            L2SramRetention(l2_path, options), # SRAM_RETENTION
+            L2PowerOff()                       # OFF
         ]
 
 # --------------------------------------------------------------------------
@@ -142,32 +161,38 @@ class L3PowerOn(MathExprPowerModel):
         super(L3PowerOn, self).__init__(**kwargs)
 
         # select the equation to use to model the L3 cache's power consumption
-        if options.l3_pwr_eq == 0:
-            # Report L3 Cache overall accesses. The estimated power is converted
-            # to Watts and will vary based on the size of the cache.
-            self.dyn = '{}.overallAccesses*0.000018000'.format(l3_path)
-            self.st = '(voltage*3)/10'
-        elif options.l3_pwr_eq == 1:
-            # TODO: remove 'pass' and place a different power modeling 
-            # equation here. If needed, create other if cases with different 
-            # equations in them.
-            pass
+        self.dyn, self.st = PowerEquation(
+            L3_EQUATIONS, l3_path, options.l3_pwr_eq,
+            PrefetcherPaths('l3_cache', l3_path, vars(options)), PREFETCH_ENERGY['l3_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L3 Cache Clock Gated Class
 # --------------------------------------------------------------------------
 class L3ClockGated(MathExprPowerModel):
 
-    dyn = '0'
-    st = '0'
+    def __init__(self, l3_path, options, **kwargs):
+
+        super(L3ClockGated, self).__init__(**kwargs)
+
+        # the clock is stopped, the cache still leaks
+        self.dyn, self.st = IdleEquation(
+            L3_EQUATIONS, l3_path, options.l3_pwr_eq, 'CLK_GATED', RETENTION_LEAKAGE['l3_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L3 Cache SRAM Retention Class
 # --------------------------------------------------------------------------
 class L3SramRetention(MathExprPowerModel):
 
-    dyn = '0'
-    st = '0'
+    def __init__(self, l3_path, options, **kwargs):
+
+        super(L3SramRetention, self).__init__(**kwargs)
+
+        # only the SRAM arrays are powered, at their retention voltage
+        self.dyn, self.st = IdleEquation(
+            L3_EQUATIONS, l3_path, options.l3_pwr_eq, 'SRAM_RETENTION', RETENTION_LEAKAGE['l3_cache']
+        )
 
 # --------------------------------------------------------------------------
 # L3 Cache SRAM Retention Class
@@ -187,10 +212,13 @@ class L3PowerModel(PowerModel):
 
         super(L3PowerModel, self).__init__(**kwargs)
 
+        # the temperature the power equations see without a thermal model
+        self.ambient_temp = '{}C'.format(AMBIENT_TEMPERATURE)
+
         # choose a power model for each power state
         self.pm = [
-            L3PowerOn(l3_path, options), # ON
-            L3ClockGated(),              # CLK_GATED
-            L3SramRetention(),           # SRAM_RETENTION
-            L3PowerOff()                 # OFF
+            L3PowerOn(l3_path, options),       # ON
+            L3ClockGated(l3_path, options),    # CLK_GATED
+            L3SramRetention(l3_path, options), # SRAM_RETENTION
+            L3PowerOff()                       # OFF
         ]
\ No newline at end of file
@@ -0,0 +1,179 @@
+# --------------------------------------------------------------------------
+# Power Modeling Equations
+# The expressions used by the power models in power.py. They are kept apart
+# from the power model classes so they can also be evaluated outside of gem5
+# on saved statistics. Each table maps the number selected with
+# --cpu_pwr_eq, --l2_pwr_eq or --l3_pwr_eq to a (dynamic, static) pair of
+# expressions where {path} is replaced by the component's path. Another
+# equation is added as the next numbered entry of its table.
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import re
+
+# --------------------------------------------------------------------------
+# CPU Equations
+# --------------------------------------------------------------------------
+CPU_EQUATIONS = {
+    # 2A per IPC and 3pA per cache miss. Then convert to Watts.
+    0: (
+        'voltage*(2*{path}.ipc + 3*0.000000001*{path}.dcache.overallMisses/simSeconds)',
+        '4*temp'
+    ),
+}
+
+# --------------------------------------------------------------------------
+# L2 Cache Equations
+# --------------------------------------------------------------------------
+L2_EQUATIONS = {
+    # Report L2 Cache overall accesses. The estimated power is converted
+    # to Watts and will vary based on the size of the cache.
+    0: (
+        '{path}.overallAccesses*0.000018000',
+        '(voltage*3)/10'
+    ),
+}
+
+# --------------------------------------------------------------------------
+# L3 Cache Equations
+# --------------------------------------------------------------------------
+L3_EQUATIONS = {
+    # Report L3 Cache overall accesses. The estimated power is converted
+    # to Watts and will vary based on the size of the cache.
+    0: (
+        '{path}.overallAccesses*0.000018000',
+        '(voltage*3)/10'
+    ),
+}
+
+# --------------------------------------------------------------------------
+# Prefetch Equations
+# Prefetch traffic is charged apart from the demand accesses counted by the
+# equations above. Every prefetch issued by a prefetcher whose cache belongs
+# to the component adds its energy in Joules to the component's dynamic
+# power. The CPU is charged for the prefetches of its L1 caches.
+# --------------------------------------------------------------------------
+PREFETCH_ENERGY = {
+    'cpu': 0.000000001,
+    'l2_cache': 0.0000000018,
+    'l3_cache': 0.0000000025,
+}
+
+PREFETCH_EQUATION = '{energy}*{prefetcher}.pfIssued/simSeconds'
+
+# caches whose prefetchers are charged to each kind of component, as the
+# option prefix of the cache level and the cache's path below the component
+PREFETCH_CACHES = {
+    'cpu': (('l1i', '.icache'), ('l1d', '.dcache')),
+    'l2_cache': (('l2', ''),),
+    'l3_cache': (('l3', ''),),
+}
+
+def PrefetcherPaths(kind, path, options):
+    """Returns the paths of the prefetchers charged to the component of the
+    given kind, such as cpu, at path. options maps each system.py option to
+    its value.
+    """
+
+    return [
+        '{}{}.prefetcher'.format(path, cache)
+        for level, cache in PREFETCH_CACHES[kind]
+        if options.get(level + '_prefetcher', 'none') not in (None, '', 'none')
+    ]
+
+# --------------------------------------------------------------------------
+# Idle State Equations
+# The power of a component in its idle power states follows from the static
+# expression of its ON state. A clock gated component stops switching but
+# leaks as much as when it is ON. In SRAM retention the logic is power gated
+# and only the SRAM arrays are held at their retention voltage, leaking the
+# fraction of the ON leakage given below. An OFF component draws nothing.
+# --------------------------------------------------------------------------
+RETENTION_LEAKAGE = {
+    # only the L1 arrays are retained, the core logic is off
+    'cpu': 0.1,
+    'l2_cache': 0.25,
+    'l3_cache': 0.25,
+}
+
+# --------------------------------------------------------------------------
+# Expression Variables
+# --------------------------------------------------------------------------
+# variables gem5 provides to every power model besides the statistics
+VOLTAGE = 'voltage'
+TEMPERATURE = 'temp'
+
+# ambient temperature in Celsius that gem5 uses for temp when no thermal
+# model is attached to a power model. It is gem5's default ambient_temp, and
+# power.py sets it on every power model so saved runs are recomputed at the
+# temperature gem5 used.
+AMBIENT_TEMPERATURE = 25.0
+
+# names of the variables in an expression. The look-behind keeps the exponent
+# of a number such as 1e-9 from being read as a variable.
+VARIABLE_PATTERN = re.compile(r'(?<![\w.])[A-Za-z_][\w.:]*')
+
+# --------------------------------------------------------------------------
+# Power Equation
+# --------------------------------------------------------------------------
+def PowerEquation(equations, path, equation, prefetchers = (), prefetch_energy = 0.0):
+    """Returns the (dynamic, static) expressions numbered equation in the
+    table equations for the component at path. The prefetches issued by
+    the prefetchers at the paths in prefetchers are charged prefetch_energy
+    each on top of the dynamic power.
+    """
+
+    equation = int(equation)
+    if equation not in equations:
+        raise ValueError('power modeling equation {} is not defined'.format(equation))
+
+    dynamic, static = equations[equation]
+    # gem5's expression parser does not read exponents, so the energy is
+    # written out in full
+    dynamic = dynamic.format(path = path)
+    for prefetcher in prefetchers:
+        dynamic = '{} + {}'.format(dynamic, PREFETCH_EQUATION.format(
+            energy = '{:.12f}'.format(prefetch_energy), prefetcher = prefetcher
+        ))
+
+    return dynamic, static.format(path = path)
+
+def IdleEquation(equations, path, equation, state, retention_leakage):
+    """Returns the (dynamic, static) expressions of the component at path in
+    the idle power state CLK_GATED, SRAM_RETENTION or OFF, for the ON state
+    equation numbered equation in the table equations. In SRAM retention the
+    component leaks retention_leakage times its ON leakage.
+    """
+
+    static = PowerEquation(equations, path, equation)[1]
+    if state == 'CLK_GATED':
+        return '0', static
+    if state == 'SRAM_RETENTION':
+        return '0', '{:.12f}*({})'.format(retention_leakage, static)
+    if state == 'OFF':
+        return '0', '0'
+
+    raise ValueError('{} is not an idle power state'.format(state))
+
+def EquationVariables(expression):
+    """Returns the names of the variables used by expression.
+    """
+
+    return VARIABLE_PATTERN.findall(expression)
+
+def StatVariables(equations, path, prefetchers = ()):
+    """Returns the statistics used by every equation in the table equations
+    for the component at path, along with the prefetch counts of
+    prefetchers, leaving out voltage and temp.
+    """
+
+    stats = []
+    for equation in sorted(equations):
+        for expression in PowerEquation(equations, path, equation, prefetchers):
+            for variable in EquationVariables(expression):
+                if variable not in (VOLTAGE, TEMPERATURE) and variable not in stats:
+                    stats.append(variable)
+
+    return stats
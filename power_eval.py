@@ -0,0 +1,340 @@
+# --------------------------------------------------------------------------
+# Offline Power Evaluation
+# Saves the raw per-interval statistics used by the power modeling equations
+# of a run in a compact NumPy store, and re-evaluates the equations from
+# power_equations.py on those stores without running gem5 again. Changing a
+# coefficient then only means recomputing the stored runs.
+#
+# usage: python3 power_eval.py test1 test3/raw_stats_L2_64kB.npz --l2_pwr_eq 1
+#        python3 power_eval.py test1 --check
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import glob
+import json
+import os
+
+import numpy
+
+from data_extraction import POWER_CSV_HEADER
+from data_extraction import WriteCsvFooter
+from data_extraction import WriteCsvParameters
+from power_equations import *
+
+# --------------------------------------------------------------------------
+# Raw Stats
+# --------------------------------------------------------------------------
+# DataExtraction component collecting the inputs of the power equations
+RAW_STATS = "raw_stats"
+
+# equation table of every component with a power model
+EQUATION_TABLES = {
+    "cpu": CPU_EQUATIONS,
+    "l2_cache": L2_EQUATIONS,
+    "l3_cache": L3_EQUATIONS,
+}
+
+# equation table of a component. The components of every core share the
+# table of their kind, for example cpu1 uses the table of cpu.
+def EquationTable(component):
+
+    return EQUATION_TABLES[component.rstrip("0123456789")]
+
+# --------------------------------------------------------------------------
+# Add Power Inputs
+# --------------------------------------------------------------------------
+def AddPowerInputs(statistics, components):
+    """Registers with a DataExtraction object every statistic used by any
+    equation of the given components, so all of them can be re-evaluated
+    later. components maps a component name to a dict holding the
+    component's stat path and the stat holding its voltage.
+    """
+
+    for component, component_info in components.items():
+        prefetchers = component_info.get("prefetchers", [])
+        for stat in StatVariables(EquationTable(component), component_info["path"], prefetchers):
+            # vector stats such as overallMisses are printed with a ::total
+            # suffix but used without it in the equations
+            statistics.AddStat(RAW_STATS, stat, [stat, stat + "::total"])
+
+        voltage = component_info["voltage"]
+        statistics.AddStat(RAW_STATS, voltage, [voltage])
+
+# --------------------------------------------------------------------------
+# Save Raw Stats
+# --------------------------------------------------------------------------
+def SaveRawStats(statistics, filename, components, metadata):
+    """Saves the statistics registered by AddPowerInputs as a float64 matrix
+    with one row per statistic and one column per dump. Statistics that are
+    not present in every dump are left out.
+    """
+
+    data = statistics.GetComponentData(RAW_STATS)
+    intervals = max(len(values) for values in data.values())
+    stat_names = sorted(name for name, values in data.items() if len(values) == intervals)
+
+    metadata = dict(metadata)
+    metadata["components"] = components
+    metadata["ambient_temperature"] = AMBIENT_TEMPERATURE
+
+    numpy.savez(
+        filename,
+        stat_names = numpy.array(stat_names),
+        values = numpy.array([numpy.frombuffer(data[name]) for name in stat_names]).reshape(len(stat_names), intervals),
+        metadata = numpy.array(json.dumps(metadata, default = str))
+    )
+
+# --------------------------------------------------------------------------
+# Load Raw Stats
+# --------------------------------------------------------------------------
+def LoadRawStats(filename):
+    """Returns the per-interval columns of a raw stats store, keyed by stat
+    name, along with its metadata.
+    """
+
+    with numpy.load(filename) as raw_stats:
+        columns = dict(zip(raw_stats["stat_names"].tolist(), raw_stats["values"]))
+        metadata = json.loads(str(raw_stats["metadata"]))
+
+    return columns, metadata
+
+# --------------------------------------------------------------------------
+# Evaluate Expression
+# --------------------------------------------------------------------------
+def EvaluateExpression(expression, columns, intervals):
+    """Evaluates a power model expression on every interval at once. columns
+    maps each variable of the expression to an array or a constant.
+    """
+
+    variables = []
+
+    def Replace(match):
+        name = match.group(0)
+        if name not in columns:
+            raise KeyError("'{}' is not in the raw stats".format(name))
+        variables.append(columns[name])
+        return "_v[{}]".format(len(variables) - 1)
+
+    # gem5 uses ^ for powers
+    code = VARIABLE_PATTERN.sub(Replace, expression).replace("^", "**")
+
+    with numpy.errstate(divide = "ignore", invalid = "ignore"):
+        result = eval(code, {"__builtins__": {}}, {"_v": variables})
+
+    return numpy.broadcast_to(numpy.asarray(result, dtype = numpy.float64), (intervals,))
+
+# --------------------------------------------------------------------------
+# Recompute Power
+# --------------------------------------------------------------------------
+def RecomputePower(columns, metadata, equations):
+    """Recomputes the dynamic and static power of every interval of a run.
+    equations maps a kind of component, such as cpu, to the equation
+    number to use for every component of that kind. Returns a dict mapping
+    each component to its (dynamic, static) power arrays.
+    """
+
+    intervals = len(next(iter(columns.values()))) if columns else 0
+
+    power = {}
+    for component, component_info in metadata["components"].items():
+        equation = equations.get(component.rstrip("0123456789"))
+        if equation is None:
+            continue
+
+        # voltage and temp are provided by gem5 to every power model
+        component_columns = dict(columns)
+        component_columns[VOLTAGE] = columns[component_info["voltage"]]
+        component_columns[TEMPERATURE] = metadata["ambient_temperature"]
+
+        dynamic, static = PowerEquation(
+            EquationTable(component), component_info["path"], equation,
+            component_info.get("prefetchers", []), PREFETCH_ENERGY[component.rstrip("0123456789")]
+        )
+        power[component] = (
+            EvaluateExpression(dynamic, component_columns, intervals),
+            EvaluateExpression(static, component_columns, intervals)
+        )
+
+    return power
+
+# --------------------------------------------------------------------------
+# Write Power CSV
+# --------------------------------------------------------------------------
+def WritePowerCsv(csv_filename, metadata, dynamic_power, static_power):
+    """Writes recomputed power in the layout of DataExtraction.CreateCsv.
+    """
+
+    with open(csv_filename, "w") as csv_file:
+        WriteCsvParameters(csv_file, metadata["parameters"])
+        csv_file.write(POWER_CSV_HEADER)
+        for dynamic, static in zip(dynamic_power.tolist(), static_power.tolist()):
+            csv_file.write("{}, {}\n".format(dynamic, static))
+        WriteCsvFooter(csv_file, metadata["exiting_tick"], metadata["stats_period"])
+
+# --------------------------------------------------------------------------
+# Load Power CSV
+# --------------------------------------------------------------------------
+def LoadPowerCsv(csv_filename):
+    """Reads a power .csv file written by DataExtraction and returns its
+    dynamic and static power as arrays along with its stats dump period.
+    """
+
+    with open(csv_filename, "r") as csv_file:
+        lines = csv_file.read().splitlines()
+
+    start = lines.index(POWER_CSV_HEADER.strip()) + 1
+    end = lines.index("", start) if "" in lines[start:] else len(lines)
+
+    power = numpy.array([[float(value) for value in line.split(",")] for line in lines[start:end]]).reshape(-1, 2)
+
+    # the footer holds the exiting tick and the stats dump period
+    stats_period = float(lines[-1].split(",")[1])
+
+    return power[:, 0], power[:, 1], stats_period
+
+# --------------------------------------------------------------------------
+# Check Power
+# --------------------------------------------------------------------------
+# gem5 prints stats with six digits after the point, so recomputed power
+# matches the reported power up to rounding
+CHECK_RELATIVE_TOLERANCE = 1.0E-5
+CHECK_ABSOLUTE_TOLERANCE = 1.0E-6
+
+def RunEquations(metadata):
+    """Returns the equation numbers a saved run was simulated with.
+    """
+
+    run_options = metadata["options"]
+    return {
+        "cpu": int(run_options["cpu_pwr_eq"]),
+        "l2_cache": int(run_options["l2_pwr_eq"]),
+        "l3_cache": int(run_options["l3_pwr_eq"]),
+    }
+
+def CheckPower(power, power_dir, suffix):
+    """Compares recomputed power with the power gem5 reported for the same
+    run, read from the <component>_power_data_<suffix>.csv files in
+    power_dir. Returns a list of (component, message) pairs, one per
+    component whose power does not match.
+    """
+
+    mismatches = []
+    for component, (dynamic_power, static_power) in sorted(power.items()):
+        csv_filename = os.path.join(power_dir, "{}_power_data_{}.csv".format(component, suffix))
+        if not os.path.exists(csv_filename):
+            mismatches.append((component, "{} not found".format(csv_filename)))
+            continue
+
+        extracted_dynamic, extracted_static, _ = LoadPowerCsv(csv_filename)
+        for name, recomputed, extracted in (
+            ("dynamic", dynamic_power, extracted_dynamic),
+            ("static", static_power, extracted_static)
+        ):
+            if len(recomputed) != len(extracted):
+                mismatches.append((component, "{} power has {} intervals, {} has {}".format(
+                    name, len(recomputed), csv_filename, len(extracted)
+                )))
+            elif not numpy.allclose(recomputed, extracted, rtol = CHECK_RELATIVE_TOLERANCE, atol = CHECK_ABSOLUTE_TOLERANCE, equal_nan = True):
+                error = numpy.nanmax(numpy.abs(recomputed - extracted))
+                mismatches.append((component, "{} power differs from {} by up to {:.6g} W".format(
+                    name, csv_filename, error
+                )))
+
+    return mismatches
+
+# --------------------------------------------------------------------------
+# Find Raw Stats
+# --------------------------------------------------------------------------
+def FindRawStats(paths):
+    """Expands directories into the raw stats stores they hold.
+    """
+
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(glob.glob(os.path.join(path, "raw_stats_*.npz"))))
+        else:
+            filenames.append(path)
+
+    return filenames
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Re-evaluates the power modeling equations on saved raw stats.'
+    )
+    parser.add_argument(
+        'paths',
+        nargs = '+',
+        help = 'Raw stats files, or directories holding raw_stats_*.npz files.'
+    )
+    parser.add_argument(
+        '--cpu_pwr_eq',
+        default = 0,
+        type = int,
+        help = 'Equation used for the processor\'s power consumption. Default: 0.'
+    )
+    parser.add_argument(
+        '--l2_pwr_eq',
+        default = 0,
+        type = int,
+        help = 'Equation used for the L2 cache\'s power consumption. Default: 0.'
+    )
+    parser.add_argument(
+        '--l3_pwr_eq',
+        default = 0,
+        type = int,
+        help = 'Equation used for the L3 cache\'s power consumption. Default: 0.'
+    )
+    parser.add_argument(
+        '--csv_save_dir',
+        default = '',
+        help = 'Write the recomputed power to .csv files in this directory.'
+    )
+    parser.add_argument(
+        '--check',
+        action = 'store_true',
+        help = 'Recompute every run with the equations it was simulated with and compare the result with the power .csv files saved next to its raw stats.'
+    )
+    args = parser.parse_args()
+
+    equations = {
+        "cpu": args.cpu_pwr_eq,
+        "l2_cache": args.l2_pwr_eq,
+        "l3_cache": args.l3_pwr_eq,
+    }
+
+    if args.check:
+        failed = False
+        for filename in FindRawStats(args.paths):
+            columns, metadata = LoadRawStats(filename)
+            power = RecomputePower(columns, metadata, RunEquations(metadata))
+            mismatches = CheckPower(power, os.path.dirname(filename), metadata["options"]["csv_file_suffix"])
+            for component, message in mismatches:
+                print("{}: {}: {}".format(filename, component, message))
+            failed = failed or bool(mismatches)
+        raise SystemExit(1 if failed else 0)
+
+    print("{:<40} {:<10} {:>14} {:>14}".format("Run", "Component", "Dynamic (W)", "Static (W)"))
+    for filename in FindRawStats(args.paths):
+        columns, metadata = LoadRawStats(filename)
+        power = RecomputePower(columns, metadata, equations)
+
+        suffix = metadata["options"]["csv_file_suffix"]
+        for component, (dynamic_power, static_power) in sorted(power.items()):
+            print("{:<40} {:<10} {:>14.6g} {:>14.6g}".format(
+                filename, component, dynamic_power.mean(), static_power.mean()
+            ))
+
+            if args.csv_save_dir:
+                csv_filename = os.path.join(args.csv_save_dir, "{}_power_data_{}.csv".format(component, suffix))
+                WritePowerCsv(csv_filename, metadata, dynamic_power, static_power)
+
+if __name__ == "__main__":
+    main()
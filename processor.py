@@ -6,6 +6,35 @@ import m5
 from m5.objects import *
 
 from caches import *
+from system_options import CPU_KNOBS
+from system_options import CoreIndexes
+
+# --------------------------------------------------------------------------
+# Branch Predictors
+# gem5 branch predictor selected by --branch_predictor
+# --------------------------------------------------------------------------
+BRANCH_PREDICTOR_CLASSES = {
+    'tournament': TournamentBP,
+    'local': LocalBP,
+    'bimode': BiModeBP,
+    'tage': TAGE,
+    'ltage': LTAGE,
+    'tage_sc_l': TAGE_SC_L_8KB,
+    'perceptron': MultiperspectivePerceptron8KB,
+}
+
+# --------------------------------------------------------------------------
+# Trace Monitor
+# --------------------------------------------------------------------------
+def TraceMonitor(trace_file):
+    """Returns a CommMonitor that writes every request passing through it
+    to trace_file in the gem5 output directory. Requires gem5 to be built
+    with protobuf support.
+    """
+
+    monitor = CommMonitor()
+    monitor.trace = MemTraceProbe(trace_file = trace_file)
+    return monitor
 
 # --------------------------------------------------------------------------
 # Processor Class
@@ -19,53 +48,132 @@ class Processor(SubSystem):
 
         # grab relevant options
         self._include_l3_cache = options.include_l3_cache
+        self._num_cores = options.num_cores
+        self._mem_trace = options.mem_trace
+
+        # a region of interest is reached on the atomic CPU, which hands over
+        # to the detailed CPU when the region begins
+        self._fast_forward = options.roi and options.cpu_type != 'AtomicSimpleCPU'
         
-        # Instantiate CPU
+        # Instantiate CPU, one per core
         if options.cpu_type == 'MinorCPU':
-            self.cpu = MinorCPU()
+            self.cpu = [MinorCPU(cpu_id = i) for i in range(self._num_cores)]
         elif options.cpu_type == 'O3CPU':
-            self.cpu = O3CPU()
-
-        # configure the CPU
-        if options.thread_policy:
-            system.cpu.threadPolicy = options.thread_policy
+            self.cpu = [O3CPU(cpu_id = i) for i in range(self._num_cores)]
+        elif options.cpu_type == 'AtomicSimpleCPU':
+            # used to fast-forward to checkpoints
+            self.cpu = [AtomicSimpleCPU(cpu_id = i) for i in range(self._num_cores)]
+
+        # the detailed CPUs keep their name so the stats and power model paths
+        # do not change, and start switched out
+        if self._fast_forward:
+            self.fast_cpu = [AtomicSimpleCPU(cpu_id = i) for i in range(self._num_cores)]
+            for cpu in self.cpu:
+                cpu.switched_out = True
+
+        # configure the pipeline of every core. Knobs of another CPU type
+        # are rejected by ValidateCpuKnobs, and left out when the CPU type
+        # is overridden, such as for taking a checkpoint.
+        for option, option_type, cpu_params, option_help in CPU_KNOBS:
+            value = getattr(options, option)
+            if value is not None and options.cpu_type in cpu_params:
+                for cpu in self.cpu:
+                    setattr(cpu, cpu_params[options.cpu_type], value)
+
+        if options.branch_predictor and options.cpu_type in ('MinorCPU', 'O3CPU'):
+            for cpu in self.cpu:
+                cpu.branchPred = BRANCH_PREDICTOR_CLASSES[options.branch_predictor]()
+
+        # gem5 clock gates a core once all of its threads are suspended. It
+        # can also power gate it after it stayed clock gated for a while.
+        if options.power_gating_on_idle:
+            for cpu in self.allCPUs():
+                cpu.power_gating_on_idle = True
+                cpu.pwr_gating_latency = options.power_gating_latency
+
+        # create the L2 Cache Buses, one per core, and the L3 Cache Bus
+        self.l2bus = [L2XBar() for i in range(self._num_cores)]
+        if self._include_l3_cache:
+            self.l3bus = L3XBar()
 
-        if options.decode_input_buffer_size:
-            system.cpu.decodeInputBufferSize = options.decode_input_buffer_size
+        # create the private L2 caches and the shared L3 cache
+        self.l2cache = [L2Cache(options) for i in range(self._num_cores)]
+        if self._include_l3_cache:
+            self.l3cache = L3Cache(options)
 
-        if options.fetch1_to_fetch2_forward_delay:
-            system.cpu.fetch1ToFetch2ForwardDelay = options.fetch1_to_fetch2_forward_delay
+        for index, cpu, active_cpu, l2bus, l2cache in zip(
+            CoreIndexes(self._num_cores), self.cpu, self.activeCPUs(), self.l2bus, self.l2cache
+        ):
     
-        # create the L1 caches
-        self.cpu.icache = L1ICache(options)
-        self.cpu.dcache = L1DCache(options)
+            # create the L1 caches
+            cpu.icache = L1ICache(options)
+            cpu.dcache = L1DCache(options)
+
+            # connect the L1 Caches to the CPU running first, through monitors
+            # recording every access for cache_model.py when tracing. The
+            # detailed CPU takes the connections over when it is switched in.
+            if self._mem_trace:
+                cpu.icache_monitor = TraceMonitor('icache{}.trc.gz'.format(index))
+                cpu.dcache_monitor = TraceMonitor('dcache{}.trc.gz'.format(index))
+                cpu.icache_monitor.cpu_side_port = active_cpu.icache_port
+                cpu.dcache_monitor.cpu_side_port = active_cpu.dcache_port
+                cpu.icache.connectMonitor(cpu.icache_monitor)
+                cpu.dcache.connectMonitor(cpu.dcache_monitor)
+            else:
+                cpu.icache.connectCPU(active_cpu)
+                cpu.dcache.connectCPU(active_cpu)
+
+            # create interrupt controller, handed over with the connections
+            active_cpu.createInterruptController()
+
+            # connect L2 Cache to the processor
+            cpu.icache.connectBus(l2bus)
+            cpu.dcache.connectBus(l2bus)
+
+            # hook up L2 bus and the L3 bus
+            l2cache.connectCPUSideBus(l2bus)
+            if self._include_l3_cache:
+                l2cache.connectMemSideBus(self.l3bus)
 
-        # connect the L1 Caches to the CPU
-        self.cpu.icache.connectCPU(self.cpu)
-        self.cpu.dcache.connectCPU(self.cpu)
+        if self._include_l3_cache:
+            self.l3cache.connectCPUSideBus(self.l3bus)
 
-        # create interrupt controller
-        self.cpu.createInterruptController()
+    # CPUs running when the simulation starts
+    def activeCPUs(self):
 
-        # create L2 and L3 Cache Buses
-        self.l2bus = L2XBar()
-        if self._include_l3_cache:
-            self.l3bus = L3XBar()
+        if self._fast_forward:
+            return self.fast_cpu
+        return self.cpu
 
-        # connect L2 Cache to the processor
-        self.cpu.icache.connectBus(self.l2bus)
-        self.cpu.dcache.connectBus(self.l2bus)
+    # every CPU of the processor, the atomic ones of the fast-forward included
+    def allCPUs(self):
 
-        # create L2 and L3 caches
-        self.l2cache = L2Cache(options)
-        if self._include_l3_cache:
-            self.l3cache = L3Cache(options)
+        if self._fast_forward:
+            return self.fast_cpu + self.cpu
+        return self.cpu
+
+    # pairs of (running CPU, detailed CPU) for m5.switchCpus, empty when
+    # the detailed CPUs run from the start
+    def switchPairs(self):
+
+        if self._fast_forward:
+            return list(zip(self.fast_cpu, self.cpu))
+        return []
+
+    # clock the cores and their L1 caches from core_domain, and the L2 and
+    # L3 caches and their buses from cache_domain
+    def setClockDomains(self, core_domain, cache_domain):
+
+        for cpu in self.allCPUs():
+            cpu.clk_domain = core_domain
+
+        for l2bus, l2cache in zip(self.l2bus, self.l2cache):
+            l2bus.clk_domain = cache_domain
+            l2cache.clk_domain = cache_domain
 
-        # hook up L2 and L3 buses
-        self.l2cache.connectCPUSideBus(self.l2bus)
         if self._include_l3_cache:
-            self.l2cache.connectMemSideBus(self.l3bus)
-            self.l3cache.connectCPUSideBus(self.l3bus)
+            self.l3bus.clk_domain = cache_domain
+            self.l3cache.clk_domain = cache_domain
 
     # Connect processor to a bus
     def connectProcessor(self, bus):
@@ -73,17 +181,29 @@ class Processor(SubSystem):
         if self._include_l3_cache:
             self.l3cache.connectMemSideBus(bus)
         else:
-            self.l2cache.connectMemSideBus(bus)
+            for l2cache in self.l2cache:
+                l2cache.connectMemSideBus(bus)
     
     # Connect interrupts to memory (x86 only)
     def connectInterruptsToMem(self, membus):
 
-        self.cpu.interrupts[0].pio = membus.mem_side_ports
-        self.cpu.interrupts[0].int_requestor = membus.cpu_side_ports
-        self.cpu.interrupts[0].int_responder = membus.mem_side_ports
+        for cpu in self.activeCPUs():
+            cpu.interrupts[0].pio = membus.mem_side_ports
+            cpu.interrupts[0].int_requestor = membus.cpu_side_ports
+            cpu.interrupts[0].int_responder = membus.mem_side_ports
     
-    # add a workload to the Processor
+    # add a workload to the Processor. Every core runs the same process so
+    # the threads it creates are placed on the free cores.
     def addWorkload(self, process):
 
-        self.cpu.workload = process
-        self.cpu.createThreads()
\ No newline at end of file
+        for cpu in self.cpu:
+            cpu.workload = process
+            cpu.createThreads()
+
+        # the atomic CPUs share the ISA state of the detailed CPUs they hand
+        # over to
+        if self._fast_forward:
+            for fast_cpu, cpu in self.switchPairs():
+                fast_cpu.workload = process
+                fast_cpu.isa = cpu.isa
+                fast_cpu.createThreads()
@@ -0,0 +1,240 @@
+# --------------------------------------------------------------------------
+# Result Cache
+# Content-addressed store of finished runs. A run is identified by a hash of
+# everything that decides its results: the resolved system.py options, the
+# content of the binary, the gem5 build and the configuration scripts. A
+# repeated configuration restores the stored stats and .csv files instead of
+# launching gem5 again.
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from system_options import OUTPUT_OPTIONS
+
+# --------------------------------------------------------------------------
+# Cache Inputs
+# --------------------------------------------------------------------------
+# configuration scripts that shape the simulated system and its results
+CONFIG_SCRIPTS = (
+    "caches.py",
+    "data_extraction.py",
+    "dvfs.py",
+    "memory.py",
+    "power.py",
+    "power_equations.py",
+    "processor.py",
+    "stats_filter.py",
+    "system.py",
+    "system_options.py",
+)
+
+# --------------------------------------------------------------------------
+# File Hashing
+# --------------------------------------------------------------------------
+# file hashes already computed, keyed by (path, size, modification time) so
+# large files such as gem5.opt are hashed once per process
+_file_hashes = {}
+_file_hashes_lock = threading.Lock()
+
+def HashFile(filename):
+    """Returns the SHA-256 hash of the content of filename.
+    """
+
+    file_stat = os.stat(filename)
+    file_id = (os.path.abspath(filename), file_stat.st_size, file_stat.st_mtime_ns)
+
+    with _file_hashes_lock:
+        if file_id in _file_hashes:
+            return _file_hashes[file_id]
+
+    file_hash = hashlib.sha256()
+    with open(filename, "rb") as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1 << 20), b""):
+            file_hash.update(chunk)
+
+    with _file_hashes_lock:
+        _file_hashes[file_id] = file_hash.hexdigest()
+
+    return _file_hashes[file_id]
+
+# --------------------------------------------------------------------------
+# Result Cache Class
+# --------------------------------------------------------------------------
+class ResultCache:
+    """Stores the stats file and output files of finished runs under the hash
+    of their inputs. Entries are evicted least recently used first once the
+    cache grows past max_bytes.
+    """
+
+    # ----------------------------------------------------------------------
+    # Constructor
+    # ----------------------------------------------------------------------
+    def __init__(self, cache_dir, max_bytes):
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+        # one lock per key so duplicate runs in a sweep wait for the first
+        # one and restore its results
+        self.key_locks = {}
+
+        os.makedirs(cache_dir, exist_ok = True)
+
+    # ----------------------------------------------------------------------
+    # Key
+    # ----------------------------------------------------------------------
+    def Key(self, options, gem5_binary, project_dir):
+        """Returns the cache key of a run. options is the resolved option
+        namespace of system.py; the options that only select output
+        locations are left out so identical runs share an entry.
+        """
+
+        resolved = dict(
+            (option, value) for option, value in vars(options).items()
+            if option not in OUTPUT_OPTIONS and option != "binary"
+        )
+
+        key_inputs = {
+            "options": resolved,
+            "binary": HashFile(options.binary),
+            "gem5": HashFile(gem5_binary),
+            "scripts": dict(
+                (script, HashFile(os.path.join(project_dir, script)))
+                for script in CONFIG_SCRIPTS
+            ),
+        }
+
+        encoded = json.dumps(key_inputs, sort_keys = True, default = str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    # lock serializing the runs that share key
+    def KeyLock(self, key):
+
+        with self.lock:
+            return self.key_locks.setdefault(key, threading.Lock())
+
+    # directory of an entry
+    def EntryDir(self, key):
+
+        return os.path.join(self.cache_dir, key)
+
+    # ----------------------------------------------------------------------
+    # Restore
+    # ----------------------------------------------------------------------
+    def Restore(self, key, outdir, save_dir, suffix):
+        """Copies a stored entry back into a run's output directory and save
+        directory, renaming the output files to the run's suffix. Returns
+        False if there is no entry for key.
+        """
+
+        entry_dir = self.EntryDir(key)
+
+        with self.lock:
+            if not os.path.isdir(entry_dir):
+                return False
+            # mark the entry as recently used
+            os.utime(entry_dir)
+
+        with open(os.path.join(entry_dir, "entry.json"), "r") as entry_file:
+            entry = json.load(entry_file)
+
+        os.makedirs(outdir, exist_ok = True)
+        os.makedirs(save_dir, exist_ok = True)
+
+        shutil.copyfile(os.path.join(entry_dir, "stats.txt"), os.path.join(outdir, "stats.txt"))
+
+        # the run manifest names the output locations of the restoring run
+        if os.path.exists(os.path.join(entry_dir, "run.json")):
+            with open(os.path.join(entry_dir, "run.json"), "r") as run_file:
+                run = json.load(run_file)
+            run["options"]["csv_file_suffix"] = suffix
+            run["options"]["csv_save_dir"] = save_dir
+            with open(os.path.join(outdir, "run.json"), "w") as run_file:
+                json.dump(run, run_file, indent = 4)
+
+        output_files = []
+        for name, extension in entry["outputs"]:
+            output_filename = os.path.join(save_dir, "{}_{}{}".format(name, suffix, extension))
+            shutil.copyfile(os.path.join(entry_dir, name + extension), output_filename)
+            output_files.append(output_filename)
+
+        with open(os.path.join(outdir, "outputs.json"), "w") as outputs_file:
+            json.dump(output_files, outputs_file, indent = 4)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    # Store
+    # ----------------------------------------------------------------------
+    def Store(self, key, outdir, suffix):
+        """Stores the stats file and run manifest of a finished run and the
+        output files listed in its outputs.json, then evicts old entries.
+        """
+
+        with open(os.path.join(outdir, "outputs.json"), "r") as outputs_file:
+            output_files = json.load(outputs_file)
+
+        # build the entry in a temporary directory and move it into place so
+        # a concurrent lookup never sees a partial entry
+        temp_dir = tempfile.mkdtemp(dir = self.cache_dir, prefix = ".store-")
+
+        shutil.copyfile(os.path.join(outdir, "stats.txt"), os.path.join(temp_dir, "stats.txt"))
+        if os.path.exists(os.path.join(outdir, "run.json")):
+            shutil.copyfile(os.path.join(outdir, "run.json"), os.path.join(temp_dir, "run.json"))
+
+        outputs = []
+        for output_filename in output_files:
+            # output files are named <name>_<suffix><extension>
+            base, extension = os.path.splitext(os.path.basename(output_filename))
+            name = base[:-len(suffix) - 1] if base.endswith("_" + suffix) else base
+            shutil.copyfile(output_filename, os.path.join(temp_dir, name + extension))
+            outputs.append((name, extension))
+
+        with open(os.path.join(temp_dir, "entry.json"), "w") as entry_file:
+            json.dump({"outputs": outputs, "stored": time.time()}, entry_file, indent = 4)
+
+        with self.lock:
+            entry_dir = self.EntryDir(key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(temp_dir)
+            else:
+                os.rename(temp_dir, entry_dir)
+
+            self.Evict()
+
+    # ----------------------------------------------------------------------
+    # Evict
+    # ----------------------------------------------------------------------
+    def Evict(self):
+        """Removes the least recently used entries until the cache fits in
+        max_bytes.
+        """
+
+        entries = []
+        total_bytes = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self.EntryDir(key)
+            if key.startswith(".") or not os.path.isdir(entry_dir):
+                continue
+            entry_bytes = sum(
+                os.path.getsize(os.path.join(entry_dir, filename))
+                for filename in os.listdir(entry_dir)
+            )
+            entries.append((os.path.getmtime(entry_dir), entry_bytes, entry_dir))
+            total_bytes += entry_bytes
+
+        for mtime, entry_bytes, entry_dir in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir)
+            total_bytes -= entry_bytes
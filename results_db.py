@@ -0,0 +1,322 @@
+# --------------------------------------------------------------------------
+# Results Database
+# Collects the runs of every sweep in one SQLite database. Each run is read
+# back from its gem5 output directory with DataExtraction: the runs table
+# holds every system.py option of a run along with its whole-run
+# performance totals, and the intervals table holds the per-interval power
+# of its components and, under the performance component, its per-interval
+# performance series. Comparisons across tests are a single query instead
+# of parsing every .csv file again.
+#
+# usage: python3 results_db.py results.db test1 test3
+#        sqlite3 results.db "SELECT l2_size, SUM(dynamic_power + static_power) * stats_period
+#                            FROM runs JOIN intervals USING (run_id) GROUP BY run_id"
+#        sqlite3 results.db "SELECT l2_size, AVG(l2_miss_rate), energy_per_inst
+#                            FROM runs JOIN intervals USING (run_id)
+#                            WHERE component = 'performance' GROUP BY run_id"
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+
+from data_extraction import DataExtraction
+from data_extraction import POWER_STATS
+from system_options import CreateOptionParser
+
+# --------------------------------------------------------------------------
+# Run Manifest
+# --------------------------------------------------------------------------
+# file system.py writes to its output directory describing the run
+RUN_MANIFEST = "run.json"
+
+# --------------------------------------------------------------------------
+# Schema
+# --------------------------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    outdir TEXT UNIQUE NOT NULL,
+    test TEXT,
+    suffix TEXT,
+    stats_period REAL,
+    exiting_tick INTEGER,
+    intervals INTEGER,
+    ingested REAL
+);
+
+CREATE TABLE IF NOT EXISTS intervals (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    component TEXT NOT NULL,
+    interval INTEGER NOT NULL,
+    dynamic_power REAL,
+    static_power REAL,
+    PRIMARY KEY (run_id, component, interval)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS intervals_component ON intervals (component, run_id);
+
+CREATE VIEW IF NOT EXISTS run_energy AS
+SELECT
+    run_id,
+    component,
+    AVG(dynamic_power + static_power) AS average_power,
+    MAX(dynamic_power + static_power) AS peak_power,
+    SUM(dynamic_power + static_power) * stats_period AS energy
+FROM runs JOIN intervals USING (run_id)
+WHERE component != 'performance'
+GROUP BY run_id, component;
+"""
+
+# component of the intervals rows holding the performance series of a run,
+# such as its IPC, cache misses and energy per instruction. Their columns are
+# added as runs bring them.
+PERFORMANCE_COMPONENT = "performance"
+
+# options the sweeps vary, indexed so filtering on them stays fast
+INDEXED_OPTIONS = (
+    "test",
+    "cpu_type",
+    "l1i_size_bytes",
+    "l1d_size_bytes",
+    "l2_size_bytes",
+    "l3_size_bytes",
+    "l1i_assoc",
+    "l1d_assoc",
+    "l2_assoc",
+    "l3_assoc",
+    "include_l3_cache",
+    "num_cores",
+)
+
+# --------------------------------------------------------------------------
+# Option Helpers
+# --------------------------------------------------------------------------
+def OptionDefaults():
+    """Returns the default of every system.py option, keyed by option name.
+    """
+
+    parser, parameters = CreateOptionParser()
+    return dict((action.dest, action.default) for action in parser._actions if action.dest != "help")
+
+SIZE_UNITS = {"": 1, "B": 1, "kB": 1024, "KB": 1024, "KiB": 1024, "MB": 1024**2, "MiB": 1024**2, "GB": 1024**3, "GiB": 1024**3}
+SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]i?B|kB|B)?\s*$")
+
+def SizeBytes(size):
+    """Converts a gem5 size string such as 64kB to bytes. Returns None if
+    size is not a size.
+    """
+
+    match = SIZE_PATTERN.match(str(size))
+    if match is None:
+        return None
+
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or ""])
+
+def SizeOptions(option_defaults):
+    """Returns the options whose default is a size with a unit, such as the
+    cache sizes.
+    """
+
+    return sorted(
+        option for option, default in option_defaults.items()
+        if isinstance(default, str) and SIZE_PATTERN.match(default) and not default.strip().isdigit()
+    )
+
+# --------------------------------------------------------------------------
+# Results Database Class
+# --------------------------------------------------------------------------
+class ResultsDatabase:
+    """SQLite store of the runs of every sweep. The runs table gets a column
+    per system.py option, added on open so options introduced later extend
+    an existing database.
+    """
+
+    # ----------------------------------------------------------------------
+    # Constructor
+    # ----------------------------------------------------------------------
+    def __init__(self, db_filename):
+
+        self.db_filename = db_filename
+        self.connection = sqlite3.connect(db_filename)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+
+        option_defaults = OptionDefaults()
+        self.option_names = sorted(option_defaults)
+        self.size_options = SizeOptions(option_defaults)
+
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.AddColumns()
+
+    # ----------------------------------------------------------------------
+    # Add Columns
+    # ----------------------------------------------------------------------
+    def AddColumns(self):
+        """Adds a runs column for every option, and a *_bytes column for
+        every cache size, that the table does not have yet, then indexes the
+        sweep dimensions.
+        """
+
+        self.ExtendTable("runs", self.option_names + [option + "_bytes" for option in self.size_options])
+
+        for column in INDEXED_OPTIONS:
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS "runs_{0}" ON runs ("{0}")'.format(column)
+            )
+
+    # adds the columns of table that it does not have yet
+    def ExtendTable(self, table, columns):
+
+        existing = set(row[1] for row in self.connection.execute("PRAGMA table_info({})".format(table)))
+        for column in columns:
+            if column not in existing:
+                self.connection.execute('ALTER TABLE {} ADD COLUMN "{}"'.format(table, column))
+
+    # ----------------------------------------------------------------------
+    # Ingest Run
+    # ----------------------------------------------------------------------
+    def IngestRun(self, outdir):
+        """Reads a finished run from its gem5 output directory and stores it,
+        replacing an earlier ingest of the same directory. The performance
+        series and totals are taken over the power of every component and
+        DRAM of the run. Returns the run's id.
+        """
+
+        with open(os.path.join(outdir, RUN_MANIFEST), "r") as manifest_file:
+            manifest = json.load(manifest_file)
+
+        options = manifest["options"]
+        statistics = DataExtraction(
+            manifest["exiting_tick"],
+            manifest["stats_period"],
+            os.path.join(outdir, "stats.txt")
+        )
+        if manifest.get("roi"):
+            statistics.SetRoi(*manifest["roi"])
+        statistics.AddPerformance(options["num_cores"], options.get("mem_channels", 1))
+
+        power = {}
+        for component, component_info in manifest["components"].items():
+            statistics.AddComponent(component, component_info["path"] + ".power_model.pm0", POWER_STATS)
+        for component, component_info in manifest.get("dram", {}).items():
+            statistics.AddDram(component, component_info["paths"], component_info["ranks"])
+        components = list(manifest["components"]) + list(manifest.get("dram", {}))
+        for component in components:
+            data = statistics.GetComponentData(component)
+            power[component] = list(zip(data["dynamicPower"], data["staticPower"]))
+
+        series = statistics.GetPerformanceSeries(components)
+        totals = statistics.GetPerformanceTotals(components)
+
+        row = {
+            "outdir": os.path.abspath(outdir),
+            "test": os.path.basename(os.path.normpath(options.get("csv_save_dir") or outdir)),
+            "suffix": options.get("csv_file_suffix"),
+            "stats_period": manifest["stats_period"],
+            "exiting_tick": manifest["exiting_tick"],
+            "intervals": max([len(intervals) for intervals in power.values()] or [0]),
+            "ingested": time.time(),
+        }
+        for option in self.option_names:
+            row[option] = options.get(option)
+        for option in self.size_options:
+            row[option + "_bytes"] = SizeBytes(options.get(option))
+        row.update(totals)
+
+        columns = sorted(row)
+        series_names = [name for name, values in series]
+        with self.connection:
+            self.ExtendTable("runs", columns)
+            self.ExtendTable("intervals", series_names)
+            self.connection.execute("DELETE FROM runs WHERE outdir = ?", (row["outdir"],))
+            run_id = self.connection.execute(
+                "INSERT INTO runs ({}) VALUES ({})".format(
+                    ", ".join('"{}"'.format(column) for column in columns),
+                    ", ".join("?" for column in columns)
+                ),
+                [row[column] for column in columns]
+            ).lastrowid
+
+            for component, intervals in power.items():
+                self.connection.executemany(
+                    "INSERT INTO intervals (run_id, component, interval, dynamic_power, static_power) VALUES (?, ?, ?, ?, ?)",
+                    ((run_id, component, interval, dynamic, static)
+                     for interval, (dynamic, static) in enumerate(intervals))
+                )
+
+            self.connection.executemany(
+                "INSERT INTO intervals (run_id, component, interval, {}) VALUES (?, ?, ?, {})".format(
+                    ", ".join('"{}"'.format(name) for name in series_names),
+                    ", ".join("?" for name in series_names)
+                ),
+                ((run_id, PERFORMANCE_COMPONENT, interval) + values
+                 for interval, values in enumerate(zip(*(values for name, values in series))))
+            )
+
+        return run_id
+
+    # ----------------------------------------------------------------------
+    # Close
+    # ----------------------------------------------------------------------
+    def Close(self):
+
+        self.connection.close()
+
+# --------------------------------------------------------------------------
+# Find Runs
+# --------------------------------------------------------------------------
+def FindRuns(paths):
+    """Expands directories into the gem5 output directories below them that
+    hold a run manifest.
+    """
+
+    outdirs = []
+    for path in paths:
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            if RUN_MANIFEST in filenames:
+                outdirs.append(dirpath)
+
+    return outdirs
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Ingests finished runs into the SQLite results database.'
+    )
+    parser.add_argument(
+        'db_file',
+        help = 'SQLite database the runs are written to. Created if it does not exist.'
+    )
+    parser.add_argument(
+        'paths',
+        nargs = '+',
+        help = 'gem5 output directories, or directories such as test1 holding them.'
+    )
+    args = parser.parse_args()
+
+    results_db = ResultsDatabase(args.db_file)
+    ingested = 0
+    for outdir in FindRuns(args.paths):
+        try:
+            results_db.IngestRun(outdir)
+            ingested += 1
+        except (OSError, KeyError, ValueError) as error:
+            print("{} skipped: {}".format(outdir, error))
+    results_db.Close()
+
+    print("{} runs ingested into {}".format(ingested, args.db_file))
+
+if __name__ == "__main__":
+    main()
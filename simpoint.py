@@ -0,0 +1,324 @@
+# --------------------------------------------------------------------------
+# SimPoint Sampling
+# Offline half of the sampled simulation mode of system.py. A profiling run
+# with --simpoint_profile=True writes the basic block vector (BBV) of every
+# interval to simpoint.bb.gz. This script clusters those vectors into
+# representative simulation points with weights, written in the format of
+# the SimPoint tool, and combines the per-simpoint results of the detailed
+# runs into weighted whole-program estimates.
+#
+# usage: python3 simpoint.py cluster m5out/simpoint.bb.gz --out_dir simpoints
+#        python3 simpoint.py combine totals.csv test7/simpoint_*.json
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import gzip
+import json
+import os
+
+import numpy
+
+from data_extraction import SimPointExtraction
+
+# --------------------------------------------------------------------------
+# Defaults
+# --------------------------------------------------------------------------
+# dimensions the basic block vectors are projected to before clustering,
+# as done by the SimPoint tool
+PROJECTED_DIMENSIONS = 15
+
+# the smallest clustering whose BIC reaches this fraction of the best BIC is
+# chosen, as done by the SimPoint tool
+BIC_THRESHOLD = 0.9
+
+# --------------------------------------------------------------------------
+# Load Basic Block Vectors
+# --------------------------------------------------------------------------
+def LoadBasicBlockVectors(bbv_filename, dimensions = PROJECTED_DIMENSIONS, seed = 0):
+    """Reads the basic block vectors written by gem5's SimPoint probe and
+    returns them normalized and randomly projected to a few dimensions,
+    one row per interval.
+    """
+
+    opener = gzip.open if bbv_filename.endswith(".gz") else open
+
+    intervals = 0
+    rows = []
+    blocks = []
+    counts = []
+    with opener(bbv_filename, "rt") as bbv_file:
+        for line in bbv_file:
+            # each interval is a line of the form T:block:count :block:count
+            if not line.startswith("T"):
+                continue
+            for entry in line[1:].split():
+                block, count = entry.strip(":").split(":")
+                rows.append(intervals)
+                blocks.append(int(block))
+                counts.append(float(count))
+            intervals += 1
+
+    interval_index = numpy.array(rows, dtype = numpy.int64)
+    block_index = numpy.array(blocks, dtype = numpy.int64)
+    block_counts = numpy.array(counts)
+
+    # normalize every interval so long and short blocks weigh the same
+    totals = numpy.bincount(interval_index, weights = block_counts, minlength = intervals)
+    block_counts /= totals[interval_index]
+
+    # random projection as done by the SimPoint tool
+    random = numpy.random.default_rng(seed)
+    projection = random.uniform(-1.0, 1.0, (block_index.max() + 1 if blocks else 1, dimensions))
+    projected = numpy.zeros((intervals, dimensions))
+    numpy.add.at(projected, interval_index, block_counts[:, None] * projection[block_index])
+
+    return projected
+
+# --------------------------------------------------------------------------
+# K-Means Clustering
+# --------------------------------------------------------------------------
+def KMeans(data, k, random, iterations = 100):
+    """Clusters the rows of data into k clusters with k-means++ seeding.
+    Returns the centroids and the cluster of every row.
+    """
+
+    # k-means++ seeding
+    centroids = [data[random.integers(len(data))]]
+    for i in range(1, k):
+        distances = ((data[:, None, :] - numpy.array(centroids)[None, :, :]) ** 2).sum(axis = 2).min(axis = 1)
+        if distances.sum() == 0:
+            break
+        centroids.append(data[random.choice(len(data), p = distances / distances.sum())])
+    centroids = numpy.array(centroids)
+
+    labels = None
+    for iteration in range(iterations):
+        distances = ((data[:, None, :] - centroids[None, :, :]) ** 2).sum(axis = 2)
+        new_labels = distances.argmin(axis = 1)
+        if labels is not None and (new_labels == labels).all():
+            break
+        labels = new_labels
+        for cluster in range(len(centroids)):
+            members = data[labels == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis = 0)
+
+    return centroids, labels
+
+def BayesianInformationCriterion(data, centroids, labels):
+    """Scores a clustering with the BIC used by X-means and the SimPoint
+    tool. Higher is better.
+    """
+
+    rows, dimensions = data.shape
+    k = len(centroids)
+    if rows <= k:
+        return -numpy.inf
+
+    sizes = numpy.bincount(labels, minlength = k)
+    squared_error = ((data - centroids[labels]) ** 2).sum()
+    variance = max(squared_error / (dimensions * (rows - k)), 1e-300)
+
+    occupied = sizes[sizes > 0]
+    log_likelihood = (
+        (occupied * numpy.log(occupied)).sum()
+        - rows * numpy.log(rows)
+        - rows * dimensions / 2.0 * numpy.log(2 * numpy.pi * variance)
+        - dimensions * (rows - k) / 2.0
+    )
+    parameters = (k - 1) + dimensions * k + 1
+
+    return log_likelihood - parameters / 2.0 * numpy.log(rows)
+
+# --------------------------------------------------------------------------
+# Choose SimPoints
+# --------------------------------------------------------------------------
+def ChooseSimPoints(data, max_k, seed = 0):
+    """Clusters the intervals for every k up to max_k, keeps the smallest
+    clustering with a good enough BIC and returns (interval, weight) pairs,
+    one per cluster, using the interval closest to each centroid.
+    """
+
+    random = numpy.random.default_rng(seed)
+
+    clusterings = []
+    for k in range(1, min(max_k, len(data)) + 1):
+        centroids, labels = KMeans(data, k, random)
+        clusterings.append((BayesianInformationCriterion(data, centroids, labels), centroids, labels))
+
+    scores = numpy.array([score for score, centroids, labels in clusterings])
+    finite = scores[numpy.isfinite(scores)]
+    threshold = finite.min() + BIC_THRESHOLD * (finite.max() - finite.min()) if len(finite) else -numpy.inf
+    score, centroids, labels = next(c for c in clusterings if c[0] >= threshold)
+
+    simpoints = []
+    for cluster in range(len(centroids)):
+        members = numpy.flatnonzero(labels == cluster)
+        if not len(members):
+            continue
+        distances = ((data[members] - centroids[cluster]) ** 2).sum(axis = 1)
+        simpoints.append((int(members[distances.argmin()]), len(members) / float(len(data))))
+
+    return sorted(simpoints)
+
+# --------------------------------------------------------------------------
+# SimPoint Files
+# --------------------------------------------------------------------------
+def WriteSimPoints(simpoints, simpoint_filename, weight_filename):
+    """Writes the simpoints and weights files in the SimPoint tool format.
+    """
+
+    with open(simpoint_filename, "w") as simpoint_file, open(weight_filename, "w") as weight_file:
+        for cluster, (interval, weight) in enumerate(simpoints):
+            simpoint_file.write("{} {}\n".format(interval, cluster))
+            weight_file.write("{} {}\n".format(weight, cluster))
+
+def LoadSimPoints(simpoint_filename, weight_filename):
+    """Reads simpoints and weights files in the SimPoint tool format and
+    returns (interval, weight) pairs ordered by interval.
+    """
+
+    intervals = {}
+    with open(simpoint_filename, "r") as simpoint_file:
+        for line in simpoint_file:
+            if line.split():
+                interval, cluster = line.split()
+                intervals[cluster] = int(interval)
+
+    weights = {}
+    with open(weight_filename, "r") as weight_file:
+        for line in weight_file:
+            if line.split():
+                weight, cluster = line.split()
+                weights[cluster] = float(weight)
+
+    return sorted((intervals[cluster], weights[cluster]) for cluster in intervals)
+
+# --------------------------------------------------------------------------
+# SimPoint Checkpoints
+# --------------------------------------------------------------------------
+# name of the checkpoint taken for a simpoint, following gem5's example
+# scripts so the checkpoints can be shared with them
+SIMPOINT_CHECKPOINT = "cpt.simpoint_{:02d}_inst_{}_weight_{}_interval_{}_warmup_{}"
+
+def SimPointStarts(simpoints, interval, warmup):
+    """Returns (index, start instruction, weight, warmup) for every simpoint.
+    Each checkpoint is taken warmup instructions before its simpoint, or at
+    the start of the program if the simpoint is closer to it than that.
+    """
+
+    starts = []
+    for index, (simpoint, weight) in enumerate(simpoints):
+        simpoint_start = simpoint * interval
+        simpoint_warmup = min(warmup, simpoint_start)
+        starts.append((index, simpoint_start - simpoint_warmup, weight, simpoint_warmup))
+
+    return sorted(starts, key = lambda start: start[1])
+
+def SimPointCheckpointName(index, start, weight, interval, warmup):
+    """Returns the name of the checkpoint directory of a simpoint.
+    """
+
+    return SIMPOINT_CHECKPOINT.format(index, start, weight, interval, warmup)
+
+def FindSimPointCheckpoint(checkpoint_dir, index):
+    """Finds the checkpoint of simpoint index in checkpoint_dir and returns
+    its path along with the start, weight, interval and warmup recorded in
+    its name.
+    """
+
+    prefix = "cpt.simpoint_{:02d}_".format(index)
+    for name in os.listdir(checkpoint_dir):
+        if name.startswith(prefix):
+            fields = name[len("cpt.simpoint_"):].split("_")
+            return {
+                "path": os.path.join(checkpoint_dir, name),
+                "start": int(fields[2]),
+                "weight": float(fields[4]),
+                "interval": int(fields[6]),
+                "warmup": int(fields[8]),
+            }
+
+    raise ValueError("no checkpoint for simpoint {} in {}".format(index, checkpoint_dir))
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    parser = argparse.ArgumentParser(
+        description = 'Chooses simulation points and combines their results.'
+    )
+    subparsers = parser.add_subparsers(dest = 'command')
+    subparsers.required = True
+
+    cluster_parser = subparsers.add_parser(
+        'cluster',
+        help = 'Cluster the basic block vectors of a profiling run into simpoints.'
+    )
+    cluster_parser.add_argument(
+        'bbv_file',
+        help = 'simpoint.bb.gz written by a --simpoint_profile=True run.'
+    )
+    cluster_parser.add_argument(
+        '--max_k',
+        default = 10,
+        type = int,
+        help = 'Largest number of simpoints to consider. Default: 10.'
+    )
+    cluster_parser.add_argument(
+        '--seed',
+        default = 0,
+        type = int,
+        help = 'Seed of the random projection and of the clustering. Default: 0.'
+    )
+    cluster_parser.add_argument(
+        '--out_dir',
+        default = '.',
+        help = 'Directory the simpoints and weights files are written to. Default: current directory.'
+    )
+
+    combine_parser = subparsers.add_parser(
+        'combine',
+        help = 'Combine the detailed runs of the simpoints into weighted totals.'
+    )
+    combine_parser.add_argument(
+        'csv_file',
+        help = '.csv file the weighted totals are written to.'
+    )
+    combine_parser.add_argument(
+        'manifests',
+        nargs = '+',
+        help = 'simpoint_*.json files written by the --restore_simpoint runs.'
+    )
+
+    args = parser.parse_args()
+
+    if args.command == 'cluster':
+        data = LoadBasicBlockVectors(args.bbv_file, seed = args.seed)
+        simpoints = ChooseSimPoints(data, args.max_k, args.seed)
+
+        os.makedirs(args.out_dir, exist_ok = True)
+        WriteSimPoints(
+            simpoints,
+            os.path.join(args.out_dir, "simpoints.txt"),
+            os.path.join(args.out_dir, "weights.txt")
+        )
+
+        print("{} intervals clustered into {} simpoints".format(len(data), len(simpoints)))
+        for interval, weight in simpoints:
+            print("interval {:>8} weight {:.4f}".format(interval, weight))
+
+    elif args.command == 'combine':
+        simpoints = []
+        for manifest_filename in args.manifests:
+            with open(manifest_filename, "r") as manifest_file:
+                simpoints.append(json.load(manifest_file))
+
+        SimPointExtraction(simpoints).CreateCsv(args.csv_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# --------------------------------------------------------------------------
+# Stats Filter
+# Restricts the stats dumps of a run to an allow-list. Without it every
+# periodic dump holds every statistic of the system even though only the
+# power, IPC and cache statistics are extracted from stats.txt. The filter
+# replaces the visitor walk of m5.stats so statistics that are not allowed
+# are never formatted or written.
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import re
+
+import m5.stats
+from m5.objects import Root
+
+# --------------------------------------------------------------------------
+# Allow-List Patterns
+# --------------------------------------------------------------------------
+# an allow-list entry starting with this is a regular expression matched
+# against the full stat name
+REGEX_PREFIX = "re:"
+
+# --------------------------------------------------------------------------
+# Stats Filter Class
+# --------------------------------------------------------------------------
+class StatsFilter:
+    """Decides which statistics are dumped. Every allow-list entry is one
+    of:
+        a full stat name, such as system.processor.cpu.ipc. The ::total
+            style suffixes of vector stats are ignored, the whole stat is
+            kept.
+        a path prefix ending in a dot, such as system.processor.l2cache.
+            which keeps every stat below that path.
+        a regular expression prefixed with re:, such as re:.*overallMisses
+    Stats of the root group, such as simSeconds and finalTick, are always
+    kept.
+    """
+
+    def __init__(self, allow_list):
+
+        self.names = set()
+        self.prefixes = []
+        self.regexes = []
+
+        # groups that hold an allowed stat, so the walk only descends into
+        # groups that can contain one
+        self.groups = set()
+
+        for entry in allow_list:
+            entry = entry.strip()
+            if not entry:
+                continue
+            if entry.startswith(REGEX_PREFIX):
+                self.regexes.append(re.compile(entry[len(REGEX_PREFIX):]))
+            elif entry.endswith("."):
+                self.prefixes.append(entry)
+                self.AddGroups(entry)
+            else:
+                name = entry.split("::")[0]
+                self.names.add(name)
+                self.AddGroups(name)
+
+    # registers every group above path
+    def AddGroups(self, path):
+
+        parts = path.split(".")
+        for i in range(1, len(parts)):
+            self.groups.add(".".join(parts[:i]) + ".")
+
+    # ----------------------------------------------------------------------
+    # Allowed
+    # ----------------------------------------------------------------------
+    def StatAllowed(self, name):
+        """Returns True if the stat with the full name name is dumped.
+        """
+
+        if "." not in name or name in self.names:
+            return True
+        if any(name.startswith(prefix) for prefix in self.prefixes):
+            return True
+
+        return any(regex.match(name) for regex in self.regexes)
+
+    def GroupAllowed(self, path):
+        """Returns True if the group at path, given with a trailing dot, can
+        hold a stat that is dumped.
+        """
+
+        if self.regexes or path in self.groups:
+            return True
+
+        return any(path.startswith(prefix) for prefix in self.prefixes)
+
+# --------------------------------------------------------------------------
+# Install Stats Filter
+# --------------------------------------------------------------------------
+def InstallStatsFilter(stats_filter):
+    """Makes every following stats dump, periodic ones included, visit only
+    the statistics allowed by stats_filter. The walk mirrors the one of
+    m5.stats and differs only in the stats and groups it skips.
+    """
+
+    def DumpGroup(visitor, group, path):
+        for stat in group.getStats():
+            if stats_filter.StatAllowed(path + stat.name):
+                stat.visit(visitor)
+
+        for name, child in group.getStatGroups().items():
+            child_path = "{}{}.".format(path, name)
+            if stats_filter.GroupAllowed(child_path):
+                visitor.beginGroup(name)
+                DumpGroup(visitor, child, child_path)
+                visitor.endGroup()
+
+    def DumpToVisitor(visitor, roots = None):
+        if roots:
+            for root in roots:
+                path_list = root.path_list()
+                for name in path_list:
+                    visitor.beginGroup(name)
+                DumpGroup(visitor, root, "".join(name + "." for name in path_list))
+                for name in reversed(path_list):
+                    visitor.endGroup()
+        else:
+            # legacy global stats
+            for stat in m5.stats.stats_list:
+                stat.visit(visitor)
+
+            DumpGroup(visitor, Root.getInstance(), "")
+
+    m5.stats._dump_to_visitor = DumpToVisitor
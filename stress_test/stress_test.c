@@ -1,15 +1,28 @@
+#include<pthread.h>
 #include<stdio.h>
+#include<stdlib.h>
 
-void main()
+#include "../workloads/roi.h"
+
+#define N 1000
+#define MAX_THREADS 64
+
+// is_prime[i] is set by the thread that tested i
+char is_prime[N+1];
+
+struct thread_args
 {
-    int n=1000;
-    int array1[1000];
-    int array_size=0;
-    int j, i, k, temp;
+    int first;
+    int step;
+};
 
-    printf("Finding Primes:\n");
+// tests every step-th number starting at first
+void *find_primes(void *arg)
+{
+    struct thread_args *args = (struct thread_args *)arg;
+    int i, j;
 
-    for(i=2;i<=n;i++)
+    for(i=args->first;i<=N;i+=args->step)
     {
         int c=0;
         for(j=1;j<=i;j++)
@@ -20,7 +33,59 @@ void main()
             }
         }
 
-       if(c==2)
+        is_prime[i] = (c==2);
+    }
+
+    return NULL;
+}
+
+// usage: stress_test [threads]
+// the numbers are spread over the threads, run one thread per core
+void main(int argc, char **argv)
+{
+    int n=N;
+    int array1[1000];
+    int array_size=0;
+    int i, k, temp;
+    int num_threads=1;
+    pthread_t threads[MAX_THREADS];
+    struct thread_args args[MAX_THREADS];
+
+    if(argc > 1)
+    {
+        num_threads = atoi(argv[1]);
+    }
+    if(num_threads < 1 || num_threads > MAX_THREADS)
+    {
+        printf("Number of threads must be between 1 and %d\n", MAX_THREADS);
+        exit(1);
+    }
+
+    printf("Finding Primes:\n");
+
+    // only the search is measured, not the start-up and the printing
+    roi_begin();
+
+    // the main thread takes the first share of the numbers
+    for(i=0;i<num_threads;i++)
+    {
+        args[i].first = 2+i;
+        args[i].step = num_threads;
+    }
+    for(i=1;i<num_threads;i++)
+    {
+        pthread_create(&threads[i], NULL, find_primes, &args[i]);
+    }
+    find_primes(&args[0]);
+    for(i=1;i<num_threads;i++)
+    {
+        pthread_join(threads[i], NULL);
+    }
+    roi_end();
+
+    for(i=2;i<=n;i++)
+    {
+       if(is_prime[i])
         {
             printf("%d ",i);
             array1[array_size] = i;
@@ -30,7 +95,7 @@ void main()
     printf("Multiplying Primes:\n");
     for(k=0; k<array_size;k++)
     {
-        temp = array1[array_size-k]*array1[k] ;
+        temp = array1[array_size-1-k]*array1[k] ;
         printf("%d ", temp);
     }
     printf("Done:\n");
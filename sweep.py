@@ -0,0 +1,650 @@
+# --------------------------------------------------------------------------
+# Parallel Sweep Runner
+# Runs every test of the power modeling project as a bounded pool of gem5
+# processes. Each run gets its own gem5 output directory and the status of
+# every job is kept in a JSON file so failed jobs can be retried without
+# rerunning the whole sweep.
+#
+# Assumes the project is stored in the directory configs/project within the
+# gem5 directory and that the binaries were built by run.sh.
+# --------------------------------------------------------------------------
+
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from result_cache import ResultCache
+from results_db import ResultsDatabase
+from system_options import CreateOptionParser
+
+# --------------------------------------------------------------------------
+# Sweep Definition
+# each test lists its runs as (csv file suffix, ISA, system.py options). The
+# "workload" option selects the binary built by run.sh, stress_test if not
+# given, and binary_args holds its size arguments.
+# --------------------------------------------------------------------------
+TESTS = [
+    ("test1", [
+        ("without_l3_cache", "ARM", {"l2_size": "512kB"}),
+        ("with_l3_cache",    "ARM", {"l2_size": "256kB", "include_l3_cache": "True"}),
+    ]),
+    ("test2", [
+        ("ARM", "ARM", {}),
+        ("X86", "X86", {}),
+    ]),
+    ("test3", [
+        ("L1_16kB",  "ARM", {"l1i_size": "4kB",  "l1d_size": "16kB",  "l2_size": "256kB"}),
+        ("L1_32kB",  "ARM", {"l1i_size": "8kB",  "l1d_size": "32kB",  "l2_size": "256kB"}),
+        ("L1_64kB",  "ARM", {"l1i_size": "16kB", "l1d_size": "64kB",  "l2_size": "256kB"}),
+        ("L1_128kB", "ARM", {"l1i_size": "32kB", "l1d_size": "128kB", "l2_size": "256kB"}),
+        ("L2_64kB",  "ARM", {"l1i_size": "16kB", "l1d_size": "32kB",  "l2_size": "64kB"}),
+        ("L2_128kB", "ARM", {"l1i_size": "16kB", "l1d_size": "32kB",  "l2_size": "128kB"}),
+        ("L2_256kB", "ARM", {"l1i_size": "16kB", "l1d_size": "32kB",  "l2_size": "256kB"}),
+        ("L2_512kB", "ARM", {"l1i_size": "16kB", "l1d_size": "32kB",  "l2_size": "512kB"}),
+    ]),
+    ("test4", [
+        ("MinorCPU", "ARM", {"cpu_type": "MinorCPU"}),
+        ("03CPU",    "ARM", {"cpu_type": "O3CPU"}),
+    ]),
+    # test 5 is currently unimplemented
+    ("test5", []),
+    ("test6", [
+        ("L1i_assoc_1",  "ARM", {"l1i_assoc": "1", "l1d_assoc": "4"}),
+        ("L1i_assoc_2",  "ARM", {"l1i_assoc": "2", "l1d_assoc": "4"}),
+        ("L1i_assoc_4",  "ARM", {"l1i_assoc": "4", "l1d_assoc": "4"}),
+        ("L1i_assoc_8",  "ARM", {"l1i_assoc": "8", "l1d_assoc": "4"}),
+        ("L1d_assoc_2",  "ARM", {"l1i_assoc": "2", "l1d_assoc": "2"}),
+        ("L1d_assoc_4",  "ARM", {"l1i_assoc": "2", "l1d_assoc": "4"}),
+        ("L1d_assoc_8",  "ARM", {"l1i_assoc": "2", "l1d_assoc": "8"}),
+        ("L1d_assoc_16", "ARM", {"l1i_assoc": "2", "l1d_assoc": "16"}),
+        ("L2_assoc_4",   "ARM", {"l2_assoc": "4"}),
+        ("L2_assoc_8",   "ARM", {"l2_assoc": "8"}),
+        ("L2_assoc_16",  "ARM", {"l2_assoc": "16"}),
+        ("L2_assoc_32",  "ARM", {"l2_assoc": "32"}),
+    ]),
+    ("test7", [
+        ("1_core",  "ARM", {"num_cores": "1", "binary_args": "1", "include_l3_cache": "True"}),
+        ("2_cores", "ARM", {"num_cores": "2", "binary_args": "2", "include_l3_cache": "True"}),
+        ("4_cores", "ARM", {"num_cores": "4", "binary_args": "4", "include_l3_cache": "True"}),
+    ]),
+    # working sets from inside the L1 to well past the L3
+    ("test8", [
+        ("chase_16kB",    "ARM", {"workload": "pointer_chase", "binary_args": "16",      "include_l3_cache": "True"}),
+        ("chase_128kB",   "ARM", {"workload": "pointer_chase", "binary_args": "128",     "include_l3_cache": "True"}),
+        ("chase_512kB",   "ARM", {"workload": "pointer_chase", "binary_args": "512",     "include_l3_cache": "True"}),
+        ("chase_4MB",     "ARM", {"workload": "pointer_chase", "binary_args": "4096",    "include_l3_cache": "True"}),
+        ("stream_32kB",   "ARM", {"workload": "stream",        "binary_args": "32",      "include_l3_cache": "True"}),
+        ("stream_512kB",  "ARM", {"workload": "stream",        "binary_args": "512",     "include_l3_cache": "True"}),
+        ("stream_4MB",    "ARM", {"workload": "stream",        "binary_args": "4096 1",  "include_l3_cache": "True"}),
+        ("random_128kB",  "ARM", {"workload": "random_access", "binary_args": "128",     "include_l3_cache": "True"}),
+        ("random_4MB",    "ARM", {"workload": "random_access", "binary_args": "4096",    "include_l3_cache": "True"}),
+        ("matmul_naive",  "ARM", {"workload": "matmul",        "binary_args": "128 0",   "include_l3_cache": "True"}),
+        ("matmul_block",  "ARM", {"workload": "matmul",        "binary_args": "128 32",  "include_l3_cache": "True"}),
+        ("branch_random", "ARM", {"workload": "branch",        "binary_args": "64 4 0",  "include_l3_cache": "True"}),
+        ("branch_sorted", "ARM", {"workload": "branch",        "binary_args": "64 4 1",  "include_l3_cache": "True"}),
+    ]),
+    # prefetchers on a streaming and a pointer chasing working set past the L2
+    ("test9", [
+        ("stream_none",        "ARM", {"workload": "stream",        "binary_args": "1024 1"}),
+        ("stream_stride",      "ARM", {"workload": "stream",        "binary_args": "1024 1", "l1d_prefetcher": "stride", "l2_prefetcher": "stride"}),
+        ("stream_tagged",      "ARM", {"workload": "stream",        "binary_args": "1024 1", "l1d_prefetcher": "tagged", "l2_prefetcher": "tagged"}),
+        ("stream_best_offset", "ARM", {"workload": "stream",        "binary_args": "1024 1", "l2_prefetcher": "best_offset"}),
+        ("chase_none",         "ARM", {"workload": "pointer_chase", "binary_args": "1024"}),
+        ("chase_stride",       "ARM", {"workload": "pointer_chase", "binary_args": "1024",   "l1d_prefetcher": "stride", "l2_prefetcher": "stride"}),
+    ]),
+    # replacement and inclusion policies on a random working set between the
+    # L2 and the L3 size
+    ("test10", [
+        ("lru",       "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l2_repl": "lru",       "l3_repl": "lru"}),
+        ("random",    "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l2_repl": "random",    "l3_repl": "random"}),
+        ("bip",       "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l2_repl": "bip",       "l3_repl": "bip"}),
+        ("brrip",     "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l2_repl": "brrip",     "l3_repl": "brrip"}),
+        ("tree_plru", "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l2_repl": "tree_plru", "l3_repl": "tree_plru"}),
+        ("exclusive", "ARM", {"workload": "random_access", "binary_args": "768", "include_l3_cache": "True", "l3_inclusion": "exclusive"}),
+    ]),
+    # DRAM technologies and channels behind a small and a large L2 cache,
+    # streaming a working set past both
+    ("test11", [
+        ("ddr3_l2_128kB",     "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "128kB", "mem_type": "ddr3_1600"}),
+        ("ddr4_l2_128kB",     "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "128kB", "mem_type": "ddr4_2400"}),
+        ("ddr4_2ch_l2_128kB", "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "128kB", "mem_type": "ddr4_2400", "mem_channels": "2"}),
+        ("lpddr5_l2_128kB",   "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "128kB", "mem_type": "lpddr5_6400"}),
+        ("hbm_l2_128kB",      "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "128kB", "mem_type": "hbm_1000"}),
+        ("ddr3_l2_1MB",       "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "1MB",   "mem_type": "ddr3_1600"}),
+        ("ddr4_l2_1MB",       "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "1MB",   "mem_type": "ddr4_2400"}),
+        ("lpddr5_l2_1MB",     "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "1MB",   "mem_type": "lpddr5_6400"}),
+        ("hbm_l2_1MB",        "ARM", {"workload": "stream", "binary_args": "2048 1", "l2_size": "1MB",   "mem_type": "hbm_1000"}),
+    ]),
+    # core operating points and the utilization governor on a compute bound
+    # and a memory bound workload, and power gating of idle cores
+    ("test12", [
+        ("matmul_2GHz",       "ARM", {"workload": "matmul",        "binary_args": "128 32", "cpu_opp": "0"}),
+        ("matmul_1GHz",       "ARM", {"workload": "matmul",        "binary_args": "128 32", "cpu_opp": "2", "dvfs_governor": "utilization"}),
+        ("matmul_500MHz",     "ARM", {"workload": "matmul",        "binary_args": "128 32", "cpu_opp": "4"}),
+        ("chase_2GHz",        "ARM", {"workload": "pointer_chase", "binary_args": "4096",   "cpu_opp": "0"}),
+        ("chase_1GHz",        "ARM", {"workload": "pointer_chase", "binary_args": "4096",   "cpu_opp": "2", "dvfs_governor": "utilization"}),
+        ("chase_500MHz",      "ARM", {"workload": "pointer_chase", "binary_args": "4096",   "cpu_opp": "4"}),
+        ("idle_clk_gated",    "ARM", {"num_cores": "4", "binary_args": "2", "include_l3_cache": "True"}),
+        ("idle_power_gated",  "ARM", {"num_cores": "4", "binary_args": "2", "include_l3_cache": "True", "power_gating_on_idle": "True"}),
+    ]),
+]
+
+# options the host cost of the sweep is broken down by
+HOST_COST_OPTIONS = ("cpu_type", "include_l3_cache", "num_cores", "workload")
+
+# job states recorded in the status file
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# --------------------------------------------------------------------------
+# Sweep Job Class
+# --------------------------------------------------------------------------
+class SweepJob:
+    """A single gem5 run of the sweep.
+    """
+
+    def __init__(self, test, suffix, isa, options, project_dir, gem5_dir):
+
+        self.test = test
+        self.suffix = suffix
+        self.isa = isa
+        self.options = options
+        self.name = "{}/{}".format(test, suffix)
+
+        self.gem5_dir = gem5_dir
+        self.project_dir = project_dir
+        self.test_dir = os.path.join(project_dir, test)
+
+        # every run writes its stats to its own output directory
+        self.outdir = os.path.join(self.test_dir, "m5out_{}".format(suffix))
+        self.log_filename = os.path.join(self.outdir, "gem5.log")
+
+    # arguments passed to system.py
+    def SystemArgs(self):
+
+        workload = self.options.get("workload", "stress_test")
+        args = [
+            "--binary={}".format(os.path.join(self.project_dir, "{}_{}".format(workload, self.isa))),
+            "--csv_file_suffix={}".format(self.suffix),
+            "--csv_save_dir={}".format(self.test_dir),
+        ]
+        for option, value in sorted(self.options.items()):
+            if option != "workload":
+                args.append("--{}={}".format(option, value))
+
+        return args
+
+    # full option set system.py resolves for this job, defaults included
+    def ResolvedOptions(self):
+
+        parser, parameters = CreateOptionParser()
+        return parser.parse_args(self.SystemArgs())
+
+    # gem5 binary built for the job's ISA
+    def Gem5Binary(self):
+
+        return os.path.join(self.gem5_dir, "build", self.isa, "gem5.opt")
+
+    # full gem5 command line
+    def Command(self):
+
+        return [
+            self.Gem5Binary(),
+            "--outdir={}".format(self.outdir),
+            os.path.join(self.project_dir, "system.py"),
+        ] + self.SystemArgs()
+
+    # runs gem5 and returns its exit code
+    def Run(self):
+
+        os.makedirs(self.outdir, exist_ok = True)
+
+        with open(self.log_filename, "w") as log_file:
+            return subprocess.call(
+                self.Command(),
+                cwd = self.gem5_dir,
+                stdout = log_file,
+                stderr = subprocess.STDOUT
+            )
+
+# --------------------------------------------------------------------------
+# Sweep Status Class
+# --------------------------------------------------------------------------
+class SweepStatus:
+    """Tracks the state of every job in a JSON file that survives between
+    invocations of the sweep.
+    """
+
+    def __init__(self, status_filename):
+
+        self.status_filename = status_filename
+        self.lock = threading.Lock()
+
+        self.jobs = {}
+        if os.path.exists(status_filename):
+            with open(status_filename, "r") as status_file:
+                self.jobs = json.load(status_file)
+
+    # returns the recorded state of a job
+    def Get(self, job):
+
+        return self.jobs.get(job.name, {}).get("status", PENDING)
+
+    # records new fields for a job and saves the status file
+    def Update(self, job, **fields):
+
+        with self.lock:
+            self.jobs.setdefault(job.name, {}).update(fields)
+
+            # write to a temporary file first so an interrupted sweep never
+            # leaves a truncated status file behind
+            temp_filename = self.status_filename + ".tmp"
+            with open(temp_filename, "w") as status_file:
+                json.dump(self.jobs, status_file, indent = 4, sort_keys = True)
+            os.replace(temp_filename, self.status_filename)
+
+# --------------------------------------------------------------------------
+# Worker Count
+# --------------------------------------------------------------------------
+def AvailableMemory():
+    """Returns the memory available for new processes in bytes.
+    """
+
+    try:
+        with open("/proc/meminfo", "r") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES")
+
+def WorkerCount(job_memory):
+    """Sizes the process pool to the number of cores and to how many jobs of
+    job_memory bytes fit in the available memory.
+    """
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    return max(1, min(cores, AvailableMemory() // job_memory))
+
+# --------------------------------------------------------------------------
+# Create Jobs
+# --------------------------------------------------------------------------
+def CreateJobs(tests, project_dir, gem5_dir):
+    """Creates the jobs of the selected tests.
+    """
+
+    jobs = []
+    for test, runs in TESTS:
+        if tests and test not in tests:
+            continue
+        for suffix, isa, options in runs:
+            jobs.append(SweepJob(test, suffix, isa, options, project_dir, gem5_dir))
+
+    return jobs
+
+# --------------------------------------------------------------------------
+# Create Checkpoint Jobs
+# --------------------------------------------------------------------------
+# options that decide the state a checkpoint holds: the process and its
+# arguments, the SimObjects of the cores and the memory system, and the
+# operating points, which gem5 restores from the checkpoint. A job restores
+# from a checkpoint taken with the same values.
+CHECKPOINT_OPTIONS = (
+    "binary_args",
+    "num_cores",
+    "include_l3_cache",
+    "mem_type",
+    "mem_channels",
+    "cpu_opp",
+    "cache_opp",
+)
+
+def CreateCheckpointJobs(jobs, checkpoint_at, warmup_insts, project_dir, gem5_dir):
+    """Creates one job per ISA, workload and system shape that fast-forwards
+    to checkpoint_at and writes a checkpoint, and points the given jobs at
+    the checkpoint taken with their shape so the shared prefix is simulated
+    once per sweep.
+    """
+
+    checkpoint_jobs = {}
+    for job in jobs:
+        workload = job.options.get("workload", "stress_test")
+        resolved = vars(job.ResolvedOptions())
+        shape = dict((option, resolved[option]) for option in CHECKPOINT_OPTIONS)
+        key = json.dumps([job.isa, workload, shape], sort_keys = True, default = str)
+
+        if key not in checkpoint_jobs:
+            suffix = "{}_{}_{}_{}".format(
+                job.isa, workload, checkpoint_at, hashlib.sha256(key.encode()).hexdigest()[:8]
+            )
+            checkpoint_dir = os.path.join(project_dir, "checkpoints", "cpt_{}".format(suffix))
+            checkpoint_options = dict(
+                (option, value) for option, value in job.options.items()
+                if option == "workload" or option in CHECKPOINT_OPTIONS
+            )
+            checkpoint_options.update(take_checkpoint = checkpoint_dir, checkpoint_at = checkpoint_at)
+            checkpoint_jobs[key] = SweepJob(
+                "checkpoints", suffix, job.isa, checkpoint_options, project_dir, gem5_dir
+            )
+
+        checkpoint_job = checkpoint_jobs[key]
+        job.options = dict(
+            job.options,
+            restore_checkpoint = checkpoint_job.options["take_checkpoint"],
+            warmup_insts = warmup_insts
+        )
+
+    return list(checkpoint_jobs.values())
+
+# --------------------------------------------------------------------------
+# Run Sweep
+# --------------------------------------------------------------------------
+def RunJob(job, status, retries, cache):
+    """Runs a job, retrying it up to retries times when gem5 fails. When a
+    cache is given, a job whose configuration was already simulated restores
+    the stored results instead of running gem5.
+    """
+
+    if cache is None:
+        return RunJobUncached(job, status, retries)
+
+    try:
+        key = cache.Key(job.ResolvedOptions(), job.Gem5Binary(), job.project_dir)
+    except OSError as error:
+        print("{} is not cached: {}".format(job.name, error))
+        return RunJobUncached(job, status, retries)
+
+    with cache.KeyLock(key):
+        if cache.Restore(key, job.outdir, job.test_dir, job.suffix):
+            status.Update(job, status = DONE, returncode = 0, cached = True, log = job.log_filename)
+            return 0
+
+        returncode = RunJobUncached(job, status, retries)
+        if returncode == 0:
+            cache.Store(key, job.outdir, job.suffix)
+
+    return returncode
+
+def RunJobUncached(job, status, retries):
+    """Runs a job with gem5, retrying it up to retries times when gem5 fails.
+    """
+
+    for attempt in range(retries + 1):
+        status.Update(job, status = RUNNING, cached = False, log = job.log_filename)
+
+        start = time.time()
+        returncode = job.Run()
+
+        status.Update(
+            job,
+            status = DONE if returncode == 0 else FAILED,
+            returncode = returncode,
+            attempts = status.jobs[job.name].get("attempts", 0) + 1,
+            duration = time.time() - start
+        )
+
+        if returncode == 0:
+            break
+
+    return returncode
+
+def RunSweep(jobs, status, workers, retries, cache, results_db = None):
+    """Runs the jobs on a pool of workers and returns the failed jobs. When
+    a results database is given, every completed job is ingested into it.
+    """
+
+    failed = []
+
+    # each worker thread waits on one gem5 process, so the pool bounds the
+    # number of simulations running at once
+    with ThreadPoolExecutor(max_workers = workers) as executor:
+        futures = {executor.submit(RunJob, job, status, retries, cache): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            returncode = future.result()
+            if returncode == 0:
+                cached = status.jobs[job.name].get("cached")
+                print("{} complete{}".format(job.name, " (cached)" if cached else ""))
+                if results_db is not None:
+                    IngestJob(job, results_db)
+            else:
+                print("{} failed with exit code {}, see {}".format(job.name, returncode, job.log_filename))
+                failed.append(job)
+
+    return failed
+
+def IngestJob(job, results_db):
+    """Ingests a completed job into the results database. Runs without a
+    run manifest, such as checkpoint jobs, are left out.
+    """
+
+    try:
+        results_db.IngestRun(job.outdir)
+    except (OSError, KeyError, ValueError) as error:
+        print("{} was not ingested: {}".format(job.name, error))
+
+# --------------------------------------------------------------------------
+# Host Cost Report
+# --------------------------------------------------------------------------
+def HostCostReport(jobs, status, report_filename):
+    """Collects the host cost every completed job recorded in its run.json
+    into one .csv file and prints the total and mean wall time of the jobs
+    for every value of HOST_COST_OPTIONS. A job restored from the result
+    cache reports the cost of the run that filled the cache.
+    """
+
+    rows = []
+    for job in jobs:
+        try:
+            with open(os.path.join(job.outdir, "run.json"), "r") as run_file:
+                host = json.load(run_file).get("host")
+        except (OSError, ValueError):
+            continue
+        if not host:
+            continue
+
+        options = vars(job.ResolvedOptions())
+        row = {
+            "job": job.name,
+            "cached": bool(status.jobs.get(job.name, {}).get("cached")),
+            "workload": job.options.get("workload", "stress_test"),
+        }
+        for option in HOST_COST_OPTIONS:
+            row.setdefault(option, options.get(option))
+        row.update(host)
+        rows.append(row)
+
+    if not rows:
+        return
+
+    columns = ["job", "cached"] + list(HOST_COST_OPTIONS) + sorted(set(
+        column for row in rows for column in row
+        if column not in HOST_COST_OPTIONS and column not in ("job", "cached")
+    ))
+    with open(report_filename, "w") as report_file:
+        report_file.write(", ".join(columns) + "\n")
+        for row in rows:
+            report_file.write(", ".join(str(row.get(column, "")) for column in columns) + "\n")
+
+    print("")
+    print("Host cost of {} jobs, written to {}".format(len(rows), report_filename))
+    print("{:<18} {:<16} {:>5} {:>14} {:>14} {:>16}".format(
+        "Option", "Value", "Jobs", "Total (s)", "Mean (s)", "Mean inst/s"
+    ))
+    for option in HOST_COST_OPTIONS:
+        groups = {}
+        for row in rows:
+            groups.setdefault(str(row[option]), []).append(row)
+        for value, group in sorted(groups.items()):
+            wall_time = sum(row.get("wall_time", 0.0) for row in group)
+            inst_rate = sum(row.get("host_inst_rate", 0.0) for row in group) / len(group)
+            print("{:<18} {:<16} {:>5} {:>14.1f} {:>14.1f} {:>16.0f}".format(
+                option, value, len(group), wall_time, wall_time / len(group), inst_rate
+            ))
+
+# --------------------------------------------------------------------------
+# Main
+# --------------------------------------------------------------------------
+def main():
+
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(
+        description = 'Runs the power modeling tests in parallel.'
+    )
+    parser.add_argument(
+        'tests',
+        nargs = '*',
+        help = 'Tests to run, for example test1 test3. Default: all tests.'
+    )
+    parser.add_argument(
+        '--gem5_dir',
+        default = os.path.normpath(os.path.join(project_dir, '..', '..')),
+        help = 'Location of the gem5 directory. Default: two levels above this script.'
+    )
+    parser.add_argument(
+        '--jobs',
+        default = 0,
+        type = int,
+        help = 'Number of simulations to run at once. Default: sized to the available cores and memory.'
+    )
+    parser.add_argument(
+        '--job_memory',
+        default = 2.0,
+        type = float,
+        help = 'Host memory reserved for each simulation in GB. Default: 2.'
+    )
+    parser.add_argument(
+        '--retries',
+        default = 0,
+        type = int,
+        help = 'Number of times a failed job is retried within this sweep. Default: 0.'
+    )
+    parser.add_argument(
+        '--status_file',
+        default = os.path.join(project_dir, 'sweep_status.json'),
+        help = 'JSON file recording the state of every job. Default: sweep_status.json in the project directory.'
+    )
+    parser.add_argument(
+        '--rerun',
+        action = 'store_true',
+        help = 'Rerun jobs that already completed instead of skipping them.'
+    )
+    parser.add_argument(
+        '--cache_dir',
+        default = os.path.join(project_dir, 'result_cache'),
+        help = 'Directory of the result cache. Default: result_cache in the project directory.'
+    )
+    parser.add_argument(
+        '--cache_size',
+        default = 20.0,
+        type = float,
+        help = 'Size of the result cache in GB before old entries are evicted. Default: 20.'
+    )
+    parser.add_argument(
+        '--no_cache',
+        action = 'store_true',
+        help = 'Always run gem5, neither using nor filling the result cache.'
+    )
+    parser.add_argument(
+        '--checkpoint_at',
+        default = '',
+        help = 'Fast-forward each ISA, workload and system shape once to this instruction count, or to the workload\'s roi marker, and restore every job from the checkpoint of its shape.'
+    )
+    parser.add_argument(
+        '--warmup_insts',
+        default = 0,
+        type = int,
+        help = 'Instructions each restored job simulates to warm up the caches before measuring. Default: 0.'
+    )
+    parser.add_argument(
+        '--results_db',
+        default = '',
+        help = 'SQLite database every completed job is ingested into, see results_db.py. Default: disabled.'
+    )
+    parser.add_argument(
+        '--host_report',
+        default = os.path.join(project_dir, 'sweep_host_performance.csv'),
+        help = '.csv file collecting the host cost of every job of the selected tests. Default: sweep_host_performance.csv in the project directory.'
+    )
+    parser.add_argument(
+        '--dry_run',
+        action = 'store_true',
+        help = 'Print the gem5 commands without running them.'
+    )
+    args = parser.parse_args()
+
+    jobs = CreateJobs(args.tests, project_dir, args.gem5_dir)
+    status = SweepStatus(args.status_file)
+
+    # the host cost report also covers the jobs completed by earlier sweeps
+    selected_jobs = list(jobs)
+
+    checkpoint_jobs = []
+    if args.checkpoint_at:
+        checkpoint_jobs = CreateCheckpointJobs(jobs, args.checkpoint_at, args.warmup_insts, project_dir, args.gem5_dir)
+
+    # completed jobs are skipped so a rerun only retries failed jobs
+    if not args.rerun:
+        checkpoint_jobs = [job for job in checkpoint_jobs if status.Get(job) != DONE]
+        jobs = [job for job in jobs if status.Get(job) != DONE]
+
+    if args.dry_run:
+        for job in checkpoint_jobs + jobs:
+            print(" ".join(job.Command()))
+        return 0
+
+    workers = args.jobs or WorkerCount(int(args.job_memory * 1024**3))
+
+    # the checkpoints are taken before any job restores from them
+    if checkpoint_jobs:
+        print("Taking {} checkpoints on {} workers".format(len(checkpoint_jobs), workers))
+        failed = RunSweep(checkpoint_jobs, status, workers, args.retries, None)
+        if failed:
+            print("Rerun this script to retry the failed checkpoints")
+            return 1
+
+    print("Running {} jobs on {} workers".format(len(jobs), workers))
+
+    for job in jobs:
+        status.Update(job, status = PENDING)
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir, int(args.cache_size * 1024**3))
+
+    results_db = None
+    if args.results_db:
+        results_db = ResultsDatabase(args.results_db)
+
+    failed = RunSweep(jobs, status, workers, args.retries, cache, results_db)
+
+    if results_db is not None:
+        results_db.Close()
+
+    HostCostReport(selected_jobs, status, args.host_report)
+
+    print("")
+    print("{} of {} jobs complete".format(len(jobs) - len(failed), len(jobs)))
+    if failed:
+        print("Rerun this script to retry the failed jobs")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
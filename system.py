@@ -5,172 +5,80 @@ import m5
 from m5.objects import *
 
 from caches import *
+from dvfs import *
+from memory import *
 from power import *
 from processor import *
 
-import argparse
+import json
+import os
+import resource
+import sys
+import time
 
 from data_extraction import *
+from system_options import *
+
+# host time at which each phase of the run ended, to record its cost
+host_times = [('start', time.time())]
 
 # --------------------------------------------------------------------------
 # Add Options
 # --------------------------------------------------------------------------
-# create parser object
-parser = argparse.ArgumentParser(
-    description = 'A simple system with 2-level cache.'
-)
+# create parser object and the list of CPU parameters for data extraction
+# purposes
+parser, parameters = CreateOptionParser()
 
-# create empty list of CPU parameters for data extraction purposes
-parameters = [[], []]
+# create options object
+options = parser.parse_args()
 
-# add an argument for selecting the binary file.
-parser.add_argument(
-    '--binary',
-    default = '', 
-    nargs = '?', 
-    type = str, 
-    help = 'Path to the binary to execute.'
-)
+# place options in the parameter list
+SetParameterValues(parameters, options)
 
-# add an argument for naming the .csv files
-parser.add_argument(
-    '--csv_file_suffix',
-    default = '',
-    type = str,
-    help = 'String that is appended to the end of the .csv file names.'
-)
+# the CPU knobs must belong to the selected CPU type
+ValidateCpuKnobs(parser, options)
 
-# add an argument for a directory save loaction for the CSV files
-parser.add_argument(
-    '--csv_save_dir',
-    default = '',
-    type = str,
-    help = 'Location to save the CSV files containing the extracted data.'
-)
+# the memory channels interleave the address range on address bits
+if options.mem_channels < 1 or options.mem_channels & (options.mem_channels - 1):
+    parser.error('--mem_channels must be a power of two')
 
-# add arguments for selecting cache sizes
-parameters[0].append("L1 Instruction Cache Size")
-parser.add_argument(
-    '--l1i_size', 
-    default = '16kB',
-    help = 'L1 instruction cache size. Default: 16kB.'
-)
-parameters[0].append("L1 Data Cache Size")
-parser.add_argument(
-    '--l1d_size',
-    default = '64kB',
-    help = 'L1 data cache size. Default: 64kB.'
-)
-parameters[0].append("L2 Cache Size")
-parser.add_argument(
-    '--l2_size',
-    default = '256kB',
-    help = 'L2 cache size. Default: 256kB.'
-)
-parameters[0].append("L3 Cache Size")
-parser.add_argument(
-    '--l3_size',
-    default = '1MB',
-    help = 'L3 cache size. Default: 1MB.'
-)
-
-# add arguments for selecting cache associativity
-parameters[0].append("L1 Instruction Cache Associativity")
-parser.add_argument(
-    '--l1i_assoc',
-    default = 2,
-    help = 'L1 data cache associativity. Default: 2.'
-)
-parameters[0].append("L1 Data Cache Associativity")
-parser.add_argument(
-    '--l1d_assoc',
-    default = 2,
-    help = 'L1 instruction cache associativity. Default: 2.'
-)
-parameters[0].append("L2 Cache Associativity")
-parser.add_argument(
-    '--l2_assoc',
-    default = 8,
-    help = 'L2 cache associativity. Default: 8.'
-)
-parameters[0].append("L3 Cache Associativity")
-parser.add_argument(
-    '--l3_assoc',
-    default = 64,
-    help = 'L3 cache associativity. Default: 64.'
-)
+# taking a checkpoint fast-forwards with the atomic CPU
+if options.take_checkpoint:
+    if not options.checkpoint_at:
+        parser.error('--take_checkpoint requires --checkpoint_at')
+    options.cpu_type = 'AtomicSimpleCPU'
 
-# add arguments for selecting cache data latencies
-parameters[0].append("L1 Instruction Cache Data Latency")
-parser.add_argument(
-    '--l1i_data_latency', 
-    default = 2,
-    help = 'L1 instruction cache data latency. Default: 2'
-)
+# profiling and taking the simpoint checkpoints also run on the atomic CPU
+if options.simpoint_profile or options.take_simpoint_checkpoints:
+    options.cpu_type = 'AtomicSimpleCPU'
 
-# add argument for selecting the CPU type
-parameters[0].append("CPU Type")
-parser.add_argument(
-    '--cpu_type',
-    default = 'MinorCPU',
-    help = 'Selects the processor type.'
-)
+# convergence is checked on the dumps parsed while simulating
+if options.converge:
+    options.live_extraction = True
 
-# add arguments for configuring the CPU
-parser.add_argument(
-    '--thread_policy', 
-    help = 'Thread scheduling policy for the MinorCPU.'
-)
-parser.add_argument(
-    '--decode_input_buffer_size', 
-    help = 'Size of input buffer to decode in cycle-worth of instructions.'
-)
-parser.add_argument(
-    '--fetch1_to_fetch2_forward_delay', 
-    help = 'Forward cycle delay from Fetch1 to Fetch2.'
-)
+# the region of interest is fast-forwarded to from the start of the workload
+if options.roi and (options.take_checkpoint or options.restore_checkpoint or options.simpoint_profile
+                    or options.take_simpoint_checkpoints or options.restore_simpoint >= 0):
+    parser.error('--roi cannot be combined with checkpoints or simpoints')
 
-# add argument for including L3 Cache.
-parser.add_argument(
-    '--include_l3_cache',
-    default = False,
-    help = 'Determines whether the L3 cache should be included on not. Options: True | False. Default: False.'
-)
+# the simpoint helpers need NumPy, only import them when they are used
+if options.take_simpoint_checkpoints or options.restore_simpoint >= 0:
+    from simpoint import LoadSimPoints, SimPointStarts, SimPointCheckpointName, FindSimPointCheckpoint
 
-# add arguments for selecting the pwer modeling equations for the CPU and
-# L2 and L3 caches.
-parser.add_argument(
-    '--cpu_pwr_eq',
-    default = 0,
-    help = 'Selects the equation to use for modeling the processor\'s power consumption. Input is a positive integer.'
-)
-parser.add_argument(
-    '--l2_pwr_eq',
-    default = 0,
-    help = 'Selects the equation to use for modeling the L2 cache\'s power consumption. Input is a positive integer.'
-)
-parser.add_argument(
-    '--l3_pwr_eq',
-    default = 0,
-    help = 'Selects the equation to use for modeling the L3 cache\'s power consumption. Input is a positive integer.'
-)
+# a simpoint is restored from its checkpoint and warmed up for as long as
+# its checkpoint name records
+if options.restore_simpoint >= 0:
+    simpoint_checkpoint = FindSimPointCheckpoint(options.simpoint_checkpoint_dir, options.restore_simpoint)
+    options.restore_checkpoint = simpoint_checkpoint['path']
+    options.warmup_insts = simpoint_checkpoint['warmup']
 
-# create options object
-options = parser.parse_args()
+# the raw stats store needs NumPy, only import it when it is used
+if options.save_raw_stats:
+    from power_eval import AddPowerInputs, SaveRawStats
 
-# place options in the parameter list
-parameters[1] = [
-    options.l1i_size,
-    options.l1d_size,
-    options.l2_size,
-    options.l3_size,
-    options.l1i_assoc,
-    options.l1d_assoc,
-    options.l2_assoc,
-    options.l3_assoc,
-    options.l1i_data_latency,
-    options.cpu_type
-]
+# the stats filter replaces part of m5.stats, only import it when it is used
+if options.stats_filter:
+    from stats_filter import StatsFilter, InstallStatsFilter
 
 # --------------------------------------------------------------------------
 # Create Architecture
@@ -183,11 +91,37 @@ system.clk_domain = SrcClockDomain()
 system.clk_domain.clock = '1GHz'
 system.clk_domain.voltage_domain = VoltageDomain(voltage = '1.0V')
 
+# create the clock domains of the cores and of the cache hierarchy, each
+# with a voltage domain of its own, registered with the DVFS handler. Both
+# can run at any of the operating points and start at the one selected.
+# The memory system stays on the system clock domain.
+opp_clocks = ['{:g}MHz'.format(frequency / 1.0E6) for frequency, voltage in OPERATING_POINTS]
+opp_voltages = ['{}V'.format(voltage) for frequency, voltage in OPERATING_POINTS]
+system.cpu_clk_domain = SrcClockDomain(
+    clock = opp_clocks,
+    voltage_domain = VoltageDomain(voltage = opp_voltages),
+    domain_id = 0,
+    init_perf_level = options.cpu_opp
+)
+system.cache_clk_domain = SrcClockDomain(
+    clock = opp_clocks,
+    voltage_domain = VoltageDomain(voltage = opp_voltages),
+    domain_id = 1,
+    init_perf_level = options.cache_opp
+)
+system.dvfs_handler.domains = [system.cpu_clk_domain, system.cache_clk_domain]
+system.dvfs_handler.enable = True
+
 # create the processor
 system.processor = Processor(options)
-
-# set up the memory
-system.mem_mode = 'timing'
+system.processor.setClockDomains(system.cpu_clk_domain, system.cache_clk_domain)
+
+# set up the memory. The fast-forward to the region of interest runs on the
+# atomic CPU, switching the CPUs changes the memory mode.
+if options.cpu_type == 'AtomicSimpleCPU' or options.roi:
+    system.mem_mode = 'atomic'
+else:
+    system.mem_mode = 'timing'
 system.mem_ranges = [AddrRange('8GB')]
 
 # create the memory bus
@@ -204,27 +138,53 @@ if m5.defines.buildEnv['TARGET_ISA'] == 'x86':
 # connect the system to the memory bus
 system.system_port = system.membus.cpu_side_ports
 
-# create a memory controller and add it to the memory bus
-system.mem_ctrl = MemCtrl()
-system.mem_ctrl.dram = DDR3_1600_8x8()
-system.mem_ctrl.dram.range = system.mem_ranges[0]
-system.mem_ctrl.port = system.membus.mem_side_ports
+# create a memory controller per memory channel and add them to the memory
+# bus. A single channel keeps the plain name, like a single core.
+system.mem_ctrl = CreateMemCtrls(options, system.mem_ranges[0], system.cache_line_size.value)
+for mem_ctrl in system.mem_ctrl:
+    mem_ctrl.port = system.membus.mem_side_ports
 
 # ---------------------------------------------------------------------------------
 # Add Power Modeling
 # ---------------------------------------------------------------------------------
-# adding power modeling for the CPU
-system.processor.cpu.power_state.default_state = 'ON'
-system.processor.cpu.power_model = CpuPowerModel('system.processor.cpu', options)
-
-# add power modeling for the L2 Cache
-system.processor.l2cache.power_state.default_state = "ON"
-system.processor.l2cache.power_model = L2PowerModel('system.processor.l2cache', options)
+# components with a power model, their paths, the stat holding the voltage
+# of the clock domain their power model sees and the prefetchers charged to
+# them. Every core has its own CPU and L2 power models, named after the
+# core's SimObjects.
+cpu_voltage_stat = 'system.cpu_clk_domain.voltage_domain.voltage'
+cache_voltage_stat = 'system.cache_clk_domain.voltage_domain.voltage'
+core_indexes = CoreIndexes(options.num_cores)
+power_components = {}
+for index in core_indexes:
+    power_components['cpu' + index] = {'path': 'system.processor.cpu' + index, 'voltage': cpu_voltage_stat}
+    power_components['l2_cache' + index] = {'path': 'system.processor.l2cache' + index, 'voltage': cache_voltage_stat}
+if options.include_l3_cache:
+    power_components['l3_cache'] = {'path': 'system.processor.l3cache', 'voltage': cache_voltage_stat}
+for component, component_info in power_components.items():
+    component_info['prefetchers'] = PrefetcherPaths(component.rstrip('0123456789'), component_info['path'], vars(options))
+
+# the DRAM has no power model, its power is extracted from the energy
+# DRAMPower reports for every rank of every channel
+dram_components = {
+    'dram': {
+        'paths': ['system.mem_ctrl' + index for index in CoreIndexes(options.mem_channels)],
+        'ranks': DramRanks(system.mem_ctrl[0]),
+    }
+}
+
+for i, index in enumerate(core_indexes):
+    # adding power modeling for the CPU
+    system.processor.cpu[i].power_state.default_state = 'ON'
+    system.processor.cpu[i].power_model = CpuPowerModel(power_components['cpu' + index]['path'], options)
+
+    # add power modeling for the L2 Cache
+    system.processor.l2cache[i].power_state.default_state = "ON"
+    system.processor.l2cache[i].power_model = L2PowerModel(power_components['l2_cache' + index]['path'], options)
 
 # add power modeling for the L3 Cache
 if options.include_l3_cache:
     system.processor.l3cache.power_state.default_state = "ON"
-    system.processor.l3cache.power_model = L3PowerModel('system.processor.l3cache', options)
+    system.processor.l3cache.power_model = L3PowerModel(power_components['l3_cache']['path'], options)
 
 # ---------------------------------------------------------------------------------
 # Run Binary File
@@ -234,40 +194,363 @@ system.workload = SEWorkload.init_compatible(options.binary)
 
 # create the process, set the process command, then tell the CPU to use the process
 process = Process()
-process.cmd = [options.binary]
+process.cmd = [options.binary] + options.binary_args.split()
 system.processor.addWorkload(process)
 
+# checkpoints, simpoints and warmup count the instructions of the first core
+first_cpu = system.processor.cpu[0]
+
+# stop the fast-forward where the checkpoint is taken
+if options.take_checkpoint:
+    if options.checkpoint_at == 'roi':
+        system.exit_on_work_items = True
+    else:
+        first_cpu.max_insts_any_thread = int(options.checkpoint_at)
+
+# stop at the workload's region of interest markers
+if options.roi:
+    system.exit_on_work_items = True
+
+# collect basic block vectors for the simpoint analysis
+if options.simpoint_profile:
+    first_cpu.addSimPointProbe(options.simpoint_interval)
+
+# stop the fast-forward at every simpoint checkpoint. A checkpoint at the
+# very start of the program is taken before simulating.
+if options.take_simpoint_checkpoints:
+    simpoint_starts = SimPointStarts(
+        LoadSimPoints(options.simpoint_file, options.weight_file),
+        options.simpoint_interval,
+        options.warmup_insts
+    )
+    first_cpu.simpoint_start_insts = [start[1] for start in simpoint_starts if start[1] > 0]
+
 # instantiate the system
 root = Root(full_system = False, system = system)
-m5.instantiate()
+host_times.append(('setup', time.time()))
+if options.restore_checkpoint:
+    m5.instantiate(options.restore_checkpoint)
+else:
+    m5.instantiate()
+host_times.append(('instantiate', time.time()))
+
+# ---------------------------------------------------------------------------------
+# Take Checkpoint
+# ---------------------------------------------------------------------------------
+# exit causes that mark the point where the checkpoint is taken
+checkpoint_causes = (
+    'a thread reached the max instruction count',
+    'workbegin',
+    'checkpoint',
+)
+
+if options.take_checkpoint:
+    print('Fast-forwarding to the checkpoint...')
+    exit_event = m5.simulate()
+    if exit_event.getCause() not in checkpoint_causes:
+        m5.util.fatal('Workload exited before the checkpoint because {}'.format(exit_event.getCause()))
+
+    m5.checkpoint(options.take_checkpoint)
+    print('Checkpoint written to {} @ tick {}'.format(options.take_checkpoint, m5.curTick()))
+    sys.exit(0)
+
+# ---------------------------------------------------------------------------------
+# SimPoint Profiling and Checkpoints
+# ---------------------------------------------------------------------------------
+if options.simpoint_profile:
+    print('Profiling basic block vectors...')
+    exit_event = m5.simulate()
+    print('Basic block vectors written to {} @ tick {} because {}'.format(
+        os.path.join(m5.options.outdir, 'simpoint.bb.gz'), m5.curTick(), exit_event.getCause()
+    ))
+    sys.exit(0)
+
+if options.take_simpoint_checkpoints:
+    for index, start, weight, warmup in simpoint_starts:
+        if start > 0:
+            exit_event = m5.simulate()
+            if exit_event.getCause() != 'simpoint starting point found':
+                m5.util.fatal('Workload exited before simpoint {} because {}'.format(index, exit_event.getCause()))
+
+        checkpoint_name = SimPointCheckpointName(index, start, weight, options.simpoint_interval, warmup)
+        m5.checkpoint(os.path.join(options.simpoint_checkpoint_dir, checkpoint_name))
+        print('Checkpoint for simpoint {} written @ tick {}'.format(index, m5.curTick()))
+    sys.exit(0)
+
+# ---------------------------------------------------------------------------------
+# Region of Interest
+# ---------------------------------------------------------------------------------
+# fast-forward to the work begin marker, switch to the detailed CPU and
+# measure from a clean slate. The run stops at the work end marker.
+roi_begin_tick = None
+if options.roi:
+    print('Fast-forwarding to the region of interest...')
+    exit_event = m5.simulate()
+    if exit_event.getCause() != 'workbegin':
+        m5.util.fatal('Workload exited before the region of interest because {}'.format(exit_event.getCause()))
+
+    switch_pairs = system.processor.switchPairs()
+    if switch_pairs:
+        m5.switchCpus(system, switch_pairs)
+    m5.stats.reset()
+
+    roi_begin_tick = m5.curTick()
+    print('Region of interest begins @ tick {}'.format(roi_begin_tick))
+
+# ---------------------------------------------------------------------------------
+# Warm Up
+# ---------------------------------------------------------------------------------
+# simulate in detail to fill the caches, then measure from a clean slate
+if options.warmup_insts:
+    print('Warming up for {} instructions...'.format(options.warmup_insts))
+    first_cpu.scheduleInstStop(0, options.warmup_insts, 'warmup complete')
+    exit_event = m5.simulate()
+    if exit_event.getCause() != 'warmup complete':
+        m5.util.fatal('Workload exited during the warmup because {}'.format(exit_event.getCause()))
+    m5.stats.reset()
+
+# a restored simpoint is simulated for one interval
+if options.restore_simpoint >= 0:
+    first_cpu.scheduleInstStop(0, simpoint_checkpoint['interval'], 'simpoint complete')
+
+# a shortened simulation stops after max_insts instructions
+if options.max_insts:
+    first_cpu.scheduleInstStop(0, options.max_insts, 'max instructions reached')
+
+# every run writes its stats to its own output directory
+stats_filename = os.path.join(m5.options.outdir, 'stats.txt')
 
 # dump stats periodically
 stats_dump_period = 0.1E-3
 m5.stats.periodicStatDump(m5.ticks.fromSeconds(stats_dump_period))
 
+# create the power data file names of every component with a power model,
+# and of the total of a multi-core system, one per output format
+output_formats = options.output_format.split(',')
+power_data_components = list(power_components) + list(dram_components)
+if options.num_cores > 1:
+    power_data_components.append('total')
+power_filenames = {}
+for component in power_data_components:
+    for output_format in output_formats:
+        power_filenames[component, output_format] = '{}/{}_power_data_{}.{}'.format(
+            options.csv_save_dir, component, options.csv_file_suffix, output_format
+        )
+
+# list of the files written by this run
+output_files = list(power_filenames.values())
+if 'csv' in output_formats:
+    performance_filename = '{}/performance_data_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(performance_filename)
+if options.save_raw_stats:
+    raw_stats_filename = '{}/raw_stats_{}.npz'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(raw_stats_filename)
+if options.restore_simpoint >= 0:
+    simpoint_filename = '{}/simpoint_{}.json'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(simpoint_filename)
+if options.converge:
+    convergence_filename = '{}/convergence_{}.json'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(convergence_filename)
+if options.dvfs_governor != 'none':
+    dvfs_filename = '{}/dvfs_replay_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(dvfs_filename)
+if 'csv' in output_formats:
+    host_filename = '{}/host_performance_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
+    output_files.append(host_filename)
+
+# create the extractor before simulating so its stats are known to the
+# stats filter
+if options.live_extraction:
+    # write the power data as gem5 appends dumps to the stats file
+    statistics = IncrementalDataExtraction(stats_dump_period, stats_filename)
+    if 'csv' in output_formats:
+        for component in power_components:
+            statistics.AddSink(component, PowerCsvSink(parameters, power_filenames[component, 'csv'], stats_dump_period))
+else:
+    # the exiting tick is set once the simulation has finished
+    statistics = DataExtraction(None, stats_dump_period, stats_filename)
+if options.save_raw_stats:
+    AddPowerInputs(statistics, power_components)
+
+# only the dumps of the region of interest are extracted
+if options.roi:
+    statistics.SetRoi(roi_begin_tick)
+
+# the performance statistics of every core and memory channel
+statistics.AddPerformance(options.num_cores, options.mem_channels)
+
+# every core's components and the total power of all of them
+for component, component_info in power_components.items():
+    statistics.AddComponent(component, component_info['path'] + '.power_model.pm0', POWER_STATS)
+if options.num_cores > 1:
+    statistics.AddAggregate('total', power_components)
+for component, component_info in dram_components.items():
+    statistics.AddDram(component, component_info['paths'], component_info['ranks'])
+
+# watch the extracted dumps for a steady state
+steady_state = None
+if options.converge:
+    steady_state = SteadyStateDetector(
+        statistics, power_components, options.converge_window, options.converge_tolerance
+    )
+
+# only dump the stats that are extracted
+if options.stats_filter:
+    stats_allow = statistics.StatKeys() + options.stats_allow.split(',')
+    InstallStatsFilter(StatsFilter(stats_allow))
+
 # kick off simulation
 print('Beginning simulation!')
-exit_event = m5.simulate()
+poll_time = 0.0
+if options.live_extraction:
+    # simulate in slices and parse the new dumps after each one, stopping
+    # early once the run is steady
+    while True:
+        exit_event = m5.simulate(m5.ticks.fromSeconds(options.live_poll_period))
+        poll_start = time.time()
+        statistics.Poll()
+        poll_time += time.time() - poll_start
+        if exit_event.getCause() != 'simulate() limit reached':
+            break
+        if steady_state is not None and steady_state.Converged():
+            print('Steady state reached @ tick {}'.format(m5.curTick()))
+            break
+else:
+    exit_event = m5.simulate()
 
 # inspect state of the simulation after completion
+host_times.append(('simulate', time.time()))
 exiting_tick = m5.curTick()
 print('Exiting @ tick {} because {}'.format(exiting_tick, exit_event.getCause()))
 
 # ---------------------------------------------------------------------------------
 # Extract Statistics
 # ---------------------------------------------------------------------------------
-# read statistics file
-print('Extracting statistics...')
-statistics = DataExtraction(exiting_tick, stats_dump_period)
-
-# create .csv file names
-cpu_power_filename = '{}/cpu_power_data_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
-l2_cache_power_filename = '{}/l2_cache_power_data_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
-if options.include_l3_cache:
-    l3_cache_power_filename = '{}/l3_cache_power_data_{}.csv'.format(options.csv_save_dir, options.csv_file_suffix)
-
-# extract power modeling data
-statistics.ExtractCpuPowerData(parameters, cpu_power_filename)
-statistics.ExtractL2CachePowerData(parameters, l2_cache_power_filename)
-if options.include_l3_cache:
-    statistics.ExtractL3CachePowerData(parameters, l3_cache_power_filename)
\ No newline at end of file
+if options.live_extraction:
+    # parse the remaining dumps and finish the .csv files
+    print('Finishing statistics extraction...')
+    statistics.Finish(exiting_tick)
+
+    # the DRAM and the total power are only known once every component has
+    # been parsed
+    if 'csv' in output_formats:
+        for component in power_data_components:
+            if component not in power_components:
+                statistics.ExtractPowerData(component, parameters, power_filenames[component, 'csv'])
+else:
+    # read statistics file
+    print('Extracting statistics...')
+    statistics.exiting_tick = exiting_tick
+
+    # extract power modeling data
+    if 'csv' in output_formats:
+        for component in power_data_components:
+            statistics.ExtractPowerData(component, parameters, power_filenames[component, 'csv'])
+
+# the performance series are aligned with the power of every component,
+# the whole-system energy includes the DRAM
+if 'csv' in output_formats:
+    statistics.ExtractPerformanceData(list(power_components) + list(dram_components), parameters, performance_filename)
+
+# the columnar files are written once all dumps are parsed
+if 'npz' in output_formats:
+    for component in power_data_components:
+        statistics.ExtractPowerNpz(component, parameters, power_filenames[component, 'npz'])
+
+# save the inputs of the power modeling equations
+if options.save_raw_stats:
+    SaveRawStats(statistics, raw_stats_filename, power_components, {
+        'options': vars(options),
+        'parameters': parameters,
+        'exiting_tick': exiting_tick,
+        'stats_period': stats_dump_period,
+    })
+
+# estimate what the DVFS governor would save against the fixed operating
+# point of the cores, and what it would cost in runtime, by replaying it on
+# the simulated intervals. gem5 simulated the fixed operating point only.
+dvfs_totals = None
+if options.dvfs_governor != 'none':
+    dvfs_rows, dvfs_totals = DvfsReplay(
+        statistics,
+        list(power_components) + list(dram_components),
+        [component for component in power_components if component.startswith('cpu')],
+        OPERATING_POINTS,
+        options.cpu_opp,
+        DVFS_GOVERNOR_CLASSES[options.dvfs_governor](OPERATING_POINTS, options.governor_threshold)
+    )
+    CreateDvfsCsv(parameters, dvfs_filename, dvfs_rows, dvfs_totals, exiting_tick, stats_dump_period)
+    print('Replayed DVFS governor {}: {:.1%} estimated energy savings, {:.3f}x estimated runtime'.format(
+        options.dvfs_governor, dict(dvfs_totals)['energy_savings'], dict(dvfs_totals)['slowdown']
+    ))
+
+host_times.append(('extraction', time.time()))
+
+# record whether the run converged and extrapolate the whole run
+convergence = None
+if options.converge:
+    convergence = steady_state.Estimate(options.converge_total_insts)
+    convergence['converged'] = exit_event.getCause() == 'simulate() limit reached'
+    with open(convergence_filename, 'w') as convergence_file:
+        json.dump(convergence, convergence_file, indent = 4)
+    if convergence['converged'] and 'energy' in convergence:
+        print('Extrapolated energy: {} +/- {} J'.format(convergence['energy'], convergence['energy_error']))
+
+# describe the simpoint so simpoint.py combine can weigh its results
+if options.restore_simpoint >= 0:
+    with open(simpoint_filename, 'w') as simpoint_file:
+        json.dump({
+            'simpoint': options.restore_simpoint,
+            'weight': simpoint_checkpoint['weight'],
+            'interval': simpoint_checkpoint['interval'],
+            'components': sorted(power_components),
+            'num_cores': options.num_cores,
+            'mem_channels': options.mem_channels,
+            'parameters': parameters,
+            'stats_filename': os.path.abspath(stats_filename),
+            'stats_period': stats_dump_period,
+            'exiting_tick': exiting_tick,
+        }, simpoint_file, indent = 4)
+
+# record what the run cost on the host. Everything between instantiating
+# and the end of the simulation, fast-forward and warmup included, counts
+# as simulation, except for polling the stats file when extracting live.
+host_phases = dict(
+    (phase, end - begin) for (previous, begin), (phase, end) in zip(host_times, host_times[1:])
+)
+sim_insts = sum(cpu.totalInsts() for cpu in system.processor.allCPUs())
+simulate_time = host_phases['simulate'] - poll_time
+host = [
+    ('wall_time', host_times[-1][1] - host_times[0][1]),
+    ('setup_time', host_phases['setup']),
+    ('instantiate_time', host_phases['instantiate']),
+    ('simulate_time', simulate_time),
+    ('extraction_time', host_phases['extraction'] + poll_time),
+    ('sim_insts', sim_insts),
+    ('host_inst_rate', sim_insts / simulate_time if simulate_time > 0 else 0.0),
+    ('sim_seconds', exiting_tick / float(m5.ticks.fromSeconds(1.0))),
+    # ru_maxrss is in kilobytes on Linux
+    ('peak_rss_bytes', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024),
+    ('stats_file_bytes', os.path.getsize(stats_filename) if os.path.exists(stats_filename) else 0),
+]
+if 'csv' in output_formats:
+    CreateHostCsv(parameters, host_filename, host)
+
+# describe the run so results_db.py can ingest it
+with open(os.path.join(m5.options.outdir, 'run.json'), 'w') as run_file:
+    json.dump({
+        'options': vars(options),
+        'parameters': parameters,
+        'components': power_components,
+        'dram': dram_components,
+        'stats_period': stats_dump_period,
+        'exiting_tick': exiting_tick,
+        'roi': [roi_begin_tick, exiting_tick] if options.roi else None,
+        'convergence': convergence,
+        'dvfs_replay': dict(dvfs_totals) if dvfs_totals else None,
+        'host': dict(host),
+    }, run_file, indent = 4, default = str)
+
+# record the files written by this run so the sweep tooling can find them
+with open(os.path.join(m5.options.outdir, 'outputs.json'), 'w') as outputs_file:
+    json.dump(output_files, outputs_file, indent = 4)
@@ -0,0 +1,647 @@
+# --------------------------------------------------------------------------
+# Import Libraries
+# --------------------------------------------------------------------------
+import argparse
+
+# --------------------------------------------------------------------------
+# Output Options
+# options that only decide where results are written and when they are
+# parsed. They change neither what is simulated nor which files a run
+# writes, so the result cache leaves them out of its key. Options that add
+# output files are part of the key.
+# --------------------------------------------------------------------------
+OUTPUT_OPTIONS = (
+    'csv_file_suffix',
+    'csv_save_dir',
+    'live_extraction',
+    'live_poll_period',
+)
+
+# --------------------------------------------------------------------------
+# Core Indexes
+# --------------------------------------------------------------------------
+def CoreIndexes(num_cores):
+    """Returns the suffix gem5 gives the name of each core's SimObjects. A
+    single core keeps the plain name, so the paths of a one core system are
+    unchanged. Otherwise the index is zero padded as gem5 does for SimObject
+    vectors.
+    """
+
+    if num_cores == 1:
+        return ['']
+
+    width = len(str(num_cores - 1))
+    return ['{:0{}d}'.format(i, width) for i in range(num_cores)]
+
+# --------------------------------------------------------------------------
+# Cache Levels
+# option prefix and parameter name of every cache level
+# --------------------------------------------------------------------------
+CACHE_LEVEL_NAMES = (
+    ('l1i', 'L1 Instruction Cache'),
+    ('l1d', 'L1 Data Cache'),
+    ('l2', 'L2 Cache'),
+    ('l3', 'L3 Cache'),
+)
+
+# hardware prefetchers that can be attached to a cache, see caches.py
+PREFETCHERS = ('none', 'stride', 'tagged', 'best_offset', 'ampm', 'signature_path', 'dcpt')
+
+# replacement policies a cache can use, see caches.py
+REPLACEMENT_POLICIES = ('lru', 'random', 'fifo', 'mru', 'lip', 'bip', 'rrip', 'brrip', 'tree_plru', 'second_chance')
+
+# how the L3 cache holds the lines of the L2 caches above it
+L3_INCLUSION = ('non_inclusive', 'exclusive')
+
+# --------------------------------------------------------------------------
+# CPU Knobs
+# pipeline parameters of the detailed CPUs, as (option, type, the gem5
+# parameter the option sets on each CPU type that has one, help). A knob
+# that is not given keeps gem5's default.
+# --------------------------------------------------------------------------
+CPU_KNOBS = (
+    ('fetch_width', int, {'O3CPU': 'fetchWidth'},
+        'Instructions fetched per cycle.'),
+    ('decode_width', int, {'O3CPU': 'decodeWidth', 'MinorCPU': 'decodeInputWidth'},
+        'Instructions decoded per cycle.'),
+    ('rename_width', int, {'O3CPU': 'renameWidth'},
+        'Instructions renamed per cycle.'),
+    ('issue_width', int, {'O3CPU': 'issueWidth', 'MinorCPU': 'executeIssueLimit'},
+        'Instructions issued per cycle.'),
+    ('commit_width', int, {'O3CPU': 'commitWidth', 'MinorCPU': 'executeCommitLimit'},
+        'Instructions committed per cycle.'),
+    ('rob_entries', int, {'O3CPU': 'numROBEntries'},
+        'Reorder buffer entries.'),
+    ('iq_entries', int, {'O3CPU': 'numIQEntries'},
+        'Instruction queue entries.'),
+    ('lq_entries', int, {'O3CPU': 'LQEntries'},
+        'Load queue entries.'),
+    ('sq_entries', int, {'O3CPU': 'SQEntries'},
+        'Store queue entries.'),
+    ('thread_policy', str, {'MinorCPU': 'threadPolicy'},
+        'Thread scheduling policy: SingleThreaded, RoundRobin or Random.'),
+    ('fetch1_to_fetch2_forward_delay', int, {'MinorCPU': 'fetch1ToFetch2ForwardDelay'},
+        'Forward cycle delay from Fetch1 to Fetch2.'),
+    ('fetch2_input_buffer_size', int, {'MinorCPU': 'fetch2InputBufferSize'},
+        'Size of input buffer to Fetch2 in cycle-worth of instructions.'),
+    ('decode_input_buffer_size', int, {'MinorCPU': 'decodeInputBufferSize'},
+        'Size of input buffer to decode in cycle-worth of instructions.'),
+    ('execute_input_buffer_size', int, {'MinorCPU': 'executeInputBufferSize'},
+        'Size of input buffer to execute in cycle-worth of instructions.'),
+)
+
+# branch predictors of the detailed CPUs, see processor.py
+BRANCH_PREDICTORS = ('tournament', 'local', 'bimode', 'tage', 'ltage', 'tage_sc_l', 'perceptron')
+
+# operating points of the core and cache clock domains, as (frequency in
+# Hz, voltage in Volts), fastest first as gem5's DVFS handler expects. The
+# default level of both domains, 1GHz at 1.0V, is the fixed clock of a run
+# without DVFS.
+OPERATING_POINTS = (
+    (2.0E9, 1.2),
+    (1.5E9, 1.1),
+    (1.0E9, 1.0),
+    (0.75E9, 0.9),
+    (0.5E9, 0.8),
+)
+DEFAULT_OPERATING_POINT = 2
+
+# DVFS governors of the core clock domain, see dvfs.py
+DVFS_GOVERNORS = ('none', 'utilization')
+
+# DRAM technologies of the main memory, see memory.py
+MEM_TYPES = (
+    'ddr3_1600', 'ddr3_2133', 'ddr4_2400', 'lpddr2_1066', 'lpddr3_1600', 'lpddr5_5500', 'lpddr5_6400',
+    'hbm_1000', 'hbm_2000', 'gddr5_4000', 'wideio_200'
+)
+
+# --------------------------------------------------------------------------
+# Boolean Options
+# --------------------------------------------------------------------------
+TRUE_STRINGS = ('true', 'yes', 'on', '1')
+FALSE_STRINGS = ('false', 'no', 'off', '0')
+
+def StrToBool(value):
+    """Type of the boolean options. Reads True | False, as written by run.sh
+    and the sweep tooling, so --live_extraction=False leaves live extraction
+    off.
+    """
+
+    if value.lower() in TRUE_STRINGS:
+        return True
+    if value.lower() in FALSE_STRINGS:
+        return False
+
+    raise argparse.ArgumentTypeError('expected True or False, got {}'.format(value))
+
+# --------------------------------------------------------------------------
+# Create Option Parser
+# --------------------------------------------------------------------------
+def CreateOptionParser():
+    """Creates the parser for the options of system.py along with the list
+    of parameters written to the .csv files. The parser does not depend on
+    gem5 so the sweep tooling can resolve the full option set of a run
+    without launching it.
+    """
+
+    # create parser object
+    parser = argparse.ArgumentParser(
+        description = 'A simple system with 2-level cache.'
+    )
+
+    # create empty list of CPU parameters for data extraction purposes
+    parameters = [[], []]
+
+    # add an argument for selecting the binary file.
+    parser.add_argument(
+        '--binary',
+        default = '', 
+        nargs = '?', 
+        type = str, 
+        help = 'Path to the binary to execute.'
+    )
+
+    # add an argument for the arguments passed to the binary file
+    parser.add_argument(
+        '--binary_args',
+        default = '',
+        type = str,
+        help = 'Space separated arguments passed to the binary, for example the number of threads of stress_test.'
+    )
+
+    # add an argument for naming the .csv files
+    parser.add_argument(
+        '--csv_file_suffix',
+        default = '',
+        type = str,
+        help = 'String that is appended to the end of the .csv file names.'
+    )
+
+    # add an argument for a directory save loaction for the CSV files
+    parser.add_argument(
+        '--csv_save_dir',
+        default = '',
+        type = str,
+        help = 'Location to save the CSV files containing the extracted data.'
+    )
+
+    # add arguments for selecting cache sizes
+    parameters[0].append("L1 Instruction Cache Size")
+    parser.add_argument(
+        '--l1i_size', 
+        default = '16kB',
+        help = 'L1 instruction cache size. Default: 16kB.'
+    )
+    parameters[0].append("L1 Data Cache Size")
+    parser.add_argument(
+        '--l1d_size',
+        default = '64kB',
+        help = 'L1 data cache size. Default: 64kB.'
+    )
+    parameters[0].append("L2 Cache Size")
+    parser.add_argument(
+        '--l2_size',
+        default = '256kB',
+        help = 'L2 cache size. Default: 256kB.'
+    )
+    parameters[0].append("L3 Cache Size")
+    parser.add_argument(
+        '--l3_size',
+        default = '1MB',
+        help = 'L3 cache size. Default: 1MB.'
+    )
+
+    # add arguments for selecting cache associativity
+    parameters[0].append("L1 Instruction Cache Associativity")
+    parser.add_argument(
+        '--l1i_assoc',
+        default = 2,
+        help = 'L1 data cache associativity. Default: 2.'
+    )
+    parameters[0].append("L1 Data Cache Associativity")
+    parser.add_argument(
+        '--l1d_assoc',
+        default = 2,
+        help = 'L1 instruction cache associativity. Default: 2.'
+    )
+    parameters[0].append("L2 Cache Associativity")
+    parser.add_argument(
+        '--l2_assoc',
+        default = 8,
+        help = 'L2 cache associativity. Default: 8.'
+    )
+    parameters[0].append("L3 Cache Associativity")
+    parser.add_argument(
+        '--l3_assoc',
+        default = 64,
+        help = 'L3 cache associativity. Default: 64.'
+    )
+
+    # add arguments for selecting cache data latencies
+    parameters[0].append("L1 Instruction Cache Data Latency")
+    parser.add_argument(
+        '--l1i_data_latency', 
+        default = 2,
+        help = 'L1 instruction cache data latency. Default: 2'
+    )
+
+    # add argument for selecting the CPU type
+    parameters[0].append("CPU Type")
+    parser.add_argument(
+        '--cpu_type',
+        default = 'MinorCPU',
+        help = 'Selects the processor type.'
+    )
+
+    # add argument for selecting the number of cores
+    parameters[0].append("Number of Cores")
+    parser.add_argument(
+        '--num_cores',
+        default = 1,
+        type = int,
+        help = 'Number of cores, each with private L1 and L2 caches. The L3 cache is shared. Default: 1.'
+    )
+
+    # add arguments for selecting the prefetcher of every cache level
+    for level, level_name in CACHE_LEVEL_NAMES:
+        parameters[0].append("{} Prefetcher".format(level_name))
+        parser.add_argument(
+            '--{}_prefetcher'.format(level),
+            default = 'none',
+            choices = PREFETCHERS,
+            help = 'Hardware prefetcher of the {}. Default: none.'.format(level_name)
+        )
+        parser.add_argument(
+            '--{}_prefetch_degree'.format(level),
+            default = 0,
+            type = int,
+            help = 'Prefetches issued per trigger by the {} prefetcher. Default: 0, the prefetcher\'s own default.'.format(level_name)
+        )
+        parser.add_argument(
+            '--{}_prefetch_distance'.format(level),
+            default = 0,
+            type = int,
+            help = 'How far ahead the {} prefetcher prefetches, for prefetchers with a distance such as stride. Default: 0, the prefetcher\'s own default.'.format(level_name)
+        )
+
+    # add arguments for selecting the replacement policy of every cache level
+    for level, level_name in CACHE_LEVEL_NAMES:
+        parameters[0].append("{} Replacement Policy".format(level_name))
+        parser.add_argument(
+            '--{}_repl'.format(level),
+            default = 'lru',
+            choices = REPLACEMENT_POLICIES,
+            help = 'Replacement policy of the {}. Default: lru.'.format(level_name)
+        )
+
+    # add argument for selecting the inclusion policy of the L2 and L3 caches
+    parameters[0].append("L3 Cache Inclusion")
+    parser.add_argument(
+        '--l3_inclusion',
+        default = 'non_inclusive',
+        choices = L3_INCLUSION,
+        help = 'non_inclusive fills the L3 cache on every miss, without back-invalidating the L2 caches when it evicts. exclusive only fills the L3 cache with the lines the L2 caches evict, clean ones included. Only used with the L3 cache. Default: non_inclusive.'
+    )
+
+    # add arguments for configuring the CPU pipeline
+    parameters[0].append("CPU Pipeline")
+    for option, option_type, cpu_params, option_help in CPU_KNOBS:
+        parser.add_argument(
+            '--' + option,
+            type = option_type,
+            help = '{} CPU types: {}. Default: gem5\'s default.'.format(option_help, ', '.join(sorted(cpu_params)))
+        )
+    parser.add_argument(
+        '--branch_predictor',
+        choices = BRANCH_PREDICTORS,
+        help = 'Branch predictor of the MinorCPU and O3CPU. Default: gem5\'s default.'
+    )
+
+    # add arguments for the clock domains and the idle power states
+    parameters[0].append("CPU Operating Point")
+    parser.add_argument(
+        '--cpu_opp',
+        default = DEFAULT_OPERATING_POINT,
+        type = int,
+        choices = range(len(OPERATING_POINTS)),
+        help = 'Operating point of the clock domain of the cores and their L1 caches, as an index into {}, fastest first. Default: {}.'.format(
+            ', '.join(OperatingPointName(level) for level in range(len(OPERATING_POINTS))), DEFAULT_OPERATING_POINT
+        )
+    )
+    parameters[0].append("Cache Operating Point")
+    parser.add_argument(
+        '--cache_opp',
+        default = DEFAULT_OPERATING_POINT,
+        type = int,
+        choices = range(len(OPERATING_POINTS)),
+        help = 'Operating point of the clock domain of the L2 and L3 caches, like --cpu_opp. Default: {}.'.format(DEFAULT_OPERATING_POINT)
+    )
+    parameters[0].append("Replayed DVFS Governor")
+    parser.add_argument(
+        '--dvfs_governor',
+        default = 'none',
+        choices = DVFS_GOVERNORS,
+        help = 'Governor of the core clock domain, replayed on the simulated intervals to estimate its energy savings and slowdown against the fixed --cpu_opp. utilization picks the slowest operating point that keeps the core utilization below --governor_threshold. Default: none.'
+    )
+    parser.add_argument(
+        '--governor_threshold',
+        default = 0.8,
+        type = float,
+        help = 'Core utilization the utilization governor scales the frequency up at. Default: 0.8.'
+    )
+    parameters[0].append("Power Gating On Idle")
+    parser.add_argument(
+        '--power_gating_on_idle',
+        default = False,
+        type = StrToBool,
+        help = 'Power gate the cores once they have been clock gated for --power_gating_latency cycles without a thread to run. Idle cores are always clock gated. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--power_gating_latency',
+        default = 300,
+        type = int,
+        help = 'Cycles an idle core stays clock gated before it is power gated. Default: 300.'
+    )
+
+    # add arguments for configuring the main memory
+    parameters[0].append("Memory Type")
+    parser.add_argument(
+        '--mem_type',
+        default = 'ddr3_1600',
+        choices = MEM_TYPES,
+        help = 'DRAM technology of the main memory. Default: ddr3_1600.'
+    )
+    parameters[0].append("Memory Channels")
+    parser.add_argument(
+        '--mem_channels',
+        default = 1,
+        type = int,
+        help = 'Number of memory channels, each with its own memory controller, interleaved at cache line granularity. Must be a power of two. Default: 1.'
+    )
+
+    # add argument for including L3 Cache.
+    parser.add_argument(
+        '--include_l3_cache',
+        default = False,
+        type = StrToBool,
+        help = 'Determines whether the L3 cache should be included on not. Options: True | False. Default: False.'
+    )
+
+    # add arguments for selecting the pwer modeling equations for the CPU and
+    # L2 and L3 caches.
+    parser.add_argument(
+        '--cpu_pwr_eq',
+        default = 0,
+        help = 'Selects the equation to use for modeling the processor\'s power consumption. Input is a positive integer.'
+    )
+    parser.add_argument(
+        '--l2_pwr_eq',
+        default = 0,
+        help = 'Selects the equation to use for modeling the L2 cache\'s power consumption. Input is a positive integer.'
+    )
+    parser.add_argument(
+        '--l3_pwr_eq',
+        default = 0,
+        help = 'Selects the equation to use for modeling the L3 cache\'s power consumption. Input is a positive integer.'
+    )
+
+    # add argument for selecting the format of the extracted power data
+    parser.add_argument(
+        '--output_format',
+        default = 'csv',
+        help = 'Comma separated formats of the extracted power data. csv writes the .csv files, npz writes columnar .npz files that can be memory-mapped with LoadPowerNpz. Default: csv.'
+    )
+
+    # add arguments for extracting statistics while the simulation is running
+    parser.add_argument(
+        '--live_extraction',
+        default = False,
+        type = StrToBool,
+        help = 'Parse stats.txt and write the .csv files while the simulation is running. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--live_poll_period',
+        default = 1.0E-3,
+        type = float,
+        help = 'Simulated seconds between polls of stats.txt when extracting live. Default: 1.0E-3.'
+    )
+
+    # add arguments for stopping the simulation once it reaches a steady state
+    parser.add_argument(
+        '--converge',
+        default = False,
+        type = StrToBool,
+        help = 'Extract live and stop the simulation once the total power and IPC of the last --converge_window dumps stay within --converge_tolerance, then extrapolate the whole-run energy. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--converge_window',
+        default = 20,
+        type = int,
+        help = 'Number of stats dumps that must be steady. Default: 20.'
+    )
+    parser.add_argument(
+        '--converge_tolerance',
+        default = 0.05,
+        type = float,
+        help = 'Largest deviation of a dump from the window mean, relative to the mean. Default: 0.05.'
+    )
+    parser.add_argument(
+        '--converge_total_insts',
+        default = 0,
+        type = int,
+        help = 'Instructions of the whole measured run, for example the simInsts of an earlier run, used to extrapolate its energy and runtime. Default: 0, only the power and energy per instruction are estimated.'
+    )
+
+    # add arguments for fast-forwarding to a checkpoint and restoring from it
+    parser.add_argument(
+        '--take_checkpoint',
+        default = '',
+        help = 'Fast-forward with the atomic CPU, write a checkpoint to this directory and exit.'
+    )
+    parser.add_argument(
+        '--checkpoint_at',
+        default = '',
+        help = 'Where the checkpoint is taken: a number of instructions, or roi to stop at the workload\'s first m5 work begin or checkpoint marker.'
+    )
+    parser.add_argument(
+        '--restore_checkpoint',
+        default = '',
+        help = 'Restore the detailed CPU from the checkpoint in this directory.'
+    )
+    parser.add_argument(
+        '--warmup_insts',
+        default = 0,
+        type = int,
+        help = 'Instructions simulated in detail to warm up the caches before the stats are reset and measured. Default: 0.'
+    )
+
+    # add argument for limiting the length of the measured simulation
+    parser.add_argument(
+        '--max_insts',
+        default = 0,
+        type = int,
+        help = 'Stop the simulation after this many instructions of the first core, counted after the warmup. Default: 0, run to completion.'
+    )
+
+    # add argument for measuring the workload's region of interest only
+    parser.add_argument(
+        '--roi',
+        default = False,
+        type = StrToBool,
+        help = 'Fast-forward with the atomic CPU to the workload\'s m5 work begin marker, switch to --cpu_type, reset the stats and stop at the work end marker. Only the region of interest is extracted. Options: True | False. Default: False.'
+    )
+
+    # add arguments for sampled simulation with simpoints
+    parser.add_argument(
+        '--simpoint_profile',
+        default = False,
+        type = StrToBool,
+        help = 'Run the atomic CPU over the whole program and write the basic block vectors to simpoint.bb.gz. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--simpoint_interval',
+        default = 10000000,
+        type = int,
+        help = 'Instructions per simpoint interval. Default: 10000000.'
+    )
+    parser.add_argument(
+        '--simpoint_file',
+        default = '',
+        help = 'Simpoints file written by simpoint.py cluster.'
+    )
+    parser.add_argument(
+        '--weight_file',
+        default = '',
+        help = 'Weights file written by simpoint.py cluster.'
+    )
+    parser.add_argument(
+        '--take_simpoint_checkpoints',
+        default = False,
+        type = StrToBool,
+        help = 'Fast-forward with the atomic CPU and take a checkpoint --warmup_insts before every simpoint. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--simpoint_checkpoint_dir',
+        default = '',
+        help = 'Directory holding the simpoint checkpoints.'
+    )
+    parser.add_argument(
+        '--restore_simpoint',
+        default = -1,
+        type = int,
+        help = 'Restore the checkpoint of this simpoint, warm up and simulate one interval in detail. Default: -1, disabled.'
+    )
+
+    # add arguments for restricting the stats dumps to an allow-list
+    parser.add_argument(
+        '--stats_filter',
+        default = False,
+        type = StrToBool,
+        help = 'Only dump the stats that are extracted from stats.txt, plus those in --stats_allow. Options: True | False. Default: False.'
+    )
+    parser.add_argument(
+        '--stats_allow',
+        default = '',
+        help = 'Comma separated stats also dumped when --stats_filter is set: full stat names, path prefixes ending in a dot, or regular expressions prefixed with re:.'
+    )
+
+    # add argument for tracing the memory accesses of the CPU
+    parser.add_argument(
+        '--mem_trace',
+        default = False,
+        type = StrToBool,
+        help = 'Trace every access from the CPU to the L1 caches to icache.trc.gz and dcache.trc.gz in the gem5 output directory for cache_model.py, with the core index after icache and dcache for more than one core. Requires gem5 built with protobuf. Options: True | False. Default: False.'
+    )
+
+    # add argument for saving the inputs of the power modeling equations
+    parser.add_argument(
+        '--save_raw_stats',
+        default = False,
+        type = StrToBool,
+        help = 'Save the per-interval stats used by the power modeling equations so power can be re-evaluated with power_eval.py. Requires NumPy. Options: True | False. Default: False.'
+    )
+
+    return parser, parameters
+
+# --------------------------------------------------------------------------
+# Set Parameter Values
+# --------------------------------------------------------------------------
+def SetParameterValues(parameters, options):
+    """Places the option values in the parameter list.
+    """
+
+    parameters[1] = [
+        options.l1i_size,
+        options.l1d_size,
+        options.l2_size,
+        options.l3_size,
+        options.l1i_assoc,
+        options.l1d_assoc,
+        options.l2_assoc,
+        options.l3_assoc,
+        options.l1i_data_latency,
+        options.cpu_type,
+        options.num_cores
+    ] + [
+        getattr(options, level + '_prefetcher') for level, level_name in CACHE_LEVEL_NAMES
+    ] + [
+        getattr(options, level + '_repl') for level, level_name in CACHE_LEVEL_NAMES
+    ] + [
+        options.l3_inclusion,
+        CpuPipelineDescription(options),
+        OperatingPointName(options.cpu_opp),
+        OperatingPointName(options.cache_opp),
+        options.dvfs_governor,
+        options.power_gating_on_idle,
+        options.mem_type,
+        options.mem_channels
+    ]
+
+# --------------------------------------------------------------------------
+# Operating Point Helpers
+# --------------------------------------------------------------------------
+def OperatingPointName(level):
+    """Returns the frequency and voltage of the operating point at level in
+    OPERATING_POINTS, in the units gem5 reads them in, for example
+    1000MHz 1.0V.
+    """
+
+    frequency, voltage = OPERATING_POINTS[level]
+    return '{:g}MHz {}V'.format(frequency / 1.0E6, voltage)
+
+# --------------------------------------------------------------------------
+# CPU Knob Helpers
+# --------------------------------------------------------------------------
+def CpuKnobValues(options):
+    """Returns the CPU knobs that were given, as (option, value) pairs.
+    """
+
+    knobs = [
+        (option, getattr(options, option)) for option, option_type, cpu_params, option_help in CPU_KNOBS
+        if getattr(options, option) is not None
+    ]
+    if options.branch_predictor:
+        knobs.append(('branch_predictor', options.branch_predictor))
+
+    return knobs
+
+def CpuPipelineDescription(options):
+    """Describes the CPU knobs that were given in one .csv parameter value,
+    for example issue_width=4 rob_entries=128.
+    """
+
+    return ' '.join('{}={}'.format(option, value) for option, value in CpuKnobValues(options)) or 'default'
+
+def ValidateCpuKnobs(parser, options):
+    """Stops with a parser error when a CPU knob was given that the selected
+    CPU type does not have.
+    """
+
+    for option, option_type, cpu_params, option_help in CPU_KNOBS:
+        if getattr(options, option) is not None and options.cpu_type not in cpu_params:
+            parser.error('--{} is not a parameter of the {}, only of the {}'.format(
+                option, options.cpu_type, ', '.join(sorted(cpu_params))
+            ))
+
+    if options.branch_predictor and options.cpu_type not in ('MinorCPU', 'O3CPU'):
+        parser.error('--branch_predictor is not a parameter of the {}'.format(options.cpu_type))
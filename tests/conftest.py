@@ -0,0 +1,9 @@
+# --------------------------------------------------------------------------
+# Test Configuration
+# The modules under test live in the project directory, next to system.py,
+# and are imported the way gem5 imports them from there.
+# --------------------------------------------------------------------------
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,33 @@
+# --------------------------------------------------------------------------
+# Run Analysis Tests
+# --------------------------------------------------------------------------
+import pytest
+
+from analysis import LoadTest
+from analysis import Summarize
+from data_extraction import DataExtraction
+
+def WritePowerCsv(csv_filename, power):
+
+    statistics = DataExtraction(100, 0.5)
+    statistics.CreateCsv(
+        [["L2 Cache Size"], ["1MB"]], csv_filename,
+        [static for dynamic, static in power], [dynamic for dynamic, static in power]
+    )
+
+# --------------------------------------------------------------------------
+# Load Test
+# --------------------------------------------------------------------------
+def test_dram_counts_towards_the_total(tmp_path):
+
+    WritePowerCsv(str(tmp_path / "cpu_power_data_run.csv"), [(1.0, 0.5), (2.0, 0.5)])
+    WritePowerCsv(str(tmp_path / "dram_power_data_run.csv"), [(0.25, 0.25), (0.75, 0.25)])
+    WritePowerCsv(str(tmp_path / "total_power_data_run.csv"), [(9.0, 9.0), (9.0, 9.0)])
+
+    runs, periods, power = LoadTest(str(tmp_path))
+    assert runs == ["run"]
+    assert sorted(power) == ["cpu", "dram"]
+
+    summary = Summarize(periods, power, 95)
+    assert summary["dram_energy"][0] == pytest.approx((0.5 + 1.0) * 0.5)
+    assert summary["energy"][0] == pytest.approx((1.5 + 2.5 + 0.5 + 1.0) * 0.5)
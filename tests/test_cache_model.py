@@ -0,0 +1,137 @@
+# --------------------------------------------------------------------------
+# Cache Model Tests
+# --------------------------------------------------------------------------
+import gzip
+import random
+from collections import OrderedDict
+
+import numpy
+import pytest
+
+from cache_model import BLOCK_SIZE
+from cache_model import CacheModel
+from cache_model import StackDistances
+from cache_model import TRACE_MAGIC
+from power_equations import L2_EQUATIONS
+
+def LruMisses(blocks, sets, assoc):
+    """Returns the miss mask of blocks in an LRU cache of sets sets and
+    associativity assoc, one access at a time.
+    """
+
+    cache = [OrderedDict() for i in range(sets)]
+    misses = []
+    for block in blocks:
+        lines = cache[block % sets]
+        misses.append(block not in lines)
+        lines.pop(block, None)
+        lines[block] = True
+        if len(lines) > assoc:
+            lines.popitem(last = False)
+
+    return numpy.array(misses, dtype = bool)
+
+def Varint(value):
+
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+def Message(fields):
+
+    return b"".join(Varint(number << 3) + Varint(value) for number, value in fields)
+
+def WriteTrace(trace_filename, packets):
+    """Writes a gem5 packet trace of packets, a list of (tick, address),
+    each a one byte request.
+    """
+
+    messages = [Message([(3, 10**12)])] + [Message([(1, tick), (3, address), (4, 1)]) for tick, address in packets]
+    with gzip.open(trace_filename, "wb") as trace_file:
+        trace_file.write(TRACE_MAGIC)
+        for message in messages:
+            trace_file.write(Varint(len(message)) + message)
+
+# --------------------------------------------------------------------------
+# Stack Distances
+# --------------------------------------------------------------------------
+@pytest.mark.parametrize("sets", [1, 4, 16])
+def test_stack_distances_match_an_lru_cache(sets):
+
+    random_state = random.Random(sets)
+    blocks = [random_state.randrange(64) for i in range(2000)]
+    distances = StackDistances(blocks, sets, 8)
+
+    for assoc in (1, 2, 4, 8):
+        assert numpy.array_equal(distances >= assoc, LruMisses(blocks, sets, assoc))
+
+# --------------------------------------------------------------------------
+# Cache Hierarchy
+# --------------------------------------------------------------------------
+CONFIG = {
+    "l1i_size": "256B", "l1i_assoc": "2",
+    "l1d_size": "256B", "l1d_assoc": "2",
+    "l2_size": "1kB", "l2_assoc": "4",
+    "l3_size": "2kB", "l3_assoc": "4",
+    "include_l3_cache": "True",
+}
+
+def test_multi_core_hierarchy_matches_an_lru_simulation(tmp_path):
+
+    random_state = random.Random(0)
+    traces = []
+    accesses = []
+    for core in range(2):
+        core_traces = []
+        for source in range(2):
+            packets = [(random_state.randrange(10**6), random_state.randrange(96) * BLOCK_SIZE) for i in range(500)]
+            trace_filename = str(tmp_path / "{}{}.trc.gz".format(("icache", "dcache")[source], core))
+            WriteTrace(trace_filename, packets)
+            core_traces.append(trace_filename)
+            accesses.extend((tick, core, source, address // BLOCK_SIZE) for tick, address in packets)
+        traces.append(tuple(core_traces))
+
+    model = CacheModel(traces, 8)
+    results = model.Evaluate(CONFIG)
+
+    # replay the accesses in tick order, core by core and source by source
+    # at equal ticks as the model merges them
+    accesses.sort(key = lambda access: (access[0], access[1] * 2 + access[2]))
+    l2_streams = [[], []]
+    l1_misses = {}
+    for core in range(2):
+        for source, level in enumerate(("l1i", "l1d")):
+            blocks = [block for tick, c, s, block in accesses if (c, s) == (core, source)]
+            l1_misses[core, source] = LruMisses(blocks, 2, 2)
+            assert numpy.array_equal(results[level][core][1], l1_misses[core, source])
+
+    positions = dict(((core, source), 0) for core in range(2) for source in range(2))
+    for tick, core, source, block in accesses:
+        missed = l1_misses[core, source][positions[core, source]]
+        positions[core, source] += 1
+        if missed:
+            l2_streams[core].append((tick, block))
+
+    l2_misses = [LruMisses([block for tick, block in stream], 4, 4) for stream in l2_streams]
+    for core in range(2):
+        assert numpy.array_equal(results["l2"][core][1], l2_misses[core])
+
+    l3_stream = sorted(
+        (tick, core, block)
+        for core in range(2)
+        for (tick, block), missed in zip(l2_streams[core], l2_misses[core]) if missed
+    )
+    assert len(results["l3"]) == 1
+    assert int(results["l3"][0][1].sum()) == int(LruMisses([block for tick, core, block in l3_stream], 8, 4).sum())
+
+    # both private L2 caches leak, at the voltage of the operating point
+    dynamic, static = model.Power(results, "l2", L2_EQUATIONS, 0, 2)
+    assert static == pytest.approx(2 * 3 * 1.0 / 10)
+    dynamic, static = model.Power(results, "l2", L2_EQUATIONS, 0, 0)
+    assert static == pytest.approx(2 * 3 * 1.2 / 10)
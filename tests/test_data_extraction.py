@@ -0,0 +1,213 @@
+# --------------------------------------------------------------------------
+# Data Extraction Tests
+# --------------------------------------------------------------------------
+import pytest
+
+from data_extraction import DataExtraction
+from data_extraction import IncrementalDataExtraction
+from data_extraction import LoadPowerNpz
+from data_extraction import POWER_STATS
+from data_extraction import SteadyStateDetector
+
+CPU_POWER = "system.processor.cpu.power_model.pm0"
+
+def StatsBlock(tick, stats):
+    """Returns the lines of one gem5 stats dump holding stats, a list of
+    (name, value) pairs, taken at tick.
+    """
+
+    lines = ["\n", "---------- Begin Simulation Statistics ----------\n"]
+    lines.append("finalTick {} # Number of ticks from beginning of simulation (Tick)\n".format(tick))
+    for name, value in stats:
+        lines.append("{:<60} {:>16}  # description (Unit)\n".format(name, value))
+    lines.append("\n---------- End Simulation Statistics   ----------\n")
+    return lines
+
+def PowerBlock(tick, dynamic, static):
+
+    return StatsBlock(tick, [
+        (CPU_POWER + ".dynamicPower", dynamic),
+        (CPU_POWER + ".staticPower", static),
+        ("system.processor.cpu.unextracted", 7),
+    ])
+
+@pytest.fixture
+def stats_filename(tmp_path):
+
+    return str(tmp_path / "stats.txt")
+
+# --------------------------------------------------------------------------
+# Streaming Parser
+# --------------------------------------------------------------------------
+def test_parser_routes_every_component_in_one_pass(stats_filename):
+
+    with open(stats_filename, "w") as stats_file:
+        stats_file.writelines(PowerBlock(100, 1.5, 0.5) + PowerBlock(200, 2.5, 0.25))
+
+    statistics = DataExtraction(200, 1.0E-4, stats_filename)
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+    data = statistics.GetComponentData("cpu0")
+
+    assert list(data["dynamicPower"]) == [1.5, 2.5]
+    assert list(data["staticPower"]) == [0.5, 0.25]
+    assert list(statistics.dump_ticks) == [100, 200]
+
+def test_parser_routes_vector_totals():
+
+    statistics = DataExtraction(100, 1.0E-4)
+    statistics.AddStat("performance", "misses", ["system.l2.misses", "system.l2.misses::total"])
+    statistics.ParseLines(StatsBlock(100, [("system.l2.misses::total", 42)]))
+
+    assert list(statistics.component_data["performance"]["misses"]) == [42]
+
+def test_parser_drops_truncated_dump(stats_filename):
+
+    with open(stats_filename, "w") as stats_file:
+        stats_file.writelines(PowerBlock(100, 1.0, 0.5) + PowerBlock(200, 3.0, 0.5)[:-1])
+
+    statistics = DataExtraction(200, 1.0E-4, stats_filename)
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+
+    assert list(statistics.GetComponentData("cpu0")["dynamicPower"]) == [1.0]
+
+def test_parser_keeps_region_of_interest_dumps():
+
+    statistics = DataExtraction(300, 1.0E-4)
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+    statistics.SetRoi(100, 200)
+    for tick in (100, 200, 300):
+        statistics.ParseLines(PowerBlock(tick, tick / 100.0, 0.5))
+
+    assert list(statistics.component_data["cpu0"]["dynamicPower"]) == [2.0]
+
+def test_stats_cannot_be_added_after_parsing(stats_filename):
+
+    with open(stats_filename, "w") as stats_file:
+        stats_file.writelines(PowerBlock(100, 1.0, 0.5))
+
+    statistics = DataExtraction(100, 1.0E-4, stats_filename)
+    statistics.ParseStats()
+
+    with pytest.raises(RuntimeError):
+        statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+
+# --------------------------------------------------------------------------
+# Incremental Extraction
+# --------------------------------------------------------------------------
+def test_incremental_extraction_resumes_at_partial_line(stats_filename):
+
+    lines = PowerBlock(100, 1.0, 0.5) + PowerBlock(200, 2.0, 0.5)
+    text = "".join(lines)
+
+    # the first poll ends in the middle of the second dump's power line
+    split = text.rindex("dynamicPower") + 5
+
+    statistics = IncrementalDataExtraction(1.0E-4, stats_filename)
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+
+    with open(stats_filename, "w") as stats_file:
+        stats_file.write(text[:split])
+    statistics.Poll()
+    assert list(statistics.component_data["cpu0"]["dynamicPower"]) == [1.0]
+
+    with open(stats_filename, "a") as stats_file:
+        stats_file.write(text[split:])
+    statistics.Poll()
+    statistics.Finish(200)
+    assert list(statistics.component_data["cpu0"]["dynamicPower"]) == [1.0, 2.0]
+
+# --------------------------------------------------------------------------
+# Columnar Output
+# --------------------------------------------------------------------------
+def test_power_npz_round_trip(stats_filename, tmp_path):
+
+    with open(stats_filename, "w") as stats_file:
+        stats_file.writelines(PowerBlock(100, 1.5, 0.5) + PowerBlock(200, 2.5, 0.25))
+
+    statistics = DataExtraction(200, 1.0E-4, stats_filename)
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+    npz_filename = str(tmp_path / "cpu0_power_data_run.npz")
+    statistics.ExtractPowerNpz("cpu0", [["L2 Cache Size"], ["1MB"]], npz_filename)
+
+    arrays = LoadPowerNpz(npz_filename)
+    assert list(arrays["dynamic_power"]) == [1.5, 2.5]
+    assert list(arrays["static_power"]) == [0.5, 0.25]
+    assert list(arrays["parameter_names"]) == ["L2 Cache Size"]
+    assert int(arrays["exiting_tick"]) == 200
+    assert float(arrays["stats_period"]) == 1.0E-4
+
+# --------------------------------------------------------------------------
+# Performance Statistics
+# --------------------------------------------------------------------------
+def test_performance_stats_are_combined_over_cores():
+
+    statistics = DataExtraction(100, 1.0E-4)
+    statistics.AddPerformance(2, 2)
+    statistics.ParseLines(StatsBlock(100, [
+        ("system.processor.cpu0.committedInsts", 300),
+        ("system.processor.cpu1.committedInsts", 100),
+        ("system.processor.cpu0.numCycles", 200),
+        ("system.processor.cpu1.numCycles", 150),
+        ("system.processor.cpu0.dcache.overallMisses::total", 5),
+        ("system.processor.cpu1.dcache.overallMisses::total", 7),
+        ("system.processor.l2cache0.overallMissLatency::total", 1000),
+        ("system.processor.l2cache1.overallMissLatency::total", 500),
+        ("system.processor.l3cache.overallHits::total", 9),
+        ("system.mem_ctrl0.dram.bwRead", 10.0),
+        ("system.mem_ctrl1.dram.bwRead", 30.0),
+    ]))
+
+    performance = statistics.GetPerformanceData()
+    assert list(performance["committed_insts"]) == [400]
+    assert list(performance["cycles"]) == [200]
+    assert list(performance["l1d_misses"]) == [12]
+    assert list(performance["l2_miss_latency"]) == [1500]
+    assert list(performance["l3_hits"]) == [9]
+    assert list(performance["mem_read_bandwidth"]) == [40.0]
+    assert list(performance["ipc"]) == []
+
+def test_single_core_performance_stats_keep_plain_paths():
+
+    statistics = DataExtraction(100, 1.0E-4)
+    statistics.ParseLines(StatsBlock(100, [
+        ("system.processor.cpu.committedInsts", 300),
+        ("system.processor.cpu.ipc", 1.5),
+        ("system.mem_ctrl.dram.bwRead", 10.0),
+    ]))
+
+    performance = statistics.GetPerformanceData()
+    assert list(performance["committed_insts"]) == [300]
+    assert list(performance["ipc"]) == [1.5]
+    assert list(performance["mem_read_bandwidth"]) == [10.0]
+
+# --------------------------------------------------------------------------
+# Steady State Detector
+# --------------------------------------------------------------------------
+def SteadyStatistics(dynamic_powers):
+
+    statistics = IncrementalDataExtraction(1.0E-4, "unused")
+    statistics.AddComponent("cpu0", CPU_POWER, POWER_STATS)
+    for dump, dynamic in enumerate(dynamic_powers):
+        statistics.ParseLines(StatsBlock(100 * (dump + 1), [
+            (CPU_POWER + ".dynamicPower", dynamic),
+            (CPU_POWER + ".staticPower", 0.5),
+            ("system.processor.cpu.committedInsts", 1000),
+            ("system.processor.cpu.ipc", 1.0),
+        ]))
+
+    return statistics
+
+def test_steady_state_needs_a_full_steady_window():
+
+    assert not SteadyStateDetector(SteadyStatistics([1.5, 1.5]), ["cpu0"], 3, 0.05).Converged()
+    assert not SteadyStateDetector(SteadyStatistics([1.5, 3.0, 1.5]), ["cpu0"], 3, 0.05).Converged()
+    assert SteadyStateDetector(SteadyStatistics([9.0, 1.5, 1.52, 1.49]), ["cpu0"], 3, 0.05).Converged()
+
+def test_steady_state_extrapolates_energy():
+
+    detector = SteadyStateDetector(SteadyStatistics([1.5, 1.5, 1.5]), ["cpu0"], 3, 0.05)
+    estimate = detector.Estimate(total_insts = 6000)
+
+    assert estimate["power"] == pytest.approx(2.0)
+    assert estimate["measured_insts"] == 3000
+    assert estimate["energy_per_inst"] == pytest.approx(2.0 * 1.0E-4 / 1000)
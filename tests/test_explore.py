@@ -0,0 +1,24 @@
+# --------------------------------------------------------------------------
+# Design Space Exploration Tests
+# --------------------------------------------------------------------------
+from explore import ParetoRanks
+from explore import SampleConfigs
+
+# --------------------------------------------------------------------------
+# Pareto Ranks
+# --------------------------------------------------------------------------
+def test_pareto_ranks_sort_the_fronts():
+
+    points = [(1.0, 4.0), (2.0, 2.0), (4.0, 1.0), (3.0, 3.0), (4.0, 4.0), (2.0, 2.0)]
+
+    assert ParetoRanks(points) == [0, 0, 0, 1, 2, 0]
+
+# --------------------------------------------------------------------------
+# Sample Configs
+# --------------------------------------------------------------------------
+def test_sampled_configs_are_distinct_and_reproducible():
+
+    configs = SampleConfigs(8, 1)
+
+    assert configs == SampleConfigs(8, 1)
+    assert len(set(tuple(sorted(config.items())) for config in configs)) == 8
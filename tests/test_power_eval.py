@@ -0,0 +1,113 @@
+# --------------------------------------------------------------------------
+# Offline Power Evaluation Tests
+# --------------------------------------------------------------------------
+import numpy
+import pytest
+
+from data_extraction import DataExtraction
+from power_eval import AddPowerInputs
+from power_eval import CheckPower
+from power_eval import LoadRawStats
+from power_eval import RecomputePower
+from power_eval import RunEquations
+from power_eval import SaveRawStats
+
+from test_data_extraction import StatsBlock
+
+CPU_PATH = "system.processor.cpu"
+L2_PATH = "system.processor.l2cache"
+CPU_VOLTAGE = "system.cpu_clk_domain.voltage_domain.voltage"
+CACHE_VOLTAGE = "system.cache_clk_domain.voltage_domain.voltage"
+
+COMPONENTS = {
+    "cpu": {"path": CPU_PATH, "voltage": CPU_VOLTAGE, "prefetchers": []},
+    "l2_cache": {"path": L2_PATH, "voltage": CACHE_VOLTAGE, "prefetchers": []},
+}
+
+PARAMETERS = [["L2 Cache Size"], ["1MB"]]
+
+OPTIONS = {"csv_file_suffix": "run", "cpu_pwr_eq": 0, "l2_pwr_eq": 0, "l3_pwr_eq": 0}
+
+def Dump(tick, ipc, misses, accesses, voltage):
+    """Returns a stats dump holding the inputs of equation 0 of the CPU and
+    the L2 cache along with the power gem5 computes from them at its
+    default ambient temperature of 25 C.
+    """
+
+    sim_seconds = 0.0001
+    cpu_dynamic = voltage * (2 * ipc + 3 * 0.000000001 * misses / sim_seconds)
+    l2_dynamic = accesses * 0.000018
+
+    return StatsBlock(tick, [
+        ("simSeconds", sim_seconds),
+        (CPU_VOLTAGE, voltage),
+        (CACHE_VOLTAGE, 1.0),
+        (CPU_PATH + ".ipc", ipc),
+        (CPU_PATH + ".dcache.overallMisses::total", misses),
+        (L2_PATH + ".overallAccesses::total", accesses),
+        # gem5 prints six digits after the point
+        (CPU_PATH + ".power_model.pm0.dynamicPower", "{:.6f}".format(cpu_dynamic)),
+        (CPU_PATH + ".power_model.pm0.staticPower", "{:.6f}".format(4 * 25.0)),
+        (L2_PATH + ".power_model.pm0.dynamicPower", "{:.6f}".format(l2_dynamic)),
+        (L2_PATH + ".power_model.pm0.staticPower", "{:.6f}".format(3 * 1.0 / 10)),
+    ])
+
+@pytest.fixture
+def saved_run(tmp_path):
+    """Extracts the power .csv files and raw stats of a three dump run into
+    tmp_path and returns the raw stats filename.
+    """
+
+    stats_filename = str(tmp_path / "stats.txt")
+    with open(stats_filename, "w") as stats_file:
+        stats_file.writelines(
+            Dump(100, 1.25, 4000, 9000, 1.0) + Dump(200, 0.5, 12000, 1500, 0.8) + Dump(300, 2.0, 0, 0, 1.2)
+        )
+
+    statistics = DataExtraction(300, 0.0001, stats_filename)
+    AddPowerInputs(statistics, COMPONENTS)
+    for component in COMPONENTS:
+        statistics.ExtractPowerData(component, PARAMETERS, str(tmp_path / "{}_power_data_run.csv".format(component)))
+
+    raw_stats_filename = str(tmp_path / "raw_stats_run.npz")
+    SaveRawStats(statistics, raw_stats_filename, COMPONENTS, {
+        "options": OPTIONS,
+        "parameters": PARAMETERS,
+        "exiting_tick": 300,
+        "stats_period": 0.0001,
+    })
+
+    return raw_stats_filename
+
+# --------------------------------------------------------------------------
+# Recompute Power
+# --------------------------------------------------------------------------
+def test_recomputed_power_matches_extracted_power(saved_run, tmp_path):
+
+    columns, metadata = LoadRawStats(saved_run)
+    power = RecomputePower(columns, metadata, RunEquations(metadata))
+
+    assert sorted(power) == ["cpu", "l2_cache"]
+    assert list(power["cpu"][1]) == [100.0] * 3
+    assert CheckPower(power, str(tmp_path), "run") == []
+
+def test_check_reports_mismatched_power(saved_run, tmp_path):
+
+    columns, metadata = LoadRawStats(saved_run)
+    power = RecomputePower(columns, metadata, RunEquations(metadata))
+
+    dynamic_power, static_power = power["cpu"]
+    power["cpu"] = (dynamic_power * 1.01, static_power)
+
+    mismatches = CheckPower(power, str(tmp_path), "run")
+    assert [component for component, message in mismatches] == ["cpu"]
+    assert "dynamic" in mismatches[0][1]
+
+def test_raw_stats_round_trip(saved_run):
+
+    columns, metadata = LoadRawStats(saved_run)
+
+    assert numpy.array_equal(columns[CPU_PATH + ".ipc"], [1.25, 0.5, 2.0])
+    assert numpy.array_equal(columns[CPU_PATH + ".dcache.overallMisses"], [4000, 12000, 0])
+    assert metadata["components"] == COMPONENTS
+    assert metadata["ambient_temperature"] == 25.0
@@ -0,0 +1,68 @@
+# --------------------------------------------------------------------------
+# Result Cache Tests
+# --------------------------------------------------------------------------
+import json
+import os
+
+import pytest
+
+from result_cache import ResultCache
+from system_options import CreateOptionParser
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def cache(tmp_path):
+
+    return ResultCache(str(tmp_path / "cache"), 1 << 30)
+
+@pytest.fixture
+def binaries(tmp_path):
+
+    binary = tmp_path / "stress_test_ARM"
+    binary.write_bytes(b"workload")
+    gem5_binary = tmp_path / "gem5.opt"
+    gem5_binary.write_bytes(b"gem5")
+    return str(binary), str(gem5_binary)
+
+def Key(cache, binaries, *args):
+
+    parser, parameters = CreateOptionParser()
+    options = parser.parse_args(['--binary={}'.format(binaries[0])] + list(args))
+    return cache.Key(options, binaries[1], PROJECT_DIR)
+
+def test_key_ignores_output_locations(cache, binaries):
+
+    assert Key(cache, binaries, '--csv_file_suffix=a', '--csv_save_dir=x') == \
+        Key(cache, binaries, '--csv_file_suffix=b', '--csv_save_dir=y')
+
+@pytest.mark.parametrize("option", ['--l2_size=512kB', '--include_l3_cache=True', '--save_raw_stats=True', '--output_format=csv,npz'])
+def test_key_covers_simulated_and_written_options(cache, binaries, option):
+
+    assert Key(cache, binaries) != Key(cache, binaries, option)
+
+def test_key_covers_the_binary(cache, binaries):
+
+    key = Key(cache, binaries)
+    with open(binaries[0], "wb") as binary:
+        binary.write(b"another workload")
+
+    assert Key(cache, binaries) != key
+
+def test_restore_renames_outputs_to_the_restoring_run(cache, tmp_path):
+
+    outdir = tmp_path / "m5out_a"
+    save_dir = tmp_path / "test1"
+    outdir.mkdir()
+    save_dir.mkdir()
+    (outdir / "stats.txt").write_text("stats")
+    power_filename = save_dir / "cpu_power_data_a.csv"
+    power_filename.write_text("power")
+    (outdir / "outputs.json").write_text(json.dumps([str(power_filename)]))
+
+    cache.Store("key", str(outdir), "a")
+    assert not cache.Restore("other", str(tmp_path / "m5out_b"), str(save_dir), "b")
+    assert cache.Restore("key", str(tmp_path / "m5out_b"), str(save_dir), "b")
+
+    assert (save_dir / "cpu_power_data_b.csv").read_text() == "power"
+    assert (tmp_path / "m5out_b" / "stats.txt").read_text() == "stats"
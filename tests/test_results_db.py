@@ -0,0 +1,81 @@
+# --------------------------------------------------------------------------
+# Results Database Tests
+# --------------------------------------------------------------------------
+import json
+
+import pytest
+
+from results_db import ResultsDatabase
+
+from test_data_extraction import CPU_POWER
+from test_data_extraction import StatsBlock
+
+CPU_PATH = "system.processor.cpu"
+
+def Dump(tick, dynamic, insts, cycles, l2_hits, l2_misses):
+
+    return StatsBlock(tick, [
+        (CPU_POWER + ".dynamicPower", dynamic),
+        (CPU_POWER + ".staticPower", 0.5),
+        (CPU_PATH + ".committedInsts", insts),
+        (CPU_PATH + ".numCycles", cycles),
+        (CPU_PATH + ".ipc", insts / cycles),
+        ("system.processor.l2cache.overallHits::total", l2_hits),
+        ("system.processor.l2cache.overallMisses::total", l2_misses),
+    ])
+
+@pytest.fixture
+def outdir(tmp_path):
+    """Writes the stats file and run manifest of a two dump single core
+    run and returns its output directory.
+    """
+
+    outdir = tmp_path / "test1" / "run"
+    outdir.mkdir(parents = True)
+    with open(str(outdir / "stats.txt"), "w") as stats_file:
+        stats_file.writelines(Dump(100, 1.5, 1000, 2000, 30, 10) + Dump(200, 2.5, 3000, 2000, 10, 10))
+
+    with open(str(outdir / "run.json"), "w") as run_file:
+        json.dump({
+            "options": {"num_cores": 1, "l2_size": "1MB", "csv_file_suffix": "run"},
+            "components": {"cpu": {"path": CPU_PATH}},
+            "stats_period": 1.0E-4,
+            "exiting_tick": 200,
+        }, run_file)
+
+    return str(outdir)
+
+# --------------------------------------------------------------------------
+# Ingest Run
+# --------------------------------------------------------------------------
+def test_ingest_stores_performance_series_and_totals(outdir, tmp_path):
+
+    results_db = ResultsDatabase(str(tmp_path / "results.db"))
+    run_id = results_db.IngestRun(outdir)
+    connection = results_db.connection
+
+    power = connection.execute(
+        "SELECT dynamic_power, static_power FROM intervals WHERE run_id = ? AND component = 'cpu' ORDER BY interval",
+        (run_id,)
+    ).fetchall()
+    assert power == [(1.5, 0.5), (2.5, 0.5)]
+
+    performance = connection.execute(
+        "SELECT committed_insts, ipc, l2_misses, l2_miss_rate, energy_per_inst FROM intervals"
+        " WHERE run_id = ? AND component = 'performance' ORDER BY interval",
+        (run_id,)
+    ).fetchall()
+    assert performance == [
+        (1000, 0.5, 10, 0.25, pytest.approx(2.0E-4 / 1000)),
+        (3000, 1.5, 10, 0.5, pytest.approx(3.0E-4 / 3000)),
+    ]
+
+    totals = connection.execute(
+        "SELECT l2_size_bytes, committed_insts, ipc, energy FROM runs WHERE run_id = ?", (run_id,)
+    ).fetchone()
+    assert totals == (1024**2, 4000, 1.0, pytest.approx(5.0E-4))
+
+    energy = connection.execute("SELECT component, energy FROM run_energy WHERE run_id = ?", (run_id,)).fetchall()
+    assert energy == [("cpu", pytest.approx(5.0E-4))]
+
+    results_db.Close()
@@ -0,0 +1,72 @@
+# --------------------------------------------------------------------------
+# SimPoint Tests
+# --------------------------------------------------------------------------
+import numpy
+import pytest
+
+from simpoint import BayesianInformationCriterion
+from simpoint import ChooseSimPoints
+from simpoint import FindSimPointCheckpoint
+from simpoint import LoadSimPoints
+from simpoint import SimPointCheckpointName
+from simpoint import SimPointStarts
+from simpoint import WriteSimPoints
+
+def TwoPhases():
+    """Returns the vectors of 30 intervals of one program phase followed by
+    10 of another.
+    """
+
+    random = numpy.random.default_rng(0)
+    first = random.normal([0.0, 0.0, 5.0], 0.01, size = (30, 3))
+    second = random.normal([5.0, 0.0, 0.0], 0.01, size = (10, 3))
+    return numpy.concatenate((first, second))
+
+# --------------------------------------------------------------------------
+# Clustering
+# --------------------------------------------------------------------------
+def test_bic_prefers_the_true_number_of_phases():
+
+    data = TwoPhases()
+    labels = numpy.array([0] * 30 + [1] * 10)
+    centroids = numpy.array([data[labels == cluster].mean(axis = 0) for cluster in range(2)])
+
+    single = BayesianInformationCriterion(data, data.mean(axis = 0)[None, :], numpy.zeros(40, dtype = int))
+    assert BayesianInformationCriterion(data, centroids, labels) > single
+
+def test_one_simpoint_per_phase_weighted_by_its_length():
+
+    simpoints = ChooseSimPoints(TwoPhases(), 5)
+
+    assert len(simpoints) == 2
+    assert simpoints[0][0] < 30 <= simpoints[1][0]
+    assert [weight for interval, weight in simpoints] == pytest.approx([0.75, 0.25])
+
+# --------------------------------------------------------------------------
+# SimPoint Files And Checkpoints
+# --------------------------------------------------------------------------
+def test_simpoint_files_round_trip(tmp_path):
+
+    simpoints = [(3, 0.25), (17, 0.75)]
+    simpoint_filename = str(tmp_path / "simpoints")
+    weight_filename = str(tmp_path / "weights")
+    WriteSimPoints(simpoints, simpoint_filename, weight_filename)
+
+    assert LoadSimPoints(simpoint_filename, weight_filename) == simpoints
+
+def test_checkpoint_names_round_trip(tmp_path):
+
+    starts = SimPointStarts([(0, 0.5), (4, 0.5)], 1000, 300)
+    assert starts == [(0, 0, 0.5, 0), (1, 3700, 0.5, 300)]
+
+    for index, start, weight, warmup in starts:
+        (tmp_path / SimPointCheckpointName(index, start, weight, 1000, warmup)).mkdir()
+
+    checkpoint = FindSimPointCheckpoint(str(tmp_path), 1)
+    assert checkpoint["start"] == 3700
+    assert checkpoint["weight"] == 0.5
+    assert checkpoint["interval"] == 1000
+    assert checkpoint["warmup"] == 300
+
+    with pytest.raises(ValueError):
+        FindSimPointCheckpoint(str(tmp_path), 2)
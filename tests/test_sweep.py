@@ -0,0 +1,49 @@
+# --------------------------------------------------------------------------
+# Sweep Tests
+# --------------------------------------------------------------------------
+from sweep import CreateCheckpointJobs
+from sweep import SweepJob
+
+def Jobs(*runs):
+
+    return [SweepJob("test", suffix, isa, dict(options), "/project", "/gem5") for suffix, isa, options in runs]
+
+# --------------------------------------------------------------------------
+# Checkpoint Jobs
+# --------------------------------------------------------------------------
+def test_checkpoints_are_shared_by_jobs_of_the_same_shape():
+
+    jobs = Jobs(
+        ("l2_256kB", "ARM", {"l2_size": "256kB"}),
+        ("l2_512kB", "ARM", {"l2_size": "512kB", "include_l3_cache": "False"}),
+    )
+    checkpoint_jobs = CreateCheckpointJobs(jobs, 1000, 100, "/project", "/gem5")
+
+    assert len(checkpoint_jobs) == 1
+    assert jobs[0].options["restore_checkpoint"] == jobs[1].options["restore_checkpoint"]
+
+def test_checkpoints_follow_the_shape_of_the_restoring_job():
+
+    jobs = Jobs(
+        ("stress", "ARM", {}),
+        ("chase",  "ARM", {"workload": "pointer_chase", "binary_args": "1024"}),
+        ("cores",  "ARM", {"num_cores": "2", "binary_args": "2", "include_l3_cache": "True"}),
+        ("memory", "ARM", {"mem_type": "ddr4_2400", "mem_channels": "2"}),
+        ("opp",    "ARM", {"cpu_opp": "0", "cache_opp": "1"}),
+        ("x86",    "X86", {}),
+    )
+    checkpoint_jobs = CreateCheckpointJobs(jobs, 1000, 100, "/project", "/gem5")
+
+    assert len(checkpoint_jobs) == len(jobs)
+    assert len(set(job.options["restore_checkpoint"] for job in jobs)) == len(jobs)
+
+    for job in jobs:
+        checkpoint_job = next(
+            checkpoint_job for checkpoint_job in checkpoint_jobs
+            if checkpoint_job.options["take_checkpoint"] == job.options["restore_checkpoint"]
+        )
+        assert checkpoint_job.isa == job.isa
+        checkpoint_options = vars(checkpoint_job.ResolvedOptions())
+        job_options = vars(job.ResolvedOptions())
+        for option in ("binary", "binary_args", "num_cores", "include_l3_cache", "mem_type", "mem_channels", "cpu_opp", "cache_opp"):
+            assert checkpoint_options[option] == job_options[option]
@@ -0,0 +1,33 @@
+# --------------------------------------------------------------------------
+# System Options Tests
+# --------------------------------------------------------------------------
+import pytest
+
+from system_options import CreateOptionParser
+from system_options import SetParameterValues
+
+def test_boolean_options_read_false():
+
+    parser, parameters = CreateOptionParser()
+    options = parser.parse_args(['--roi=False', '--live_extraction=False', '--include_l3_cache', 'false'])
+
+    assert options.roi is False
+    assert options.live_extraction is False
+    assert options.include_l3_cache is False
+    assert options.converge is False
+
+    options = parser.parse_args(['--live_extraction=True'])
+    assert options.live_extraction is True
+
+def test_boolean_options_reject_other_values():
+
+    parser, parameters = CreateOptionParser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--live_extraction=maybe'])
+
+def test_every_parameter_has_a_value():
+
+    parser, parameters = CreateOptionParser()
+    SetParameterValues(parameters, parser.parse_args([]))
+
+    assert len(parameters[0]) == len(parameters[1])
@@ -0,0 +1,73 @@
+#include "workload.h"
+
+// usage: branch [working set kB] [passes] [predictable]
+// walks an array of random bytes taking data dependent branches on every
+// element. With predictable set to 1 the array is sorted first, so the
+// same branches become easy to predict.
+int main(int argc, char **argv)
+{
+    long size_kb = arg_or(argc, argv, 1, 64);
+    long passes = arg_or(argc, argv, 2, 4);
+    long predictable = arg_or(argc, argv, 3, 0);
+    long n = size_kb * 1024;
+    long i, pass;
+    long counts[256] = {0};
+    long value;
+    // volatile keeps the compiler from turning the branches into
+    // conditional moves
+    volatile long low = 0, middle = 0, high = 0, odd = 0;
+
+    unsigned char *data = allocate(n);
+
+    for(i=0;i<n;i++)
+    {
+        data[i] = next_random() & 0xff;
+    }
+
+    // counting sort, so sorting does not add branches of its own
+    if(predictable)
+    {
+        for(i=0;i<n;i++)
+        {
+            counts[data[i]]++;
+        }
+        for(value=0, i=0;value<256;value++)
+        {
+            while(counts[value]-- > 0)
+            {
+                data[i++] = value;
+            }
+        }
+    }
+
+    printf("Branching over %ld kB, %ld passes, predictable %ld:\n", size_kb, passes, predictable);
+    roi_begin();
+    for(pass=0;pass<passes;pass++)
+    {
+        for(i=0;i<n;i++)
+        {
+            value = data[i];
+            if(value < 64)
+            {
+                low++;
+            }
+            else if(value < 192)
+            {
+                middle++;
+            }
+            else
+            {
+                high++;
+            }
+            if(value & 1)
+            {
+                odd++;
+            }
+        }
+    }
+    roi_end();
+
+    printf("Low: %ld Middle: %ld High: %ld Odd: %ld\n", low, middle, high, odd);
+    printf("Done:\n");
+    return 0;
+}
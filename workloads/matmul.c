@@ -0,0 +1,76 @@
+#include "workload.h"
+
+// usage: matmul [n] [block]
+// multiplies two n by n matrices of doubles, 3*n*n*8 bytes in total. A
+// block of 0 runs the naive triple loop, otherwise the loops are tiled
+// into block by block tiles so the reused tiles stay in the cache.
+int main(int argc, char **argv)
+{
+    long n = arg_or(argc, argv, 1, 128);
+    long block = arg_or(argc, argv, 2, 0);
+    long i, j, k, ii, jj, kk, i_end, j_end, k_end;
+    double sum, checksum = 0.0;
+
+    double *a = allocate(n * n * sizeof(double));
+    double *b = allocate(n * n * sizeof(double));
+    double *c = allocate(n * n * sizeof(double));
+
+    for(i=0;i<n*n;i++)
+    {
+        a[i] = (double)(i % 7);
+        b[i] = (double)(i % 5);
+        c[i] = 0.0;
+    }
+
+    printf("Multiplying %ldx%ld matrices, block %ld:\n", n, n, block);
+    roi_begin();
+    if(block <= 0)
+    {
+        for(i=0;i<n;i++)
+        {
+            for(j=0;j<n;j++)
+            {
+                sum = 0.0;
+                for(k=0;k<n;k++)
+                {
+                    sum += a[i*n+k]*b[k*n+j];
+                }
+                c[i*n+j] = sum;
+            }
+        }
+    }
+    else
+    {
+        for(ii=0;ii<n;ii+=block)
+        {
+            i_end = ii+block < n ? ii+block : n;
+            for(kk=0;kk<n;kk+=block)
+            {
+                k_end = kk+block < n ? kk+block : n;
+                for(jj=0;jj<n;jj+=block)
+                {
+                    j_end = jj+block < n ? jj+block : n;
+                    for(i=ii;i<i_end;i++)
+                    {
+                        for(k=kk;k<k_end;k++)
+                        {
+                            for(j=jj;j<j_end;j++)
+                            {
+                                c[i*n+j] += a[i*n+k]*b[k*n+j];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+    roi_end();
+
+    for(i=0;i<n*n;i++)
+    {
+        checksum += c[i];
+    }
+    printf("Checksum: %g\n", checksum);
+    printf("Done:\n");
+    return 0;
+}
@@ -0,0 +1,65 @@
+#include "workload.h"
+
+#define LINE_SIZE 64
+
+// one node per cache line, so every hop touches a new line
+struct node
+{
+    struct node *next;
+    char padding[LINE_SIZE - sizeof(struct node *)];
+};
+
+// usage: pointer_chase [working set kB] [accesses]
+// follows a random cyclic chain through the working set. Every load
+// depends on the one before it, so the run time is set by the latency of
+// the level the working set fits in.
+int main(int argc, char **argv)
+{
+    long size_kb = arg_or(argc, argv, 1, 256);
+    long accesses = arg_or(argc, argv, 2, 1000000);
+    long n = size_kb * 1024 / sizeof(struct node);
+    long i, j, temp;
+    long *order;
+    struct node *nodes;
+    struct node *p;
+
+    if(n < 2)
+    {
+        printf("Working set must hold at least two cache lines\n");
+        exit(1);
+    }
+
+    nodes = allocate(n * sizeof(struct node));
+    order = allocate(n * sizeof(long));
+
+    // Sattolo's shuffle gives a single cycle through every node
+    for(i=0;i<n;i++)
+    {
+        order[i] = i;
+    }
+    for(i=n-1;i>0;i--)
+    {
+        j = next_random() % i;
+        temp = order[i];
+        order[i] = order[j];
+        order[j] = temp;
+    }
+    for(i=0;i<n;i++)
+    {
+        nodes[order[i]].next = &nodes[order[(i+1)%n]];
+    }
+    free(order);
+
+    printf("Chasing %ld kB, %ld accesses:\n", size_kb, accesses);
+    p = &nodes[0];
+    roi_begin();
+    for(i=0;i<accesses;i++)
+    {
+        p = p->next;
+    }
+    roi_end();
+
+    printf("End node: %ld\n", (long)(p - nodes));
+    printf("Done:\n");
+    return 0;
+}
@@ -0,0 +1,37 @@
+#include "workload.h"
+
+// usage: random_access [working set kB] [updates]
+// GUPS style read-modify-write of random words of a table. The updates are
+// independent of each other, so unlike pointer_chase the misses overlap.
+int main(int argc, char **argv)
+{
+    long size_kb = arg_or(argc, argv, 1, 1024);
+    long updates = arg_or(argc, argv, 2, 1000000);
+    long n = size_kb * 1024 / sizeof(uint64_t);
+    long i;
+    uint64_t value, checksum = 0;
+
+    uint64_t *table = allocate(n * sizeof(uint64_t));
+
+    for(i=0;i<n;i++)
+    {
+        table[i] = i;
+    }
+
+    printf("Updating %ld kB, %ld updates:\n", size_kb, updates);
+    roi_begin();
+    for(i=0;i<updates;i++)
+    {
+        value = next_random();
+        table[value % n] ^= value;
+    }
+    roi_end();
+
+    for(i=0;i<n;i++)
+    {
+        checksum ^= table[i];
+    }
+    printf("Checksum: %llu\n", (unsigned long long)checksum);
+    printf("Done:\n");
+    return 0;
+}
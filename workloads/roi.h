@@ -0,0 +1,17 @@
+#ifndef ROI_H
+#define ROI_H
+
+// marks the region of interest with the m5 work begin and end pseudo
+// instructions, which system.py --roi reacts to. run.sh defines M5OPS and
+// links libm5 when gem5's util/m5 library has been built, otherwise the
+// markers compile to nothing.
+#ifdef M5OPS
+#include <gem5/m5ops.h>
+#define roi_begin() m5_work_begin(0, 0)
+#define roi_end() m5_work_end(0, 0)
+#else
+#define roi_begin()
+#define roi_end()
+#endif
+
+#endif
@@ -0,0 +1,57 @@
+#include "workload.h"
+
+// usage: stream [working set kB] [passes]
+// STREAM style copy, scale, add and triad kernels over three arrays of
+// doubles that together take the working set. Sequential and bandwidth
+// bound once the working set is larger than the caches.
+int main(int argc, char **argv)
+{
+    long size_kb = arg_or(argc, argv, 1, 1024);
+    long passes = arg_or(argc, argv, 2, 4);
+    long n = size_kb * 1024 / (3 * sizeof(double));
+    long i, pass;
+    double scalar = 3.0;
+    double checksum = 0.0;
+
+    double *a = allocate(n * sizeof(double));
+    double *b = allocate(n * sizeof(double));
+    double *c = allocate(n * sizeof(double));
+
+    for(i=0;i<n;i++)
+    {
+        a[i] = 1.0;
+        b[i] = 2.0;
+        c[i] = 0.0;
+    }
+
+    printf("Streaming %ld kB, %ld passes:\n", size_kb, passes);
+    roi_begin();
+    for(pass=0;pass<passes;pass++)
+    {
+        for(i=0;i<n;i++)
+        {
+            c[i] = a[i];
+        }
+        for(i=0;i<n;i++)
+        {
+            b[i] = scalar*c[i];
+        }
+        for(i=0;i<n;i++)
+        {
+            c[i] = a[i]+b[i];
+        }
+        for(i=0;i<n;i++)
+        {
+            a[i] = b[i]+scalar*c[i];
+        }
+    }
+    roi_end();
+
+    for(i=0;i<n;i++)
+    {
+        checksum += a[i];
+    }
+    printf("Checksum: %g\n", checksum);
+    printf("Done:\n");
+    return 0;
+}
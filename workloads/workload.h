@@ -0,0 +1,44 @@
+#ifndef WORKLOAD_H
+#define WORKLOAD_H
+
+#include<stdint.h>
+#include<stdio.h>
+#include<stdlib.h>
+
+#include "roi.h"
+
+// returns the index-th argument as a number, or default_value if it was
+// not given
+long arg_or(int argc, char **argv, int index, long default_value)
+{
+    if(argc > index)
+    {
+        return atol(argv[index]);
+    }
+    return default_value;
+}
+
+// xorshift64 generator, so every ISA sees the same access pattern
+uint64_t random_state = 88172645463325252ULL;
+
+uint64_t next_random(void)
+{
+    random_state ^= random_state << 13;
+    random_state ^= random_state >> 7;
+    random_state ^= random_state << 17;
+    return random_state;
+}
+
+// allocates size bytes or exits
+void *allocate(size_t size)
+{
+    void *memory = malloc(size);
+    if(memory == NULL)
+    {
+        printf("Could not allocate %lu bytes\n", (unsigned long)size);
+        exit(1);
+    }
+    return memory;
+}
+
+#endif